@@ -14,10 +14,12 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from utils.ai_helper import AIHelper
+from utils.async_ai_helper import AsyncAIHelper
 from utils.resume_parser import ResumeParser
 from utils.resume_generator import ResumeGenerator
 from utils.ats_scorer import ATSScorer
 from utils.resume_agent import ResumeAgent
+from utils.stream_json import RESTART_PATH
 
 # Page configuration
 st.set_page_config(
@@ -253,6 +255,8 @@ if 'agent_chat_history' not in st.session_state:
     st.session_state.agent_chat_history = []
 if 'selected_template' not in st.session_state:
     st.session_state.selected_template = 'professional'
+if 'pending_ats_score' not in st.session_state:
+    st.session_state.pending_ats_score = None
 
 # Initialize AI Helper
 @st.cache_resource
@@ -261,6 +265,47 @@ def get_ai_helper():
 
 ai_helper = get_ai_helper()
 
+# Async front end for background work; uses ai_helper's cache, limiter and stats over one connection pool
+@st.cache_resource
+def get_async_ai_helper():
+    return AsyncAIHelper(ai_helper)
+
+async_ai_helper = get_async_ai_helper()
+
+def start_ats_scoring(resume_data, job_description=""):
+    """Show the rule-based score now and fetch the AI feedback in the background"""
+    placeholder = ATSScorer.format_score_display(ai_helper.quick_ats_score(resume_data, job_description))
+    st.session_state.ats_score = placeholder
+    st.session_state.score_last_updated = datetime.now()
+    future = async_ai_helper.submit(async_ai_helper.calculate_ats_score(dict(resume_data), job_description))
+    st.session_state.pending_ats_score = {'future': future, 'placeholder': placeholder}
+
+def stream_preview(placeholder):
+    """on_field callback that lists streamed fields in a placeholder as they complete"""
+    lines = []
+    
+    def on_field(path, value):
+        if path == RESTART_PATH:
+            # The stream was retried; what was shown came from the abandoned attempt
+            lines.clear()
+            placeholder.empty()
+            return
+        label = str(path[0]).replace('_', ' ').title()
+        if len(path) == 2:
+            if not isinstance(value, dict):
+                return  # plain list items are shown together once the list closes
+            title = value.get('title') or value.get('name') or value.get('degree') or ''
+            lines.append(f"- **{label} {path[1] + 1}:** {title}")
+        elif isinstance(value, str):
+            lines.append(f"- **{label}:** {value}")
+        elif isinstance(value, list) and value and not isinstance(value[0], dict):
+            lines.append(f"- **{label}:** {', '.join(str(item) for item in value)}")
+        else:
+            return
+        placeholder.markdown('\n'.join(lines))
+    
+    return on_field
+
 # Header with better dark theme support
 st.markdown('''
 <h1 style="
@@ -315,51 +360,28 @@ with tab1:
         if uploaded_file and st.button("Parse Resume", key="parse_btn"):
             with st.spinner("🔍 Parsing..."):
                 try:
-                    # Create uploads directory with proper permissions
-                    upload_dir = "uploads"
-                    os.makedirs(upload_dir, exist_ok=True)
-                    os.chmod(upload_dir, 0o777)
-                    
-                    # Save file with timestamp
-                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                    filename = f"{timestamp}_{uploaded_file.name}"
-                    filepath = os.path.join(upload_dir, filename)
-                    
-                    # Write file with error handling
+                    # Parse straight from the upload buffer - nothing is written to disk.
+                    # Oversized or malformed uploads are rejected before any text extraction.
+                    error_message = None
                     try:
-                        with open(filepath, "wb") as f:
-                            f.write(uploaded_file.getbuffer())
-                        os.chmod(filepath, 0o666)  # Make file readable/writable
-                    except PermissionError:
-                        st.error("❌ Permission denied when saving file. Please contact admin.")
-                    except IOError as e:
-                        st.error(f"❌ File write error: {str(e)}")
-                    
-                    # Verify file was created
-                    if not os.path.exists(filepath):
-                        st.error("❌ File was not saved properly. Please try again.")
-                    else:
-                        # Parse the file
-                        resume_text = ResumeParser.parse_resume(filepath)
-                        if resume_text:
-                            # Extract data using AI
-                            extracted_data = ai_helper.extract_resume_info(resume_text, "General")
-                            if extracted_data:
-                                st.session_state.resume_data = extracted_data
-                                st.success("✅ Resume parsed successfully!")
-                                with st.expander("View Extracted Data"):
-                                    st.json(extracted_data)
-                            else:
-                                st.error("❌ Failed to extract information from resume. Please try again or enter manually.")
+                        resume_text = ResumeParser.parse_resume(uploaded_file.getbuffer(), filename=uploaded_file.name,
+                                                                raise_rejected=True)
+                    except ValueError as e:
+                        resume_text, error_message = None, str(e)
+                    if error_message:
+                        st.error(f"❌ {error_message}")
+                    elif resume_text:
+                        # Extract data using AI
+                        extracted_data = ai_helper.extract_resume_info(resume_text, "General")
+                        if extracted_data:
+                            st.session_state.resume_data = extracted_data
+                            st.success("✅ Resume parsed successfully!")
+                            with st.expander("View Extracted Data"):
+                                st.json(extracted_data)
                         else:
-                            st.error("❌ Could not extract text from the file. Please ensure it's a valid PDF or DOCX file.")
-                        
-                        # Clean up temporary file
-                        try:
-                            if os.path.exists(filepath):
-                                os.remove(filepath)
-                        except Exception as cleanup_error:
-                            st.warning(f"Note: Temp file cleanup failed: {str(cleanup_error)}")
+                            st.error("❌ Failed to extract information from resume. Please try again or enter manually.")
+                    else:
+                        st.error("❌ Could not extract text from the file. Please ensure it's a valid PDF or DOCX file.")
                 
                 except Exception as e:
                     st.error(f"❌ Error parsing resume: {str(e)}\n\nPlease try:\n1. Verify the PDF/DOCX file is valid\n2. Try another file\n3. Use manual entry instead")
@@ -406,7 +428,10 @@ with tab1:
                     if exp_title and exp_company:
                         user_data['experience'] = [{'title': exp_title, 'company': exp_company}]
                     
-                    resume_content = ai_helper.generate_resume_content(user_data, job_description)
+                    # Stream the generation so each section shows up as soon as it is written
+                    resume_content = ai_helper.generate_resume_content(
+                        user_data, job_description, on_field=stream_preview(st.empty())
+                    )
                     
                     if resume_content:
                         final_resume_data = {
@@ -429,9 +454,8 @@ with tab1:
                         st.session_state.resume_agent = ResumeAgent(ai_helper)
                         st.session_state.resume_agent.initialize_resume(final_resume_data)
                         
-                        score_data = ai_helper.calculate_ats_score(final_resume_data, job_description)
-                        st.session_state.ats_score = ATSScorer.format_score_display(score_data)
-                        st.session_state.score_last_updated = datetime.now()
+                        # Rule-based score shows immediately; AI feedback fills in when it arrives
+                        start_ats_scoring(final_resume_data, job_description)
                         
                         st.success("✅ Resume generated! You can now edit it in the '🤖 AI Agent Resume' tab or see the preview in the '💾 Download' tab.")
                         st.balloons()
@@ -455,58 +479,34 @@ with tab2:
         if uploaded_file:
             with st.spinner("🔍 Loading resume..."):
                 try:
-                    # Create uploads directory with proper permissions
-                    upload_dir = "uploads"
-                    os.makedirs(upload_dir, exist_ok=True)
-                    os.chmod(upload_dir, 0o777)
-                    
-                    # Save file with timestamp
-                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                    filename = f"{timestamp}_{uploaded_file.name}"
-                    filepath = os.path.join(upload_dir, filename)
-                    
-                    # Write file with error handling
+                    # Parse straight from the upload buffer - nothing is written to disk.
+                    # Oversized or malformed uploads are rejected before any text extraction.
+                    error_message = None
                     try:
-                        with open(filepath, "wb") as f:
-                            f.write(uploaded_file.getbuffer())
-                        os.chmod(filepath, 0o666)  # Make file readable/writable
-                    except PermissionError:
-                        st.error("❌ Permission denied when saving file. Please contact admin.")
-                    except IOError as e:
-                        st.error(f"❌ File write error: {str(e)}")
+                        resume_text = ResumeParser.parse_resume(uploaded_file.getbuffer(), filename=uploaded_file.name,
+                                                                raise_rejected=True)
+                    except ValueError as e:
+                        resume_text, error_message = None, str(e)
                     
-                    # Verify file was created
-                    if not os.path.exists(filepath):
-                        st.error("❌ File was not saved properly. Please try again.")
-                    else:
-                        # Parse the resume
-                        resume_text = ResumeParser.parse_resume(filepath)
+                    if error_message:
+                        st.error(f"❌ {error_message}")
+                    elif resume_text:
+                        extracted_data = ai_helper.extract_resume_info(resume_text, "General")
                         
-                        if resume_text:
-                            extracted_data = ai_helper.extract_resume_info(resume_text, "General")
+                        if extracted_data:
+                            st.session_state.resume_agent = ResumeAgent(ai_helper)
+                            st.session_state.resume_agent.initialize_resume(extracted_data)
+                            st.session_state.generated_resume = extracted_data.copy()
+                            
+                            score_data = ai_helper.calculate_ats_score(extracted_data, "")
+                            st.session_state.ats_score = ATSScorer.format_score_display(score_data)
                             
-                            if extracted_data:
-                                st.session_state.resume_agent = ResumeAgent(ai_helper)
-                                st.session_state.resume_agent.initialize_resume(extracted_data)
-                                st.session_state.generated_resume = extracted_data.copy()
-                                
-                                score_data = ai_helper.calculate_ats_score(extracted_data, "")
-                                st.session_state.ats_score = ATSScorer.format_score_display(score_data)
-                                
-                                st.success("✅ Resume loaded! Start chatting below.")
-                                
-                                # Clean up temporary file
-                                try:
-                                    if os.path.exists(filepath):
-                                        os.remove(filepath)
-                                except:
-                                    pass
-                                
-                                st.rerun()
-                            else:
-                                st.error("❌ Failed to extract information from resume.")
+                            st.success("✅ Resume loaded! Start chatting below.")
+                            st.rerun()
                         else:
-                            st.error("❌ Could not extract text from the file. Please ensure it's a valid PDF or DOCX file.")
+                            st.error("❌ Failed to extract information from resume.")
+                    else:
+                        st.error("❌ Could not extract text from the file. Please ensure it's a valid PDF or DOCX file.")
                 
                 except Exception as e:
                     st.error(f"❌ Error loading resume: {str(e)}\n\nPlease try:\n1. Verify the PDF/DOCX file is valid\n2. Try another file\n3. Use manual entry instead")
@@ -548,6 +548,7 @@ with tab2:
         
         with col_left:
             # PDF-style resume preview
+            st.session_state.resume_agent.template_name = st.session_state.selected_template
             pdf_html = st.session_state.resume_agent.get_resume_pdf_html(highlight_changes=True)
             
             # Use components.html for proper rendering
@@ -584,7 +585,7 @@ with tab2:
             
             # Action buttons below preview
             st.markdown("---")
-            col_a, col_b, col_c = st.columns(3)
+            col_a, col_redo, col_b, col_c = st.columns(4)
             
             with col_a:
                 if st.button("↩️ Undo Last Change"):
@@ -599,6 +600,19 @@ with tab2:
                     st.info(message)
                     st.rerun()
             
+            with col_redo:
+                if st.button("↪️ Redo"):
+                    message, html = st.session_state.resume_agent.redo_last_change()
+                    st.session_state.generated_resume = st.session_state.resume_agent.resume_state.copy()
+                    
+                    # Update score
+                    score_data = ai_helper.calculate_ats_score(st.session_state.resume_agent.resume_state, "")
+                    st.session_state.ats_score = ATSScorer.format_score_display(score_data)
+                    st.session_state.score_last_updated = datetime.now()
+                    
+                    st.info(message)
+                    st.rerun()
+            
             with col_b:
                 if st.button("🔄 Reset to Saved"):
                     if st.session_state.generated_resume:
@@ -673,7 +687,9 @@ with tab2:
                         
                         # Process command
                         with st.spinner("🤖 Processing your request..."):
-                            response, _ = st.session_state.resume_agent.process_command(user_input)
+                            response, _ = st.session_state.resume_agent.process_command(
+                                user_input, on_field=stream_preview(st.empty())
+                            )
                         
                         # Add AI response to chat
                         st.session_state.agent_chat_history.append({"role": "assistant", "content": response})
@@ -715,7 +731,9 @@ with tab2:
                         
                         # Process
                         with st.spinner("Processing..."):
-                            response, _ = st.session_state.resume_agent.process_command(action)
+                            response, _ = st.session_state.resume_agent.process_command(
+                                action, on_field=stream_preview(st.empty())
+                            )
                         
                         st.session_state.agent_chat_history.append({"role": "assistant", "content": response})
                         st.session_state.generated_resume = st.session_state.resume_agent.resume_state.copy()
@@ -991,6 +1009,7 @@ with tab4:
         st.subheader("📄 Live PDF Preview")
         
         import streamlit.components.v1 as components
+        st.session_state.resume_agent.template_name = st.session_state.selected_template
         pdf_html = st.session_state.resume_agent.get_resume_pdf_html(highlight_changes=False)
         
         # Wrap in a scrollable, centered container
@@ -1104,3 +1123,22 @@ st.markdown("""
     <p>🤖 Powered by AI | Built with Streamlit & Groq</p>
 </div>
 """, unsafe_allow_html=True)
+
+# Background ATS feedback - the page above is already on screen while we wait
+pending = st.session_state.pending_ats_score
+if pending is not None:
+    with st.spinner("📊 Fetching detailed ATS feedback..."):
+        try:
+            score_data = pending['future'].result()
+        except Exception as e:
+            score_data = None
+            print(f"Background ATS scoring failed: {e}")
+            # Keep the rule-based score, but stop promising feedback that will not come
+            pending['placeholder']['summary'] = "Rule-based score only - detailed AI feedback is unavailable."
+            st.warning("⚠️ Detailed ATS feedback could not be loaded. The score shown above is the rule-based estimate.")
+    st.session_state.pending_ats_score = None
+    # Drop the result if the score was recalculated in the meantime
+    if score_data and st.session_state.ats_score is pending['placeholder']:
+        st.session_state.ats_score = ATSScorer.format_score_display(score_data)
+        st.session_state.score_last_updated = datetime.now()
+        st.rerun()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Batch Resume Ingestion
+Parse and extract a directory (or manifest) of resumes into a JSONL file
+
+Usage:
+    python batch_ingest.py resumes/ -o results.jsonl
+    python batch_ingest.py manifest.txt -o results.jsonl --role "Data Scientist"
+
+Re-running with the same output file resumes where the last run stopped.
+"""
+
+import argparse
+import json
+import os
+import sys
+from dotenv import load_dotenv
+
+from utils.ai_helper import AIHelper
+from utils.batch_ingest import BatchIngestor, collect_inputs
+
+# Load environment variables
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-ingest resumes into JSONL")
+    parser.add_argument("source", help="Directory of PDF/DOCX files or a manifest file")
+    parser.add_argument("-o", "--output", default="ingested_resumes.jsonl", help="JSONL output / checkpoint file")
+    parser.add_argument("--role", default="General", help="Default target role")
+    parser.add_argument("--parse-workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Max extraction calls in flight")
+    parser.add_argument("--parse-only", action="store_true", help="Skip AI extraction and store raw text")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and overwrite output")
+    args = parser.parse_args()
+    
+    ai_helper = None
+    if not args.parse_only:
+        api_key = os.getenv('GROQ_API_KEY')
+        if not api_key:
+            print("❌ ERROR: No GROQ_API_KEY found! Use --parse-only or add it to .env")
+            sys.exit(1)
+        ai_helper = AIHelper(api_key)
+    
+    jobs = collect_inputs(args.source, args.role)
+    print(f"📂 Found {len(jobs)} resume(s)")
+    
+    ingestor = BatchIngestor(ai_helper, parse_workers=args.parse_workers, extract_concurrency=args.concurrency)
+    summary = ingestor.run(jobs, args.output, resume=not args.restart)
+    
+    print(json.dumps(summary, indent=2))
+    sys.exit(1 if summary["failed"] or summary["error"] else 0)
+
+
+if __name__ == "__main__":
+    main()
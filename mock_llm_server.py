@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Mock LLM Server
+Serve, record or load-test against a local stand-in for the Groq API
+
+Usage:
+    # Serve synthetic/replayed answers; run the app with GROQ_BASE_URL=http://127.0.0.1:8800
+    python mock_llm_server.py --replay recordings.jsonl --latency lognormal:0.8,0.5 --error-rate 0.02
+    
+    # Proxy to Groq and record every answer for later replay (needs GROQ_API_KEY in the app)
+    python mock_llm_server.py --record recordings.jsonl
+    
+    # Drive AIHelper/ResumeAgent against an in-process server and report throughput
+    python mock_llm_server.py --load-test 200 --concurrency 16 --latency uniform:0.05,0.3
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from utils.mock_llm import DEFAULT_UPSTREAM, LatencyModel, MockLLMServer, ReplayStore
+
+LOAD_TEST_RESUME = {
+    "name": "Alex Morgan",
+    "email": "alex.morgan@example.com",
+    "phone": "+1 555 010 0199",
+    "target_role": "Backend Engineer",
+    "professional_summary": "Software engineer with 6 years of experience building web services.",
+    "skills": ["Python", "SQL", "AWS", "Docker"],
+    "experience": [{
+        "title": "Senior Software Engineer",
+        "company": "Example Corp",
+        "duration": "2021 - Present",
+        "responsibilities": ["Built the billing platform", "Cut API latency by 45%"]
+    }],
+    "education": [{"degree": "B.S. Computer Science", "institution": "State University", "year": "2018"}],
+    "projects": [],
+    "certifications": []
+}
+
+
+def _percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))] if ordered else 0.0
+
+
+def run_load_test(base_url: str, operations: int, concurrency: int) -> Dict:
+    """
+    Run a mix of agent edits, ATS scores and suggestions through AIHelper
+    
+    The response cache and client-side rate limits are disabled so every
+    operation reaches the server; retries, budgeting and parsing run as usual.
+    """
+    os.environ["GROQ_BASE_URL"] = base_url
+    from utils.ai_helper import AIHelper
+    from utils.rate_limiter import RateLimiter
+    from utils.resume_agent import ResumeAgent
+    
+    ai_helper = AIHelper(os.getenv("GROQ_API_KEY") or "mock-key", rate_limiter=RateLimiter(None, None))
+    ai_helper.response_cache = None
+    edit_stats: List[Dict] = []
+    
+    def operation(index: int):
+        kind = ("edit", "score", "suggest")[index % 3]
+        started = time.perf_counter()
+        if kind == "edit":
+            agent = ResumeAgent(ai_helper)
+            agent.initialize_resume(json.loads(json.dumps(LOAD_TEST_RESUME)))
+            # A distinct free-form command per operation, so it reaches the model
+            # and requests are not coalesced
+            agent.process_command(f"Rewrite the summary to mention Skill{index}")
+            edit_stats.append(agent.edit_stats)
+        elif kind == "score":
+            ai_helper.calculate_ats_score(dict(LOAD_TEST_RESUME, name=f"Candidate {index}"), "Backend Engineer")
+        else:
+            agent = ResumeAgent(ai_helper)
+            agent.initialize_resume(dict(LOAD_TEST_RESUME, name=f"Candidate {index}"))
+            agent.get_suggestions()
+        return kind, time.perf_counter() - started
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(operation, range(operations)))
+    elapsed = time.perf_counter() - started
+    
+    latencies = [latency for _, latency in results]
+    return {
+        "operations": operations,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "operations_per_second": round(operations / elapsed, 2) if elapsed else 0.0,
+        "latency_p50": round(_percentile(latencies, 0.5), 3),
+        "latency_p95": round(_percentile(latencies, 0.95), 3),
+        "latency_p99": round(_percentile(latencies, 0.99), 3),
+        "routes": ai_helper.router.stats(),
+        "edits": {key: sum(stats[key] for stats in edit_stats) for key in (edit_stats[0] if edit_stats else {})},
+        "retries": ai_helper.rate_limiter.stats["retries"],
+        "json_repairs": ai_helper.json_repairs.stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the Groq chat-completions API")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8800, help="Port to bind (0 = any free port)")
+    parser.add_argument("--replay", help="JSONL file of recorded responses to replay")
+    parser.add_argument("--record", help="Forward unknown requests upstream and append them to this JSONL file")
+    parser.add_argument("--upstream", default=DEFAULT_UPSTREAM, help="API base URL used by --record")
+    parser.add_argument("--latency", default="fixed:0", help="Latency distribution, e.g. lognormal:0.8,0.5 or replay")
+    parser.add_argument("--tokens-per-second", type=float, default=None, help="Simulated generation speed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 500/503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests failing with 429")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for repeatable latency/error sampling")
+    parser.add_argument("--load-test", type=int, default=0, metavar="N", help="Run N operations against the server and exit")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel operations for --load-test")
+    args = parser.parse_args()
+    
+    try:
+        latency = LatencyModel.from_spec(args.latency)
+    except ValueError as e:
+        print(f"❌ ERROR: {e}")
+        sys.exit(1)
+    
+    store = ReplayStore(args.record or args.replay)
+    if args.record and args.replay and args.replay != args.record:
+        store.load(args.replay)
+    
+    server = MockLLMServer(
+        host=args.host, port=0 if args.load_test else args.port, store=store, latency=latency,
+        tokens_per_second=args.tokens_per_second, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, seed=args.seed,
+        upstream=args.upstream if args.record else None
+    )
+    
+    if args.load_test:
+        with server:
+            summary = run_load_test(server.base_url, args.load_test, args.concurrency)
+            summary["server"] = dict(server.stats)
+        print(json.dumps(summary, indent=2))
+        return
+    
+    print(f"🤖 Mock LLM server on {server.base_url} ({len(store)} recorded responses)")
+    print(f"   Run the app with GROQ_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(json.dumps(server.stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Shared fixtures: PDFs built with reportlab, and an AIHelper whose Groq client answers from a script"""
+
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from reportlab.pdfgen import canvas
+
+from utils.ai_helper import AIHelper
+from utils.rate_limiter import RateLimiter
+from utils.response_cache import MemoryResponseCache
+
+
+class FakeCompletions:
+    """
+    Stand-in for client.chat.completions.with_raw_response
+    
+    Each create() takes the next scripted reply: a completion string, a
+    (content, finish_reason) pair, or an exception to raise. Request kwargs
+    are kept in .requests.
+    """
+    
+    def __init__(self, replies, stream_usage=True):
+        self.replies = list(replies)
+        self.requests = []
+        self.stream_usage = stream_usage
+    
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        content, finish_reason = reply if isinstance(reply, tuple) else (reply, "stop")
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=len(content) // 4,
+                                total_tokens=100 + len(content) // 4)
+        if kwargs.get("stream"):
+            response = [
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content[i:i + 8]),
+                                                         finish_reason=None)])
+                for i in range(0, len(content), 8)
+            ]
+            # Like Groq, the last chunk carries the usage under x_groq
+            response.append(SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=None), finish_reason=finish_reason)],
+                x_groq=SimpleNamespace(usage=usage) if self.stream_usage else None
+            ))
+        else:
+            response = SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason=finish_reason)],
+                usage=usage
+            )
+        return SimpleNamespace(headers={}, parse=lambda: response)
+
+
+@pytest.fixture
+def make_helper():
+    """make_helper(replies, **kwargs) -> AIHelper answering from replies; .fake holds the FakeCompletions"""
+    def make(replies=(), **kwargs):
+        kwargs.setdefault("response_cache", MemoryResponseCache())
+        kwargs.setdefault("rate_limiter", RateLimiter(None, None))
+        helper = AIHelper("test-key", **kwargs)
+        helper.fake = FakeCompletions(replies)
+        helper.client = SimpleNamespace(api_key="test-key",
+                                        chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=helper.fake)))
+        return helper
+    return make
+
+
+@pytest.fixture
+def make_pdf():
+    """make_pdf(pages) -> PDF bytes, one page per list of text lines"""
+    def make(pages):
+        buffer = BytesIO()
+        pdf = canvas.Canvas(buffer)
+        for lines in pages:
+            for row, line in enumerate(lines):
+                pdf.drawString(72, 760 - 16 * row, line)
+            pdf.showPage()
+        pdf.save()
+        return buffer.getvalue()
+    return make
@@ -0,0 +1,163 @@
+"""Tests for AIHelper's completion pipeline against a scripted client"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import groq
+import httpx
+import pytest
+
+from conftest import FakeCompletions
+from utils.ai_helper import AIHelper, EXTRACTION_FIELDS
+from utils.async_ai_helper import AsyncAIHelper
+from utils.json_repair import TruncatedJSONError
+from utils.model_router import DEFAULT_MODEL, ESCALATION_MODEL, ModelRouter
+from utils.rate_limiter import RateLimiter
+from utils.schemas import SCORE_CATEGORIES
+from utils.stream_json import RESTART_PATH
+
+UNSTRUCTURED_RESUME = """Jane Doe, jane@example.com
+Backend engineer at a fintech startup since 2019, before that support at a telco.
+Knows Python and Go."""
+
+
+def test_extraction_failure_returns_minimal_resume(make_helper):
+    helper = make_helper([RuntimeError("upstream down")])
+    data = helper.extract_resume_info(UNSTRUCTURED_RESUME, "Backend Engineer")
+    assert data == helper._create_minimal_resume("Backend Engineer")
+
+
+def test_extraction_failure_can_raise(make_helper):
+    helper = make_helper([RuntimeError("upstream down")])
+    with pytest.raises(RuntimeError):
+        helper.extract_resume_info(UNSTRUCTURED_RESUME, "Backend Engineer", raise_errors=True)
+
+
+def test_extraction_merges_llm_fields(make_helper):
+    answer = {field: "" for field in EXTRACTION_FIELDS}
+    answer.update({"name": "Jane Doe", "email": "jane@example.com", "skills": ["Python", "Go"],
+                   "education": [], "experience": [], "projects": [], "certifications": [], "languages": []})
+    helper = make_helper([json.dumps(answer)])
+    data = helper.extract_resume_info(UNSTRUCTURED_RESUME, "Backend Engineer")
+    assert data["skills"] == ["Python", "Go"]
+    assert data["target_role"] == "Backend Engineer"
+    assert len(helper.fake.requests) == 1
+
+
+class AsyncFakeCompletions(FakeCompletions):
+    async def create(self, **kwargs):
+        raw = FakeCompletions.create(self, **kwargs)
+        response = raw.parse()
+        
+        async def parse():
+            if not isinstance(response, list):
+                return response
+            
+            async def chunks():
+                for chunk in response:
+                    yield chunk
+            return chunks()
+        return SimpleNamespace(headers=raw.headers, parse=parse)
+
+
+def test_streamed_request_settles_its_reservation(make_helper):
+    limiter = RateLimiter(None, 100000)
+    helper = make_helper(['{"summary": "short"}'], rate_limiter=limiter)
+    assert helper.stream_complete("prompt", parse=helper.parse_json) == {"summary": "short"}
+    # Only the usage reported by the stream stays booked, not prompt + max_tokens
+    assert limiter.tokens.level == pytest.approx(100000 - 100 - len('{"summary": "short"}') // 4, abs=2)
+
+
+def test_streamed_request_without_usage_settles_an_estimate(make_helper):
+    limiter = RateLimiter(None, 100000)
+    helper = make_helper(rate_limiter=limiter)
+    helper.fake.replies = ['{"summary": "short"}']
+    helper.fake.stream_usage = False
+    helper.stream_complete("prompt", parse=helper.parse_json)
+    assert 100000 - limiter.tokens.level < 50
+
+
+
+def rate_limited():
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    return groq.RateLimitError("rate limited", body=None,
+                               response=httpx.Response(429, request=request, headers={"retry-after": "0"}))
+
+
+def test_failed_attempts_leave_the_token_bucket_unchanged(make_helper, monkeypatch):
+    limiter = RateLimiter(None, 100000)
+    helper = make_helper([RuntimeError("upstream down")], rate_limiter=limiter)
+    with pytest.raises(RuntimeError):
+        helper.complete("prompt")
+    assert limiter.tokens.level == pytest.approx(100000, abs=2)
+    
+    # The 429 gives its reservation back; only the answered attempt stays booked
+    helper.fake.replies = [rate_limited(), "ok"]
+    monkeypatch.setattr(helper, "_sleep", lambda seconds: None)
+    assert helper.complete("another prompt") == "ok"
+    assert limiter.stats["retries"] == 1
+    assert limiter.tokens.level == pytest.approx(100000 - 100, abs=2)
+
+def test_async_streamed_request_settles_its_reservation():
+    limiter = RateLimiter(None, 100000)
+    helper = AsyncAIHelper(AIHelper("test-key", rate_limiter=limiter), http_client=httpx.AsyncClient())
+    fake = AsyncFakeCompletions(['{"summary": "short"}'])
+    helper.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=fake)))
+    result = asyncio.run(helper.stream_complete("prompt", parse=helper.parse_json))
+    assert result == {"summary": "short"}
+    assert limiter.tokens.level == pytest.approx(100000 - 100 - len('{"summary": "short"}') // 4, abs=2)
+
+
+
+def test_async_helper_wraps_the_sync_helper(make_helper):
+    helper = make_helper(['{"a": 1}'])
+    async_helper = AsyncAIHelper(helper, http_client=httpx.AsyncClient())
+    assert not isinstance(async_helper, AIHelper)
+    assert helper.complete("prompt", parse=helper.parse_json) == {"a": 1}
+    # Answered from the wrapped helper's cache, without a request
+    assert asyncio.run(async_helper.complete("prompt", parse=async_helper.parse_json)) == {"a": 1}
+    assert len(helper.fake.requests) == 1
+
+def test_truncated_answer_is_not_cached(make_helper):
+    helper = make_helper([('{"a": [1, 2', "length"), '{"a": [1, 2, 3]}'])
+    with pytest.raises(TruncatedJSONError) as caught:
+        helper.complete("prompt", max_tokens=100, parse=helper.parse_json)
+    assert caught.value.value == {"a": [1, 2]}
+    assert helper.complete("prompt", max_tokens=100, parse=helper.parse_json) == {"a": [1, 2, 3]}
+    assert len(helper.fake.requests) == 2
+
+
+def test_truncated_score_asks_again_for_unfinished_fields(make_helper):
+    scores = {category: 70 for category in SCORE_CATEGORIES}
+    cut_off = json.dumps({"category_scores": scores, "strengths": ["Clear layout", "Quantified"]})[:-8]
+    fixes = json.dumps({"strengths": ["Clear layout", "Quantified results"], "improvements": {},
+                        "summary": "Solid resume."})
+    helper = make_helper([(cut_off, "length"), fixes], router=ModelRouter({"score": {"max_tokens": 256}}))
+    score = helper.calculate_ats_score({"name": "Jane Doe", "skills": ["Python"]})
+    assert score["strengths"] == ["Clear layout", "Quantified results"]
+    assert score["summary"] == "Solid resume."
+    assert score["category_scores"] == scores
+    fix_prompt = helper.fake.requests[1]["messages"][0]["content"]
+    assert "strengths: incomplete, the answer was cut off" in fix_prompt
+    assert "summary: missing, the answer was cut off" in fix_prompt
+    assert helper.schema_stats["fixed"] == 1
+
+
+def test_prose_with_braces_is_escalated_not_repaired(make_helper):
+    helper = make_helper(["Please fill in {name} and {email} first.", '{"a": 1}'])
+    assert helper.complete("prompt", task="score", parse=helper.parse_json) == {"a": 1}
+    assert [request["model"] for request in helper.fake.requests] == [DEFAULT_MODEL, ESCALATION_MODEL]
+    assert helper.json_repairs.stats()["failed"] == 1
+
+
+def test_retried_stream_restarts_the_reported_fields(make_helper):
+    helper = make_helper([('{"section": "skills", "action": "Add', "length"),
+                          '{"section": "summary", "action": "Rewrote"}'])
+    events = []
+    data = helper.stream_complete("prompt", task="edit", expected_tokens=50, parse=helper.parse_json,
+                                  on_field=lambda path, value: events.append((path, value)))
+    assert data == {"section": "summary", "action": "Rewrote"}
+    # The field shown from the cut-off attempt is cleared and reported again from the retry
+    assert events == [(("section",), "skills"), (RESTART_PATH, None),
+                      (("section",), "summary"), (("action",), "Rewrote")]
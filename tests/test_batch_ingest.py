@@ -0,0 +1,66 @@
+"""Tests for the batch ingestion pipeline's statuses and checkpointing"""
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+
+import pytest
+
+from utils import batch_ingest
+from utils.batch_ingest import BatchIngestor, load_checkpoint
+
+
+class FlakyHelper:
+    """Extraction that fails for the files listed in failing"""
+    
+    def __init__(self, failing):
+        self.failing = set(failing)
+        self.calls = []
+    
+    def extract_resume_info(self, text, role, raise_errors=False):
+        self.calls.append(text)
+        if text in self.failing:
+            if raise_errors:
+                raise RuntimeError("rate limited")
+            return {"name": ""}
+        return {"name": text, "target_role": role}
+
+
+@pytest.fixture(autouse=True)
+def parse_in_threads(monkeypatch):
+    # The parse stage only needs to hand the file's name on as its text
+    monkeypatch.setattr(batch_ingest, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(batch_ingest, "_parse_file", lambda path: (path.rsplit("/", 1)[-1], "digest", None))
+
+
+def test_failed_extraction_is_an_error_and_retried_on_resume(tmp_path):
+    output = str(tmp_path / "out.jsonl")
+    jobs = [("/resumes/good.pdf", "Dev"), ("/resumes/bad.pdf", "Dev")]
+    
+    summary = BatchIngestor(FlakyHelper({"bad.pdf"})).run(jobs, output)
+    assert summary == {"total": 2, "skipped": 0, "ok": 1, "failed": 0, "error": 1}
+    records = {record["path"]: record for record in map(json.loads, open(output))}
+    assert records["/resumes/bad.pdf"]["status"] == "error"
+    assert "rate limited" in records["/resumes/bad.pdf"]["error"]
+    assert load_checkpoint(output) == {"/resumes/good.pdf"}
+    
+    helper = FlakyHelper(set())
+    summary = BatchIngestor(helper).run(jobs, output)
+    assert helper.calls == ["bad.pdf"]
+    assert summary == {"total": 2, "skipped": 1, "ok": 1, "failed": 0, "error": 0}
+    assert load_checkpoint(output) == {"/resumes/good.pdf", "/resumes/bad.pdf"}
+
+
+def test_empty_extraction_is_not_mistaken_for_failure(tmp_path):
+    class EmptyHelper:
+        def extract_resume_info(self, text, role, raise_errors=False):
+            return {"name": "", "target_role": role, "skills": []}
+    
+    summary = BatchIngestor(EmptyHelper()).run([("/resumes/blank.pdf", "Dev")], str(tmp_path / "out.jsonl"))
+    assert summary["ok"] == 1
+
+
+def test_directory_scan_leaves_out_legacy_doc_files(tmp_path):
+    for name in ("a.pdf", "b.DOCX", "c.doc", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+    jobs = batch_ingest.collect_inputs(str(tmp_path), "Dev")
+    assert [path.rsplit("/", 1)[-1] for path, _ in jobs] == ["a.pdf", "b.DOCX"]
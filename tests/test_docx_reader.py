@@ -0,0 +1,64 @@
+"""Tests for reading DOCX text straight from the package XML"""
+
+from io import BytesIO
+import zipfile
+
+from utils.docx_reader import read_docx_blocks
+from utils.resume_parser import ResumeParser
+
+NS = ('xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+      'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"')
+
+
+def paragraph(*runs):
+    return '<w:p><w:pPr><w:tabs><w:tab/></w:tabs></w:pPr>' + ''.join(runs) + '</w:p>'
+
+
+def run(text):
+    return f'<w:r><w:t>{text}</w:t></w:r>'
+
+
+def make_docx(body, header=None, footer=None):
+    parts = {"word/document.xml": f'<w:document {NS}><w:body>{body}<w:sectPr/></w:body></w:document>'}
+    if header:
+        parts["word/header1.xml"] = f'<w:hdr {NS}>{header}</w:hdr>'
+        parts["word/header2.xml"] = f'<w:hdr {NS}>{header}</w:hdr>'
+    if footer:
+        parts["word/footer1.xml"] = f'<w:ftr {NS}>{footer}</w:ftr>'
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as package:
+        for name, xml in parts.items():
+            package.writestr(name, xml)
+    return buffer.getvalue()
+
+
+RESUME_DOCX = make_docx(
+    paragraph(run("Jane "), run("Doe")) +
+    paragraph(run("Engineer"), '<w:r><w:drawing><w:txbxContent>' + paragraph(run("Open to relocation")) +
+              '</w:txbxContent></w:drawing></w:r>') +
+    '<w:tbl><w:tblPr/><w:tr><w:tc>' + paragraph(run("Python")) + '</w:tc><w:tc>' + paragraph(run("5 years")) +
+    '</w:tc></w:tr></w:tbl>' +
+    '<w:sdt><w:sdtContent>' + paragraph(run("Led"), '<w:r><w:tab/></w:r>', run("a team")) + '</w:sdtContent></w:sdt>',
+    header=paragraph(run("jane@example.com")),
+    footer=paragraph(run("Page 1")),
+)
+
+
+def test_blocks_in_reading_order():
+    assert read_docx_blocks(RESUME_DOCX) == [
+        ("header", "jane@example.com"),
+        ("paragraph", "Jane Doe"),
+        ("paragraph", "Engineer"),
+        ("textbox", "Open to relocation"),
+        ("table_row", "Python | 5 years"),
+        ("paragraph", "Led\ta team"),
+        ("footer", "Page 1"),
+    ]
+
+
+def test_iter_resume_streams_docx_blocks_with_offsets():
+    chunks = list(ResumeParser.iter_resume(RESUME_DOCX, filename="resume.docx"))
+    text = ResumeParser.parse_docx(RESUME_DOCX)
+    assert [chunk.kind for chunk in chunks][:3] == ["header", "paragraph", "paragraph"]
+    for chunk in chunks:
+        assert text[chunk.start:chunk.end] == chunk.text
@@ -0,0 +1,56 @@
+"""Tests for section-level undo/redo"""
+
+from utils.edit_history import EditHistory
+from utils.resume_agent import ResumeAgent
+
+
+def test_undo_and_redo_restore_sections():
+    state = {"skills": ["Python"]}
+    history = EditHistory()
+    history.record(state, "skills")
+    state["skills"] = ["Python", "Go"]
+    history.record(state, "summary")
+    state["summary"] = "New"
+    
+    assert history.undo(state) == "summary"
+    assert "summary" not in state
+    assert history.undo(state) == "skills"
+    assert state == {"skills": ["Python"]}
+    assert history.undo(state) is None
+    
+    assert history.redo(state) == "skills"
+    assert state == {"skills": ["Python", "Go"]}
+    assert history.can_redo
+
+
+def test_new_edit_discards_redo():
+    state = {"skills": ["Python"]}
+    history = EditHistory()
+    history.record(state, "skills")
+    state["skills"] = ["Go"]
+    history.undo(state)
+    history.record(state, "skills")
+    assert not history.can_redo
+
+
+def test_history_is_bounded_and_isolated_from_later_changes():
+    state = {"skills": ["Python"]}
+    history = EditHistory(limit=2)
+    for skill in ("Go", "Rust", "Java"):
+        history.record(state, "skills")
+        state["skills"].append(skill)
+    assert len(history) == 2
+    history.undo(state)
+    history.undo(state)
+    assert state["skills"] == ["Python", "Go"]
+
+
+def test_agent_undoes_local_edit():
+    agent = ResumeAgent(ai_helper=None)  # a local edit never reaches the LLM
+    agent.initialize_resume({"name": "Jane", "skills": ["Python"]})
+    agent.process_command("add Go to skills")
+    assert agent.resume_state["skills"] == ["Python", "Go"]
+    agent.undo_last_change()
+    assert agent.resume_state["skills"] == ["Python"]
+    agent.redo_last_change()
+    assert agent.resume_state["skills"] == ["Python", "Go"]
@@ -0,0 +1,47 @@
+"""Tests for applying RFC 6902 patches to resume sections"""
+
+import pytest
+
+from utils.json_patch import JSONPatchError, apply_patch, get_value, parse_pointer
+
+
+def test_pointer_escapes():
+    assert parse_pointer("") == []
+    assert parse_pointer("/a~1b/c~0d/0") == ["a/b", "c~d", "0"]
+    with pytest.raises(JSONPatchError):
+        parse_pointer("no-slash")
+
+
+def test_operations_apply_in_order_to_a_copy():
+    document = {"skills": ["Python"], "experience": [{"title": "Dev", "achievements": ["Wrote code"]}]}
+    patched = apply_patch(document, [
+        {"op": "add", "path": "/skills/-", "value": "Go"},
+        {"op": "replace", "path": "/experience/0/title", "value": "Senior Dev"},
+        {"op": "copy", "from": "/skills/0", "path": "/languages"},
+        {"op": "move", "from": "/experience/0/achievements/0", "path": "/experience/0/summary"},
+        {"op": "test", "path": "/skills/1", "value": "Go"},
+    ])
+    assert patched == {"skills": ["Python", "Go"], "languages": "Python",
+                       "experience": [{"title": "Senior Dev", "achievements": [], "summary": "Wrote code"}]}
+    assert document == {"skills": ["Python"], "experience": [{"title": "Dev", "achievements": ["Wrote code"]}]}
+    assert get_value(patched, "/experience/0/title") == "Senior Dev"
+
+
+def test_failed_operation_fails_the_whole_patch():
+    document = {"skills": ["Python"]}
+    with pytest.raises(JSONPatchError):
+        apply_patch(document, [{"op": "add", "path": "/skills/-", "value": "Go"},
+                               {"op": "remove", "path": "/skills/5"}])
+    assert document == {"skills": ["Python"]}
+
+
+@pytest.mark.parametrize("patch", [
+    {"op": "add", "path": "/a"},
+    [{"op": "add", "value": 1}],
+    [{"op": "frobnicate", "path": "/a", "from": "/a"}],
+    [{"op": "move", "from": "/a", "path": "/a/b"}],
+    [{"op": "test", "path": "/a", "value": 2}],
+])
+def test_malformed_or_failing_patches_raise(patch):
+    with pytest.raises(JSONPatchError):
+        apply_patch({"a": {"b": 1}}, patch)
@@ -0,0 +1,68 @@
+"""Tests for repairing the JSON payload of a completion"""
+
+import json
+
+import pytest
+
+from utils.json_repair import (
+    MISSING_COMMA, SINGLE_QUOTES, TRAILING_COMMA, TRUNCATED, UNQUOTED_KEY,
+    JSONRepairStats, loads_tolerant, repair_json
+)
+
+
+def test_valid_json_in_fence_needs_no_repair():
+    value, repairs = loads_tolerant('Here it is:\n```json\n{"a": [1, 2]}\n```')
+    assert value == {"a": [1, 2]}
+    assert repairs == []
+
+
+def test_common_defects_are_fixed_in_one_pass():
+    value, repairs = loads_tolerant("{name: 'Jane', \"skills\": [\"Python\" \"Go\",], \"ok\": True}")
+    assert value == {"name": "Jane", "skills": ["Python", "Go"], "ok": True}
+    assert {UNQUOTED_KEY, SINGLE_QUOTES, MISSING_COMMA, TRAILING_COMMA} <= set(repairs)
+
+
+def test_unescaped_quote_inside_string_is_kept():
+    value, _ = loads_tolerant('{"summary": "the "best" way"}')
+    assert value == {"summary": 'the "best" way'}
+
+
+def test_cut_off_payload_is_closed_and_reported():
+    value, repairs = loads_tolerant('{"a": 1, "b": ["x", "y')
+    assert value == {"a": 1, "b": ["x", "y"]}
+    assert TRUNCATED in repairs
+
+
+def test_array_payload_can_skip_object_wrapper():
+    text, _ = repair_json('{"note": "see below"} ["a", "b"]', '[')
+    assert json.loads(text) == ["a", "b"]
+
+
+def test_fenced_payload_wins_over_braces_in_prose():
+    value, repairs = loads_tolerant('I used {placeholders} below:\n```json\n{"a": 1}\n```')
+    assert value == {"a": 1}
+    assert repairs == []
+
+
+def test_braces_in_prose_are_skipped_without_a_fence():
+    value, _ = loads_tolerant('Replace {name} with yours: {"a": 1}')
+    assert value == {"a": 1}
+
+
+def test_prose_braces_alone_raise():
+    with pytest.raises(json.JSONDecodeError):
+        loads_tolerant("Fill in {name} and [see above] first.")
+
+
+def test_text_without_json_raises():
+    with pytest.raises(json.JSONDecodeError):
+        loads_tolerant("no payload here")
+
+
+def test_stats_count_repairs_and_failures():
+    stats = JSONRepairStats()
+    stats.record([])
+    stats.record([TRAILING_COMMA, TRUNCATED])
+    stats.record_failure()
+    assert stats.stats() == {"parsed": 2, "repaired": 1, "failed": 1,
+                             "repairs": {TRAILING_COMMA: 1, TRUNCATED: 1}}
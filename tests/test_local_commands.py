@@ -0,0 +1,62 @@
+"""Tests for commands applied without the LLM"""
+
+from utils.local_commands import LocalCommandRouter
+
+
+RESUME = {
+    "name": "Jane Doe",
+    "professional_summary": "Engineer. Builds APIs. Leads teams. Mentors juniors.",
+    "skills": {"technical": ["Python", "SQL"], "soft": ["Communication"]},
+    "certifications": ["AWS Certified Solutions Architect", "CKA"],
+    "experience": [{
+        "title": "Engineer",
+        "achievements": ["Worked on the billing service", "Made a mistake and fixed it", "Used to lead the team"],
+    }],
+}
+
+
+def test_add_items_to_categorised_skills():
+    edit = LocalCommandRouter.route("Add Go and Rust to my skills", RESUME)
+    assert edit["updated_content"]["technical"] == ["Python", "SQL", "Go", "Rust"]
+    assert edit["updated_content"]["soft"] == ["Communication"]
+    assert RESUME["skills"]["technical"] == ["Python", "SQL"]
+
+
+def test_add_existing_item_changes_nothing():
+    edit = LocalCommandRouter.route("add python to skills", RESUME)
+    assert edit["updated_content"] is None
+
+
+def test_remove_item_by_partial_name():
+    edit = LocalCommandRouter.route("remove AWS from certifications", RESUME)
+    assert edit["updated_content"] == ["CKA"]
+    assert edit["change_type"] == "remove"
+
+
+def test_ambiguous_remove_goes_to_llm():
+    resume = {"skills": ["Java", "JavaScript"]}
+    assert LocalCommandRouter.route("remove Jav from skills", resume) is None
+
+
+def test_set_field_validates_value():
+    edit = LocalCommandRouter.route("change my email to jane@example.com", RESUME)
+    assert edit["section"] == "email" and edit["updated_content"] == "jane@example.com"
+    assert LocalCommandRouter.route("change my email to not-an-email", RESUME) is None
+
+
+def test_summary_shortening_goes_to_llm():
+    assert LocalCommandRouter.route("Make summary more concise", RESUME) is None
+    assert LocalCommandRouter.route("make my summary shorter", RESUME) is None
+
+
+def test_stronger_verbs_goes_to_llm():
+    assert LocalCommandRouter.route("Use stronger action verbs", RESUME) is None
+
+
+def test_set_role_only_takes_literal_values():
+    edit = LocalCommandRouter.route("change target role to Senior Backend Engineer", RESUME)
+    assert edit["section"] == "target_role" and edit["updated_content"] == "Senior Backend Engineer"
+    edit = LocalCommandRouter.route('set target role to "Something Labs Lead"', RESUME)
+    assert edit["updated_content"] == "Something Labs Lead"
+    assert LocalCommandRouter.route("change target role to something more senior", RESUME) is None
+    assert LocalCommandRouter.route("set my name to my name as it appears on my passport", RESUME) is None
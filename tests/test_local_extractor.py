@@ -0,0 +1,90 @@
+"""Tests for rule-based resume extraction and its confidence scores"""
+
+from utils.local_extractor import LocalResumeExtractor
+
+CLEAN_RESUME = """Jane Doe
+jane@example.com | +1 555 010 0199
+
+SUMMARY
+Backend engineer with eight years of experience building payment systems.
+
+EXPERIENCE
+Senior Engineer | Acme Inc. | Jan 2020 - Present
+- Built the payments API
+- Cut p99 latency by 40%
+Software Engineer at Globex
+2016 - 2019
+- Migrated billing to Postgres
+
+EDUCATION
+B.S. Computer Science, Stanford University, 2015
+
+SKILLS
+Python, Go, SQL
+
+PROJECTS
+Ledger | Python, Postgres
+- Built a double-entry ledger
+"""
+
+
+def test_clean_resume_is_extracted_locally_with_high_confidence():
+    result = LocalResumeExtractor.extract(CLEAN_RESUME, "Backend Engineer")
+    data = result["data"]
+    assert data["name"] == "Jane Doe"
+    assert data["email"] == "jane@example.com"
+    assert data["skills"] == ["Python", "Go", "SQL"]
+    assert data["experience"][0] == {
+        "title": "Senior Engineer",
+        "company": "Acme Inc.",
+        "duration": "Jan 2020 - Present",
+        "responsibilities": ["Built the payments API", "Cut p99 latency by 40%"],
+    }
+    assert data["experience"][1]["company"] == "Globex"
+    assert data["projects"][0]["technologies"] == ["Python", "Postgres"]
+    assert result["confidence"] >= 0.85
+    assert result["low_confidence_fields"] == []
+
+
+def test_prose_experience_gets_near_zero_confidence():
+    text = CLEAN_RESUME.split("EXPERIENCE")[0] + """EXPERIENCE
+I worked as a backend engineer at a fintech startup for several years.
+I designed the payments platform. I also mentored four junior engineers.
+Before that I spent two years doing support for an internal tools team.
+
+EDUCATION""" + CLEAN_RESUME.split("EDUCATION")[1]
+    result = LocalResumeExtractor.extract(text, "Backend Engineer")
+    assert result["field_confidence"]["experience"] < 0.1
+    assert "experience" in result["low_confidence_fields"]
+    # Low enough overall that the whole resume goes to the LLM
+    assert result["confidence"] < 0.85
+
+
+def test_header_without_dates_or_bullets_is_not_trusted():
+    value, confidence = LocalResumeExtractor._parse_experience(["Team player", "Various duties"])
+    assert value
+    assert confidence < 0.1
+    _, confidence = LocalResumeExtractor._parse_experience(["Data Analyst"])
+    assert confidence < 0.1
+
+
+def test_education_institution_drops_gpa_and_fills_gpa_field():
+    value, confidence = LocalResumeExtractor._parse_education(
+        ["B.S. Computer Science, Stanford University,  GPA: 3.8/4.0, 2015"]
+    )
+    assert value == [{
+        "degree": "B.S. Computer Science",
+        "institution": "Stanford University",
+        "year": "2015",
+        "gpa": "3.8/4.0",
+    }]
+    assert confidence == 1.0
+
+
+def test_education_institution_on_its_own_line_drops_degree_text():
+    value, _ = LocalResumeExtractor._parse_education(
+        ["Master of Science in Data Science", "Harvard University, Cambridge, MA | M.S. | 2018"]
+    )
+    assert value[0]["degree"] == "Master of Science in Data Science"
+    assert value[0]["institution"] == "Harvard University, Cambridge, MA"
+    assert value[0]["year"] == "2018"
@@ -0,0 +1,68 @@
+"""Tests for the local mock chat-completions server"""
+
+import json
+import urllib.request
+
+import pytest
+
+from mock_llm_server import run_load_test
+from utils.mock_llm import COMPLETIONS_SUFFIX, LatencyModel, MockLLMServer, ReplayStore, synthetic_completion
+from utils.schemas import SCORE_SCHEMA
+
+
+@pytest.fixture
+def server():
+    with MockLLMServer(seed=1) as mock:
+        yield mock
+
+
+def post(server, body):
+    request = urllib.request.Request(server.base_url + COMPLETIONS_SUFFIX, data=json.dumps(body).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.read().decode("utf-8")
+
+
+def messages(prompt):
+    return [{"role": "user", "content": prompt}]
+
+
+def test_synthetic_answers_match_their_schema():
+    answer = json.loads(synthetic_completion(messages("You are an ATS (Applicant Tracking System) expert.")))
+    _, errors = SCORE_SCHEMA.validate(answer)
+    assert errors == {}
+    assert synthetic_completion(messages("Say hi")) == "SUCCESS"
+
+
+def test_answer_is_cut_off_at_max_tokens(server):
+    prompt = "You are an ATS (Applicant Tracking System) expert."
+    body = json.loads(post(server, {"model": "m", "messages": messages(prompt), "max_tokens": 20}))
+    choice = body["choices"][0]
+    assert choice["finish_reason"] == "length"
+    assert len(choice["message"]["content"]) == 80
+    assert server.stats["truncated"] == 1
+
+
+def test_replayed_answer_and_streamed_usage(server):
+    server.store = ReplayStore()
+    server.store.record(messages("ping"), "m", "pong", 0.0)
+    body = json.loads(post(server, {"model": "m", "messages": messages("ping")}))
+    assert body["choices"][0]["message"]["content"] == "pong"
+    assert server.stats["replayed"] == 1
+    
+    events = [line[len("data: "):] for line in post(server, {"model": "m", "messages": messages("ping"),
+                                                              "stream": True}).splitlines()
+              if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(event) for event in events[:-1]]
+    assert "".join(chunk["choices"][0]["delta"].get("content") or "" for chunk in chunks) == "pong"
+    assert chunks[-1]["x_groq"]["usage"]["completion_tokens"] >= 1
+
+
+def test_load_test_sends_one_request_per_operation(monkeypatch):
+    # All nine operations in flight at once, so identical requests would be coalesced
+    with MockLLMServer(latency=LatencyModel("fixed", 0.2)) as mock:
+        monkeypatch.setenv("GROQ_BASE_URL", mock.base_url)
+        summary = run_load_test(mock.base_url, 9, 9)
+        assert mock.stats["requests"] == summary["operations"] == 9
+    assert {route: stats["calls"] for route, stats in summary["routes"].items()} == {"edit": 3, "score": 3, "suggest": 3}
@@ -0,0 +1,51 @@
+"""Tests for per-task model routing"""
+
+from utils.model_router import DEFAULT_MODEL, ESCALATION_MODEL, ModelRouter, create_model_router_from_env
+
+
+def test_overrides_replace_single_route_fields():
+    router = ModelRouter({"edit": {"max_tokens": 800}, "translate": {"temperature": 0.1}})
+    edit = router.route("edit")
+    assert edit.max_tokens == 800
+    assert edit.model == DEFAULT_MODEL and edit.escalate_to == ESCALATION_MODEL and edit.json_mode
+    assert router.route("translate").temperature == 0.1
+    assert router.route("unknown") == router.route(None)
+
+
+def test_default_model_moves_small_model_routes_only():
+    router = ModelRouter({"extract": {"model": ESCALATION_MODEL}}, default_model="small-model")
+    assert router.route("score").model == "small-model"
+    assert router.route("extract").model == ESCALATION_MODEL
+    assert router.route(None).model == "small-model"
+
+
+def test_stats_per_route():
+    router = ModelRouter()
+    router.record("score", DEFAULT_MODEL, 0.5, 100, 40)
+    router.record("score", ESCALATION_MODEL, 1.5, None, 60)
+    router.record_escalation("score")
+    assert router.stats() == {"score": {
+        "calls": 2, "escalations": 1, "avg_latency": 1.0, "prompt_tokens": 100, "completion_tokens": 100,
+        "models": {DEFAULT_MODEL: 1, ESCALATION_MODEL: 1},
+    }}
+
+
+def test_env_routes_and_invalid_json(monkeypatch):
+    monkeypatch.setenv("LLM_ROUTES", '{"edit": {"max_tokens": 700}}')
+    assert create_model_router_from_env().route("edit").max_tokens == 700
+    monkeypatch.setenv("LLM_ROUTES", "{not json")
+    assert create_model_router_from_env().route("edit").max_tokens == 2000
+
+
+def test_bad_override_fields_are_ignored(monkeypatch, capsys):
+    router = ModelRouter({
+        "edit": {"max_tokens": "800", "temperature": 0.1, "modle": "x", "json_mode": 1},
+        "patch": ["not", "an", "object"],
+    })
+    edit = router.route("edit")
+    assert edit.temperature == 0.1 and edit.max_tokens == 2000 and edit.json_mode is True
+    assert router.route("patch").max_tokens == 1200
+    output = capsys.readouterr().out
+    assert "edit.modle" in output and "edit.max_tokens" in output and "edit.json_mode" in output
+    monkeypatch.setenv("LLM_ROUTES", '[{"edit": {"max_tokens": 700}}]')
+    assert create_model_router_from_env().route("edit").max_tokens == 2000
@@ -0,0 +1,57 @@
+"""Tests for the content-hash parse cache"""
+
+import threading
+
+from utils.parse_cache import ParseCache
+
+
+def test_key_depends_on_content_and_version():
+    key = ParseCache.make_key(b"resume", "1")
+    assert key == ParseCache.make_key(b"resume", "1")
+    assert key != ParseCache.make_key(b"resume!", "1")
+    assert key != ParseCache.make_key(b"resume", "2")
+
+
+def test_memory_tier_is_lru_bounded():
+    cache = ParseCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"  # a becomes most recent
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert cache.stats() == {"hits": 3, "misses": 1, "memory_entries": 2}
+
+
+def test_disk_tier_survives_a_new_cache_and_is_promoted(tmp_path):
+    ParseCache(disk_dir=str(tmp_path)).put("key", "text")
+    cache = ParseCache(disk_dir=str(tmp_path))
+    assert cache.get("key") == "text"
+    assert cache.stats()["memory_entries"] == 1
+
+
+def test_disk_tier_evicts_beyond_its_budget(tmp_path):
+    cache = ParseCache(max_entries=1, disk_dir=str(tmp_path), max_disk_bytes=10)
+    cache.put("old", "x" * 8)
+    cache.put("new", "y" * 8)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["new.txt"]
+
+
+def test_counters_are_exact_under_concurrency(tmp_path):
+    cache = ParseCache(disk_dir=str(tmp_path))
+    cache.put("hit", "text")
+    
+    def worker():
+        for _ in range(200):
+            cache.get("hit")
+            cache.get("miss")
+    
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats["hits"] == 1600
+    assert stats["misses"] == 1600
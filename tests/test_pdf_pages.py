@@ -0,0 +1,62 @@
+"""Tests for PDF page extraction"""
+
+from utils import resume_parser
+from utils.resume_parser import ResumeParser
+
+
+def page_lines(page):
+    return [f"Page {page} of the resume", f"Experience entry number {page} with plain text"]
+
+
+def test_parallel_extraction_keeps_page_order(make_pdf, monkeypatch):
+    data = make_pdf([page_lines(page) for page in range(10)])
+    monkeypatch.setattr(ResumeParser, "MAX_PDF_WORKERS", 3)
+    
+    sequential = ResumeParser.parse_pdf(data, parallel=False)
+    assert ResumeParser._extract_pages_parallel(data, 10) == resume_parser._extract_page_texts(
+        resume_parser._open_pdf_reader(data), 0, 10)
+    assert ResumeParser.parse_pdf(data, parallel=True) == sequential
+    positions = [sequential.index(f"Page {page} of") for page in range(10)]
+    assert positions == sorted(positions)
+
+
+def test_page_cap_applies_to_parallel_extraction(make_pdf, monkeypatch):
+    data = make_pdf([page_lines(page) for page in range(10)])
+    monkeypatch.setattr(ResumeParser, "MAX_PDF_WORKERS", 3)
+    text = ResumeParser.parse_pdf(data, max_pages=9, parallel=True)
+    assert "Page 8 of" in text and "Page 9 of" not in text
+
+
+def test_quality_score_flags_garbled_pages():
+    clean = ResumeParser._text_quality("Senior engineer with eight years of backend experience.")
+    assert clean > ResumeParser.MIN_PAGE_QUALITY
+    assert ResumeParser._text_quality("(cid:12)(cid:34)(cid:56) \ufffd\ufffd") < ResumeParser.MIN_PAGE_QUALITY
+    assert ResumeParser._text_quality("Seniorengineerwitheightyearsofbackendexperience") < clean
+    assert ResumeParser._text_quality("") == 0.0
+
+
+def test_only_weak_pages_are_re_extracted(make_pdf, monkeypatch):
+    data = make_pdf([page_lines(page) for page in range(3)])
+    extract_page_texts = resume_parser._extract_page_texts
+    
+    def garble_second_page(pdf_reader, start, end):
+        texts = extract_page_texts(pdf_reader, start, end)
+        return ["(cid:1)(cid:2)(cid:3)" if start + i == 1 else text for i, text in enumerate(texts)]
+    
+    plumber_pages = []
+    plumber_extract = resume_parser.pdfplumber.page.Page.extract_text
+    
+    def spy_extract(page, *args, **kwargs):
+        plumber_pages.append(page.page_number)
+        return plumber_extract(page, *args, **kwargs)
+    
+    monkeypatch.setattr(resume_parser, "_extract_page_texts", garble_second_page)
+    monkeypatch.setattr(resume_parser.pdfplumber.page.Page, "extract_text", spy_extract)
+    text = ResumeParser.parse_pdf(data, parallel=False)
+    assert plumber_pages == [2]  # pdfplumber numbers pages from 1
+    assert "Page 1 of the resume" in text and "cid:" not in text
+    
+    plumber_pages.clear()
+    monkeypatch.setattr(resume_parser, "_extract_page_texts", extract_page_texts)
+    ResumeParser.parse_pdf(data, parallel=False)
+    assert plumber_pages == []
@@ -0,0 +1,128 @@
+"""Tests for the rate limiter, retry delays and request coalescing"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.rate_limiter import AsyncSingleFlight, RateLimiter, SingleFlight, TokenBucket, parse_duration, retry_delay
+
+
+def test_parse_duration_accepts_seconds_and_groq_reset_format():
+    assert parse_duration("12") == 12
+    assert parse_duration("2m59.5s") == pytest.approx(179.5)
+    assert parse_duration("350ms") == pytest.approx(0.35)
+    assert parse_duration(None) is None
+    assert parse_duration("soon") is None
+
+
+def test_retry_delay_follows_headers_then_backs_off():
+    assert 5 <= retry_delay(0, {"retry-after": "5"}, base=1.0) <= 6
+    exhausted = {"x-ratelimit-remaining-tokens": "0", "x-ratelimit-reset-tokens": "7.5s"}
+    assert 7.5 <= retry_delay(0, exhausted, base=1.0) <= 8.5
+    assert 0 <= retry_delay(10, None, base=1.0, cap=4.0) <= 4.0
+
+
+def test_token_bucket_queues_callers_behind_debt():
+    bucket = TokenBucket(60)  # one unit per second
+    assert bucket.reserve(60) == 0
+    assert bucket.reserve(30) == pytest.approx(30, abs=0.5)
+    bucket.refund(30)
+    assert bucket.reserve(0) == pytest.approx(0, abs=0.5)
+
+
+def test_settle_refunds_unused_tokens():
+    limiter = RateLimiter(None, 1000)
+    limiter.acquire(800)
+    limiter.settle(800, 100)
+    assert limiter.tokens.level == pytest.approx(900, abs=1)
+
+
+def test_header_pause_is_clamped(monkeypatch, capsys):
+    monkeypatch.setattr(RateLimiter, "MAX_PAUSE", 5.0)
+    limiter = RateLimiter(None, None)
+    limiter.update_from_headers({"retry-after": "86400"})
+    assert limiter._blocked_until - time.monotonic() <= 5.0
+    assert "clamped" in capsys.readouterr().out
+    
+    limiter.update_from_headers({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "2s"})
+    assert limiter._blocked_until - time.monotonic() <= 5.0
+
+
+def test_headers_sync_token_budget():
+    limiter = RateLimiter(None, 6000)
+    limiter.update_from_headers({"x-ratelimit-limit-tokens": "12000", "x-ratelimit-remaining-tokens": "500"})
+    assert limiter.tokens.capacity == 12000
+    assert limiter.tokens.level <= 500
+
+
+def test_single_flight_shares_result_between_threads():
+    flight = SingleFlight()
+    started = threading.Event()
+    calls = []
+    
+    def slow():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return "answer"
+    
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+    leader.start()
+    started.wait()
+    results.append(flight.do("k", slow))
+    leader.join()
+    assert results == ["answer", "answer"]
+    assert calls == [1]
+    assert flight.coalesced == 1
+
+
+def test_async_single_flight_shares_result_and_errors():
+    async def main():
+        flight = AsyncSingleFlight()
+        calls = []
+        
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "answer"
+        
+        async def failing():
+            await asyncio.sleep(0.05)
+            raise ValueError("bad")
+        
+        assert await asyncio.gather(flight.do("k", slow), flight.do("k", slow)) == ["answer", "answer"]
+        errors = await asyncio.gather(flight.do("e", failing), flight.do("e", failing), return_exceptions=True)
+        assert all(isinstance(error, ValueError) for error in errors)
+        return calls, flight.coalesced
+    
+    calls, coalesced = asyncio.run(main())
+    assert calls == [1]
+    assert coalesced == 2
+
+
+def test_async_single_flight_follower_survives_cancelled_leader():
+    async def main():
+        flight = AsyncSingleFlight()
+        calls = []
+        
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "answer"
+        
+        leader = asyncio.ensure_future(flight.do("k", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("k", slow))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        result = await asyncio.wait_for(follower, timeout=1)
+        assert leader.cancelled()
+        return result, len(calls), flight._calls
+    
+    result, calls, in_flight = asyncio.run(main())
+    assert result == "answer"
+    assert calls == 2
+    assert in_flight == {}
@@ -0,0 +1,59 @@
+"""Tests for the LLM response caches"""
+
+import time
+
+import pytest
+
+from utils.response_cache import MemoryResponseCache, ResponseCache, SQLiteResponseCache
+
+
+def test_base_class_cannot_be_instantiated():
+    with pytest.raises(TypeError):
+        ResponseCache()
+
+
+def test_key_covers_every_request_parameter():
+    key = ResponseCache.make_key("model", "prompt", 0.3, 100)
+    assert key == ResponseCache.make_key("model", "prompt", 0.3, 100)
+    assert key != ResponseCache.make_key("model", "prompt", 0.3, 200)
+    assert key != ResponseCache.make_key("model", "prompt", 0.3, 100, json_mode=True)
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryResponseCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 0.667}
+
+
+def test_memory_cache_expires_entries():
+    cache = MemoryResponseCache(ttl=0)
+    cache.set("a", "1")
+    time.sleep(0.01)
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_prunes_once_per_batch_of_writes(tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.sqlite3"), max_entries=3)
+    cache.PRUNE_EVERY = 5
+    
+    def rows():
+        return cache._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    for index in range(4):
+        cache.set(f"k{index}", str(index))
+    assert rows() == 4
+    cache.set("k4", "4")
+    assert rows() == 3
+    assert cache.get("k4") == "4"
+    assert cache.get("k0") is None
+
+
+def test_sqlite_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    SQLiteResponseCache(path).set("a", "1")
+    assert SQLiteResponseCache(path).get("a") == "1"
@@ -0,0 +1,61 @@
+"""Tests for the resume parser's pre-flight checks"""
+
+from types import SimpleNamespace
+
+import PyPDF2
+import pytest
+
+from utils import resume_parser
+from utils.parse_cache import ParseCache
+from utils.resume_parser import ResumeParser
+
+
+def test_rejected_upload_returns_none_by_default():
+    assert ResumeParser.parse_resume(b"not a pdf at all", filename="resume.pdf") is None
+
+
+def test_rejected_upload_can_raise_its_reason():
+    with pytest.raises(ValueError, match="not a valid PDF"):
+        ResumeParser.parse_resume(b"not a pdf at all", filename="resume.pdf", raise_rejected=True)
+    assert ResumeParser.preflight(b"not a pdf at all", filename="resume.pdf") == (False, "File is not a valid PDF")
+
+
+def test_oversized_upload_is_rejected_before_parsing(monkeypatch):
+    monkeypatch.setattr(ResumeParser, "MAX_UPLOAD_BYTES", 10)
+    with pytest.raises(ValueError, match="the limit is"):
+        ResumeParser.parse_resume(b"%PDF-1.4 " + b"x" * 20, filename="resume.pdf", raise_rejected=True)
+
+
+def test_page_limit_reads_count_without_loading_pages(make_pdf, monkeypatch):
+    flattened = []
+    flatten = PyPDF2.PdfReader._flatten
+    
+    def spy_flatten(reader, *args, **kwargs):
+        flattened.append(reader)
+        return flatten(reader, *args, **kwargs)
+    
+    monkeypatch.setattr(PyPDF2.PdfReader, "_flatten", spy_flatten)
+    monkeypatch.setattr(ResumeParser, "MAX_PDF_PAGE_COUNT", 2)
+    data = make_pdf([["Jane Doe"], ["Experience"], ["Education"]])
+    assert ResumeParser.preflight(data, filename="resume.pdf") == (False, "PDF has 3 pages; the limit is 2")
+    assert flattened == []
+
+
+def test_malformed_page_count_falls_back_to_the_page_tree():
+    reader = SimpleNamespace(trailer={"/Root": {"/Pages": {"/Count": "many"}}}, pages=["one", "two"])
+    assert resume_parser._pdf_page_count(reader) == 2
+
+
+def test_upload_is_opened_once(make_pdf, monkeypatch):
+    opened = []
+    open_pdf_reader = resume_parser._open_pdf_reader
+    
+    def spy_open(data):
+        opened.append(data)
+        return open_pdf_reader(data)
+    
+    monkeypatch.setattr(resume_parser, "_open_pdf_reader", spy_open)
+    monkeypatch.setattr(ResumeParser, "cache", ParseCache(max_entries=4))
+    text = ResumeParser.parse_resume(make_pdf([["Jane Doe"], ["Experience at Acme"]]), filename="resume.pdf")
+    assert "Jane Doe" in text and "Acme" in text
+    assert len(opened) == 1
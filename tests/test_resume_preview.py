@@ -0,0 +1,36 @@
+"""Tests for the agent's per-section preview rendering"""
+
+from utils.resume_agent import ResumeAgent
+
+RESUME = {
+    "name": "Jane Doe", "email": "jane@example.com", "target_role": "Engineer",
+    "professional_summary": "Builds R&D APIs.",
+    "skills": {"technical": ["Python"], "soft": ["Mentoring"]},
+    "experience": [{"title": "Dev", "company": "Acme", "duration": "2020", "achievements": ["Shipped v2"]}],
+}
+
+
+def test_only_changed_sections_are_rendered_again():
+    agent = ResumeAgent(ai_helper=None)
+    agent.initialize_resume(RESUME)
+    first = agent.get_resume_pdf_html()
+    sections = len(ResumeAgent.PAGE_SECTIONS)
+    assert agent.render_stats == {"rendered": sections, "cached": 0}
+    assert "Builds R&amp;D APIs." in first
+    
+    _, html = agent.process_command("add Go to skills")
+    assert agent.render_stats == {"rendered": sections + 1, "cached": sections - 1}
+    assert "Go" in html and "highlighted" in html
+    assert agent.get_resume_pdf_html(highlight_changes=True) == html
+    assert agent.render_stats["rendered"] == sections + 1
+
+
+def test_template_switch_reuses_fragments():
+    agent = ResumeAgent(ai_helper=None)
+    agent.initialize_resume(RESUME)
+    professional = agent.get_resume_pdf_html()
+    agent.template_name = "modern"
+    modern = agent.get_resume_pdf_html()
+    assert agent.render_stats["rendered"] == len(ResumeAgent.PAGE_SECTIONS)
+    assert professional != modern
+    assert professional.split("</style>")[1] == modern.split("</style>")[1]
@@ -0,0 +1,59 @@
+"""Tests for the streaming parser API"""
+
+from io import BytesIO
+
+from docx import Document
+import pytest
+
+from utils import resume_parser
+from utils.resume_parser import PAGE_BREAK, ResumeParser
+
+
+def make_docx(paragraphs):
+    document = Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def assert_offsets(chunks, separator):
+    joined = separator.join(chunk.text for chunk in chunks)
+    for chunk in chunks:
+        assert joined[chunk.start:chunk.end] == chunk.text
+    return joined
+
+
+def test_pdf_streams_one_chunk_per_page(make_pdf):
+    data = make_pdf([["Jane Doe", "Engineer"], [], ["Experience at Acme"]])
+    chunks = list(ResumeParser.iter_resume(data, filename="resume.pdf"))
+    assert [(chunk.index, chunk.kind) for chunk in chunks] == [(0, "page"), (1, "page")]  # the empty page is skipped
+    assert "Jane Doe" in chunks[0].text and "Acme" in chunks[1].text
+    # Offsets point into the same text parse_pdf returns
+    assert assert_offsets(chunks, PAGE_BREAK).strip() == ResumeParser.parse_pdf(data, parallel=False)
+
+
+def test_pdf_stream_falls_back_to_pdfplumber(make_pdf, monkeypatch):
+    data = make_pdf([["Jane Doe"], ["Experience at Acme"]])
+    expected = [chunk.text for chunk in ResumeParser.iter_pdf_pages(data)]
+    
+    def broken_reader(data):
+        raise ValueError("damaged xref")
+    
+    monkeypatch.setattr(resume_parser, "_open_pdf_reader", broken_reader)
+    chunks = list(ResumeParser.iter_pdf_pages(data))
+    assert [chunk.text.strip() for chunk in chunks] == [text.strip() for text in expected]
+    assert assert_offsets(chunks, PAGE_BREAK).strip() == ResumeParser.parse_pdf(data)
+
+
+def test_docx_streams_paragraphs_matching_the_parsed_text():
+    data = make_docx(["Jane Doe", "Engineer", "Led a team of five"])
+    chunks = list(ResumeParser.iter_resume(data, filename="resume.docx"))
+    assert [chunk.text for chunk in chunks] == ["Jane Doe", "Engineer", "Led a team of five"]
+    assert assert_offsets(chunks, "\n") == ResumeParser.parse_docx(data)
+
+
+def test_unsupported_format_raises():
+    with pytest.raises(ValueError, match="Unsupported"):
+        list(ResumeParser.iter_resume(b"plain text", filename="resume.txt"))
@@ -0,0 +1,50 @@
+"""Tests for validating and coercing LLM answers against schemas"""
+
+import pytest
+
+from utils.schemas import GENERATED_RESUME_SCHEMA, RESUME_SCHEMA, SCORE_CATEGORIES, SCORE_SCHEMA, Schema
+
+
+def test_safe_coercions_are_not_errors():
+    data = {"skills": "Python, SQL, Go", "experience": {"title": "Engineer", "achievements": "- Led a team\n- Cut costs"},
+            "custom": 1}
+    cleaned, errors = RESUME_SCHEMA.validate(data)
+    assert errors == {}
+    assert cleaned["skills"] == ["Python", "SQL", "Go"]
+    assert cleaned["experience"] == [{"title": "Engineer", "achievements": ["Led a team", "Cut costs"]}]
+    assert cleaned["custom"] == 1
+
+
+def test_scores_are_parsed_and_clamped():
+    scores = {category: "85/100" for category in SCORE_CATEGORIES}
+    scores["format"] = 140
+    cleaned, errors = SCORE_SCHEMA.validate({"category_scores": scores, "strengths": [], "improvements": {},
+                                             "summary": "ok"})
+    assert errors == {}
+    assert cleaned["category_scores"]["content"] == 85
+    assert cleaned["category_scores"]["format"] == 100
+
+
+def test_broken_fields_are_reported_and_emptied():
+    cleaned, errors = GENERATED_RESUME_SCHEMA.validate({"skills": {"technical": 3}, "experience": [{"company": "X"}]})
+    assert errors == {
+        "professional_summary": "missing",
+        "skills.technical": "expected a list",
+        "experience[0].title": "missing",
+    }
+    assert cleaned["professional_summary"] == ""
+    assert Schema.failing_fields(errors) == ["professional_summary", "skills", "experience"]
+
+
+def test_fix_prompt_asks_only_for_failing_fields():
+    data = {"professional_summary": "", "skills": {"technical": 3}}
+    _, errors = GENERATED_RESUME_SCHEMA.validate(data)
+    prompt = GENERATED_RESUME_SCHEMA.fix_prompt("Write a resume.", data, errors)
+    assert prompt.startswith("Write a resume.")
+    assert "- skills.technical: expected a list" in prompt
+    assert '"keywords"' not in prompt
+
+
+def test_non_object_answer_raises():
+    with pytest.raises(ValueError):
+        RESUME_SCHEMA.validate(["not", "an", "object"])
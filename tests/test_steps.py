@@ -0,0 +1,61 @@
+"""Tests for running one flow blocking or awaited"""
+
+import asyncio
+
+import pytest
+
+from utils.steps import arun_steps, call, run_steps
+
+
+class SyncTarget:
+    def double(self, value):
+        return value * 2
+    
+    def fail(self, message):
+        raise ValueError(message)
+
+
+class AsyncTarget:
+    async def double(self, value):
+        await asyncio.sleep(0)
+        return value * 2
+    
+    async def fail(self, message):
+        raise ValueError(message)
+
+
+def flow(value):
+    doubled = yield call('double', value)
+    try:
+        yield call('fail', "boom")
+    except ValueError as e:
+        caught = str(e)
+    return doubled, caught
+
+
+def test_same_flow_runs_on_sync_and_async_targets():
+    assert run_steps(SyncTarget(), flow(2)) == (4, "boom")
+    assert asyncio.run(arun_steps(AsyncTarget(), flow(2))) == (4, "boom")
+
+
+def test_flow_without_calls_returns_its_value():
+    def immediate():
+        return "done"
+        yield
+    
+    assert run_steps(SyncTarget(), immediate()) == "done"
+    assert asyncio.run(arun_steps(AsyncTarget(), immediate())) == "done"
+
+
+def test_uncaught_error_propagates_to_caller():
+    def failing():
+        yield call('fail', "unhandled")
+    
+    with pytest.raises(ValueError, match="unhandled"):
+        run_steps(SyncTarget(), failing())
+    with pytest.raises(ValueError, match="unhandled"):
+        asyncio.run(arun_steps(AsyncTarget(), failing()))
+
+
+def test_async_runner_accepts_plain_methods():
+    assert asyncio.run(arun_steps(SyncTarget(), flow(3))) == (6, "boom")
@@ -0,0 +1,54 @@
+"""Tests for surfacing JSON fields while a completion streams in"""
+
+import json
+
+import pytest
+
+from utils.stream_json import IncrementalJSONParser
+
+ANSWER = {
+    "summary": 'A "quoted" {text}',
+    "skills": ["Python", "Go"],
+    "experience": [{"title": "Dev", "years": [2020, 2021]}, {"title": "Lead"}],
+    "score": 42,
+    "ok": True,
+}
+TEXT = "```json\n" + json.dumps(ANSWER) + "\n```"
+
+
+def feed_in_chunks(text, size):
+    parser = IncrementalJSONParser()
+    events = []
+    for start in range(0, len(text), size):
+        events += parser.feed(text[start:start + size])
+    return parser, events
+
+
+@pytest.mark.parametrize("size", [1, 7, len(TEXT)])
+def test_same_fields_for_any_chunking(size):
+    parser, events = feed_in_chunks(TEXT, size)
+    assert events == [
+        (("summary",), 'A "quoted" {text}'),
+        (("skills", 0), "Python"),
+        (("skills", 1), "Go"),
+        (("skills",), ["Python", "Go"]),
+        (("experience", 0), {"title": "Dev", "years": [2020, 2021]}),
+        (("experience", 1), {"title": "Lead"}),
+        (("experience",), ANSWER["experience"]),
+        (("score",), 42),
+        (("ok",), True),
+    ]
+    assert parser.done
+    assert parser.fields == ANSWER
+
+
+def test_field_is_reported_before_the_stream_ends():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"summary": "Backend engineer", "skills": ["Py') == [(("summary",), "Backend engineer")]
+    assert not parser.done
+
+
+def test_number_is_reported_once_its_delimiter_arrives():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"score": 4') == []
+    assert parser.feed('2}') == [(("score",), 42)]
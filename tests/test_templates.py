@@ -0,0 +1,22 @@
+"""Tests for compiled resume templates"""
+
+from utils.templates import STYLESHEETS, CompiledTemplate, render_fragment, render_page
+
+
+def test_placeholders_are_escaped_unless_raw():
+    template = CompiledTemplate('<p>{{ text }}</p>{{body|raw}}<i>{{missing}}</i>')
+    assert template.fields == ["text", "body", "missing"]
+    assert template.render(text="R&D <team>", body="<b>ok</b>") == "<p>R&amp;D &lt;team&gt;</p><b>ok</b><i></i>"
+
+
+def test_bullets_render_inside_list():
+    items = render_fragment('bullet', text="Cut costs by 20%") + render_fragment('bullet', text="<script>")
+    assert render_fragment('bullets', items=items) == \
+        '<ul class="resume-bullets"><li>Cut costs by 20%</li><li>&lt;script&gt;</li></ul>'
+
+
+def test_page_uses_template_stylesheet_and_falls_back():
+    page = render_page("<p>body</p>", "modern")
+    assert STYLESHEETS["modern"] in page
+    assert page.endswith('<div class="resume-page"><p>body</p></div>')
+    assert STYLESHEETS["professional"] in render_page("", "no-such-template")
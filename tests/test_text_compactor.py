@@ -0,0 +1,68 @@
+"""Tests for compacting resume text before prompting"""
+
+from utils.resume_parser import PAGE_BREAK
+from utils.text_compactor import compact_resume_text, estimate_tokens
+
+
+def test_repeated_job_titles_and_bullets_are_kept():
+    text = """Jane Doe
+EXPERIENCE
+Software Engineer
+Acme Corp, 2020 - 2023
+- Maintained the CI pipeline for all services
+Software Engineer
+Globex, 2017 - 2020
+- Maintained the CI pipeline for all services
+Software Engineer
+Initech, 2015 - 2017
+- Maintained the CI pipeline for all services"""
+    compacted, stats = compact_resume_text(text)
+    assert compacted.count("Software Engineer") == 3
+    assert compacted.count("Maintained the CI pipeline for all services") == 3
+    assert stats["removed_duplicate_lines"] == 0
+
+
+def test_running_header_and_footer_are_removed_at_page_edges():
+    pages = [
+        "Jane Doe - Senior Engineer\nEXPERIENCE\nSoftware Engineer\nAcme Corp\nPage 1 of 2\njane@example.com",
+        "Jane Doe - Senior Engineer\nSoftware Engineer\nGlobex\nEDUCATION\nPage 2 of 2\njane@example.com",
+    ]
+    compacted, stats = compact_resume_text(PAGE_BREAK.join(pages))
+    assert compacted.count("Jane Doe - Senior Engineer") == 1
+    assert compacted.count("jane@example.com") == 1
+    # Same title at the top of page two, but not at an edge on both pages
+    assert compacted.count("Software Engineer") == 2
+    assert "Page 1 of 2" not in compacted
+    assert stats["removed_duplicate_lines"] == 2
+    assert stats["removed_boilerplate_lines"] == 2
+
+
+def test_single_page_never_dedupes():
+    text = "Jane Doe\nSkills\nPython\nPython"
+    compacted, _ = compact_resume_text(text)
+    assert compacted.split("\n").count("Python") == 2
+
+
+def test_whitespace_and_hyphenation_are_normalized():
+    compacted, stats = compact_resume_text("Built  a  data​ pipe-\nline\n\n\n\nfor   reports")
+    assert compacted == "Built a data pipeline\n\nfor reports"
+    assert stats["saved_tokens"] == estimate_tokens("Built  a  data​ pipe-\nline\n\n\n\nfor   reports") - estimate_tokens(compacted)
+
+
+def test_hyphenated_compounds_keep_their_hyphen():
+    compacted, _ = compact_resume_text("A self-\nmotivated full-\nstack dev\nBuilt a data pipe-\nline")
+    assert compacted == "A self-motivated full-stack dev\nBuilt a data pipeline"
+    compacted, _ = compact_resume_text("Led on-\nsite visits\nRan 20 on-site audits")
+    assert compacted.startswith("Led on-site visits")
+
+
+def test_bare_numbers_are_only_dropped_at_page_edges():
+    pages = [
+        "Jane Doe\nSKILLS\nTeam size\n12\nPython\nGo\n- 1 -",
+        "2\nEXPERIENCE\nAcme Corp\nProjects shipped\n7\nGlobex\nLondon",
+    ]
+    compacted, stats = compact_resume_text(PAGE_BREAK.join(pages))
+    lines = compacted.split("\n")
+    assert "12" in lines and "7" in lines
+    assert "- 1 -" not in lines and "2" not in lines
+    assert stats["removed_boilerplate_lines"] == 2
@@ -0,0 +1,64 @@
+"""Tests for per-call max_tokens budgeting"""
+
+import json
+from types import SimpleNamespace
+
+from utils.ai_helper import AIHelper
+from utils.rate_limiter import RateLimiter
+from utils.response_cache import MemoryResponseCache
+from utils.token_budget import TokenBudgeter, expected_edit_tokens, expected_extraction_tokens
+
+
+class CuttingCompletions:
+    """Groq stand-in that cuts the answer off at max_tokens (4 characters a token)"""
+    
+    def __init__(self, answer):
+        self.answer = answer
+        self.max_tokens = []
+    
+    def create(self, **kwargs):
+        self.max_tokens.append(kwargs["max_tokens"])
+        content = self.answer[:kwargs["max_tokens"] * 4]
+        finish_reason = "stop" if content == self.answer else "length"
+        response = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content),
+                                                            finish_reason=finish_reason)], usage=None)
+        return SimpleNamespace(headers={}, parse=lambda: response)
+
+
+def test_budget_starts_from_estimate_with_headroom():
+    budgeter = TokenBudgeter()
+    assert budgeter.budget("score", 800, 1800) == 1000
+    assert budgeter.budget("score", 100, 1800) == 256  # min_tokens
+    assert budgeter.budget("score", 5000, 1800) == 1800  # the route's ceiling
+    assert budgeter.stats["budgeted_calls"] == 3
+
+
+def test_budget_follows_observed_completions():
+    budgeter = TokenBudgeter()
+    for _ in range(10):
+        budgeter.observe("edit", 400, 200)
+    assert budgeter.budget("edit", 400, 2000) == 256
+    assert budgeter.budget("score", 400, 2000) == 500  # other tasks keep their own history
+
+
+def test_next_budget_doubles_up_to_the_ceiling():
+    assert TokenBudgeter.next_budget(600, 2000) == 1200
+    assert TokenBudgeter.next_budget(1200, 2000) == 2000
+    assert TokenBudgeter.next_budget(2000, 2000) is None
+
+
+def test_truncated_completion_grows_budget():
+    answer = '{"notes": "' + "x" * 2000 + '"}'
+    completions = CuttingCompletions(answer)
+    helper = AIHelper("test-key", response_cache=MemoryResponseCache(), rate_limiter=RateLimiter(None, None))
+    helper.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=completions)))
+    
+    assert helper.complete("prompt", task="score", parse=json.loads, expected_tokens=300) == {"notes": "x" * 2000}
+    assert completions.max_tokens == [375, 750]
+    assert helper.budgeter.stats["truncations"] == 1
+
+
+def test_estimators():
+    assert expected_edit_tokens(None) == 600
+    assert expected_edit_tokens(["Python"]) > 120
+    assert expected_extraction_tokens("word " * 400, 3, 10) < expected_extraction_tokens("word " * 400, 10, 10)
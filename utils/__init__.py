@@ -3,9 +3,11 @@ Utils package for ATS Resume Builder
 """
 
 from .ai_helper import AIHelper
-from .resume_parser import ResumeParser
+from .async_ai_helper import AsyncAIHelper
+from .resume_parser import ResumeParser, TextChunk
 from .resume_generator import ResumeGenerator
 from .ats_scorer import ATSScorer
 from .resume_agent import ResumeAgent
+from .parse_cache import ParseCache
 
-__all__ = ['AIHelper', 'ResumeParser', 'ResumeGenerator', 'ATSScorer', 'ResumeAgent']
+__all__ = ['AIHelper', 'AsyncAIHelper', 'ResumeParser', 'TextChunk', 'ResumeGenerator', 'ATSScorer', 'ResumeAgent', 'ParseCache']
@@ -3,62 +3,676 @@ AI Helper Module - IMPROVED VERSION
 Groq API Integration with accurate, dynamic ATS scoring
 """
 
-from groq import Groq
-from typing import Dict, List, Optional
+from groq import Groq, APIConnectionError, APIStatusError
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import json
+import os
 import re
+import time
 from datetime import datetime
 
-class AIHelper:
-    def __init__(self, api_key: str):
-        """Initialize Groq client with API key"""
-        self.client = Groq(api_key=api_key)
-        self.model = "llama-3.1-8b-instant"
-    
-    def extract_resume_info(self, resume_text: str, target_role: str) -> Dict:
-        """Extract structured information from resume text with improved parsing"""
-        prompt = f"""
-You are an expert resume parser. Extract the following information from the resume text and return it as a JSON object.
+from .local_extractor import LocalResumeExtractor
+from .text_compactor import compact_resume_text, estimate_tokens
+from .response_cache import ResponseCache, create_response_cache_from_env
+from .stream_json import RESTART_PATH, IncrementalJSONParser, FieldEvent
+from .json_repair import TRUNCATED, JSONRepairStats, TruncatedJSONError, loads_tolerant
+from .schemas import Schema, RESUME_SCHEMA, GENERATED_RESUME_SCHEMA, SCORE_SCHEMA
+from .rate_limiter import RateLimiter, SingleFlight, get_shared_rate_limiter, retry_delay
+from .model_router import ModelRouter, Route, create_model_router_from_env
+from .steps import Flow, call, run_steps
+from .token_budget import (
+    TokenBudgeter, SCORE_EXPECTED_TOKENS, expected_extraction_tokens, expected_generation_tokens
+)
 
-Resume Text:
-{resume_text}
-
-Target Role: {target_role}
-
-Extract and return ONLY a valid JSON object with these fields:
-{{
-    "name": "Full name",
-    "email": "Email address",
-    "phone": "Phone number",
-    "target_role": "{target_role}",
-    "professional_summary": "Professional summary or objective (2-4 sentences)",
-    "skills": ["skill1", "skill2", "skill3", ...],
-    "education": [
-        {{
+# JSON shape of each field requested by extract_resume_info
+EXTRACTION_FIELDS = {
+    "name": '"Full name"',
+    "email": '"Email address"',
+    "phone": '"Phone number"',
+    "target_role": None,  # filled with the requested role
+    "professional_summary": '"Professional summary or objective (2-4 sentences)"',
+    "skills": '["skill1", "skill2", "skill3", ...]',
+    "education": """[
+        {
             "degree": "Degree name",
             "institution": "University/College name",
             "year": "Graduation year",
             "gpa": "GPA if mentioned"
-        }}
-    ],
-    "experience": [
-        {{
+        }
+    ]""",
+    "experience": """[
+        {
             "title": "Job title",
             "company": "Company name",
             "duration": "Duration (e.g., Jan 2020 - Dec 2022)",
             "responsibilities": ["responsibility1", "responsibility2", ...]
-        }}
-    ],
-    "projects": [
-        {{
+        }
+    ]""",
+    "projects": """[
+        {
             "name": "Project name",
             "description": "Brief description",
             "technologies": ["tech1", "tech2", ...],
             "achievements": ["achievement1", "achievement2", ...]
-        }}
-    ],
-    "certifications": ["cert1", "cert2", ...],
-    "languages": ["language1", "language2", ...]
+        }
+    ]""",
+    "certifications": '["cert1", "cert2", ...]',
+    "languages": '["language1", "language2", ...]'
+}
+
+class AIHelper:
+    def __init__(self, api_key: str, response_cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None, router: Optional[ModelRouter] = None):
+        """
+        Initialize Groq client with API key
+        
+        Args:
+            api_key: Groq API key
+            response_cache: Cache for identical LLM requests. Defaults to the
+                backend chosen by LLM_CACHE_BACKEND (in-memory LRU if unset).
+            rate_limiter: Request/token budget. Defaults to the process-wide
+                limiter, since Groq limits apply per API key.
+            router: Per-task model/temperature/max_tokens routing. Defaults
+                to create_model_router_from_env() (LLM_ROUTES).
+        """
+        # Retries are done in _request_flow so they can follow our rate limiter
+        self.client = Groq(api_key=api_key, max_retries=0)
+        self.router = router or create_model_router_from_env()
+        self.model = self.router.default_model
+        self.response_cache = response_cache if response_cache is not None else create_response_cache_from_env()
+        
+        # Rate limiting: budget, retries (LLM_MAX_RETRIES) and request coalescing
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.max_retries = int(os.getenv('LLM_MAX_RETRIES', '4'))
+        self.single_flight = SingleFlight()
+        
+        # Per-call max_tokens from expected output size and history
+        self.budgeter = TokenBudgeter()
+        
+        # Which defects completions needed fixed before they parsed
+        self.json_repairs = JSONRepairStats()
+        self.schema_stats = {"validated": 0, "follow_ups": 0, "fixed": 0, "unfixed": 0}
+        
+        # Local extraction confidence needed to skip the full LLM pass
+        self.local_extraction_threshold = 0.85
+        self.extraction_stats = {"local": 0, "partial": 0, "llm": 0}
+        self.compaction_stats = {"calls": 0, "original_tokens": 0, "saved_tokens": 0}
+    
+    def complete(self, prompt: str, temperature: Optional[float] = None, max_tokens: Optional[int] = None,
+                 parse: Optional[Callable[[str], Any]] = None, task: Optional[str] = None,
+                 expected_tokens: Optional[int] = None) -> Any:
+        """
+        Run a single-prompt chat completion through the response cache
+        
+        Args:
+            prompt: User message content
+            temperature: Sampling temperature (default: the task's route)
+            max_tokens: Completion token limit (default: the task's route)
+            parse: Optional parser applied to the completion text. Only
+                responses that parse successfully and were not cut off are
+                cached, so a malformed or partial answer is never replayed.
+            task: Route in self.router (extract, generate, score, edit,
+                suggest) that picks the model. If parse fails and the route
+                has escalate_to, the request is retried once on that model.
+            expected_tokens: Rough size of the answer (see token_budget). The
+                request then asks for a budget learned from past calls instead
+                of the full max_tokens, and grows it only if the answer is cut off.
+        
+        Returns:
+            parse(content) if parse is given, else the stripped completion text
+        
+        Raises:
+            TruncatedJSONError: If parse is given and the answer was cut off
+                even at the route's max_tokens; its value is the parsed part
+        """
+        return run_steps(self, self._complete_flow(prompt, temperature, max_tokens, parse, task, expected_tokens))
+    
+    def _complete_flow(self, prompt: str, temperature: Optional[float] = None, max_tokens: Optional[int] = None,
+                       parse: Optional[Callable[[str], Any]] = None, task: Optional[str] = None,
+                       expected_tokens: Optional[int] = None) -> Flow:
+        route = self._resolve_route(task, temperature, max_tokens)
+        try:
+            return (yield from self._complete_on_flow(prompt, route, parse, task, expected_tokens))
+        except ValueError as e:
+            escalated = self._escalation(route, parse, task, e)
+            if escalated is None:
+                raise
+            return (yield from self._complete_on_flow(prompt, escalated, parse, task, expected_tokens))
+    
+    def _resolve_route(self, task: Optional[str], temperature: Optional[float], max_tokens: Optional[int]) -> Route:
+        route = self.router.route(task)
+        if temperature is not None:
+            route = route._replace(temperature=temperature)
+        if max_tokens is not None:
+            route = route._replace(max_tokens=max_tokens)
+        return route
+    
+    def _escalation(self, route: Route, parse: Optional[Callable], task: Optional[str], error: Exception) -> Optional[Route]:
+        """Route to retry on after an unparseable answer, or None"""
+        # A cut-off answer would be cut off on the larger model too: same max_tokens
+        if parse is None or isinstance(error, TruncatedJSONError) or not route.escalate_to or route.escalate_to == route.model:
+            return None
+        self.router.record_escalation(task)
+        print(f"Unparseable {task or 'default'} response from {route.model} ({error}); retrying on {route.escalate_to}")
+        return route._replace(model=route.escalate_to, escalate_to=None)
+    
+    def _complete_on_flow(self, prompt: str, route: Route, parse: Optional[Callable[[str], Any]], task: Optional[str],
+                          expected_tokens: Optional[int] = None) -> Flow:
+        # The cache key uses the route's max_tokens, not the per-call budget,
+        # so a changing budget does not split identical requests
+        cache_key, content = self._cache_lookup(prompt, route)
+        truncated = False
+        
+        from_cache = content is not None
+        if not from_cache:
+            # Identical requests already in flight share that call's answer
+            flight_key = cache_key or self._cache_key(prompt, route)
+            content, truncated = yield call('_coalesced', flight_key, prompt, route, task, expected_tokens)
+        
+        return self._finish_completion(cache_key, content, from_cache, parse, truncated)
+    
+    def _fetch_flow(self, prompt: str, route: Route, task: Optional[str], expected_tokens: Optional[int] = None) -> Flow:
+        """
+        Call the API with a budgeted max_tokens, growing it only when the answer is cut off
+        
+        Returns:
+            (completion text, whether it was cut off even at the route's max_tokens)
+        """
+        budget = self._initial_budget(route, task, expected_tokens)
+        while True:
+            started = time.monotonic()
+            try:
+                response = yield from self._request_flow(prompt, route._replace(max_tokens=budget))
+            except Exception as e:
+                failed = self._failed_generation(e)
+                if failed is None:
+                    raise
+                return failed, False
+            usage = getattr(response, 'usage', None)
+            completion_tokens = getattr(usage, 'completion_tokens', None)
+            self.router.record(task, route.model, time.monotonic() - started,
+                               getattr(usage, 'prompt_tokens', None), completion_tokens)
+            choice = response.choices[0]
+            if choice.finish_reason != "length":
+                if expected_tokens:
+                    self.budgeter.observe(task, expected_tokens, completion_tokens)
+                break
+            budget = self._grow_budget(task, budget, route)
+            if budget is None:
+                break
+        return choice.message.content.strip(), choice.finish_reason == "length"
+    
+    def _initial_budget(self, route: Route, task: Optional[str], expected_tokens: Optional[int]) -> int:
+        if not expected_tokens:
+            return route.max_tokens
+        return self.budgeter.budget(task, expected_tokens, route.max_tokens)
+    
+    def _grow_budget(self, task: Optional[str], budget: int, route: Route) -> Optional[int]:
+        """Larger budget after a truncated answer, or None when already at the route's limit"""
+        grown = TokenBudgeter.next_budget(budget, route.max_tokens)
+        if grown is not None:
+            self.budgeter.record_truncation()
+            print(f"{task or 'default'} response truncated at {budget} tokens; retrying with {grown}")
+        return grown
+    
+    def _request_kwargs(self, prompt: str, route: Route, stream: bool = False) -> Dict:
+        kwargs = {
+            "model": route.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": route.temperature,
+            "max_tokens": route.max_tokens
+        }
+        if stream:
+            # JSON mode is not available for streamed completions
+            kwargs["stream"] = True
+        elif route.json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        return kwargs
+    
+    def _request_flow(self, prompt: str, route: Route, stream: bool = False) -> Flow:
+        """
+        Send one chat completion within the rate limit, retrying transient errors
+        
+        429s, 5xx responses and connection errors are retried up to
+        max_retries times, waiting as long as the rate-limit headers ask
+        (or with jittered exponential backoff when they do not say). A failed
+        attempt gives its token reservation back, so only the attempt that
+        answers stays booked.
+        """
+        kwargs = self._request_kwargs(prompt, route, stream)
+        reserved = self._reservation(prompt, route)
+        
+        for attempt in range(self.max_retries + 1):
+            yield call('_acquire', reserved)
+            try:
+                headers, response = yield call('_send', kwargs)
+            except Exception as e:
+                # Refund before the headers, so a 429's remaining count still caps the bucket
+                self.rate_limiter.settle(reserved, 0)
+                headers = self._error_headers(e)
+                self.rate_limiter.update_from_headers(headers)
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                delay = retry_delay(attempt, headers)
+                self.rate_limiter.record_retry()
+                print(f"Groq request failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+                yield call('_sleep', delay)
+                continue
+            
+            self.rate_limiter.update_from_headers(headers)
+            if not stream:
+                # Streams are settled by _fetch_streaming_flow once they are read
+                self.rate_limiter.settle(reserved, self._used_tokens(response))
+            return response
+    
+    @staticmethod
+    def _reservation(prompt: str, route: Route) -> int:
+        """Tokens reserved from the rate limiter for one request"""
+        return estimate_tokens(prompt) + route.max_tokens
+    
+    # Transport: the calls flows yield. AsyncAIHelper implements the same
+    # methods with awaitables and runs this helper's flows against them.
+    
+    def _fetch(self, prompt: str, route: Route, task: Optional[str],
+               expected_tokens: Optional[int] = None) -> Tuple[str, bool]:
+        return run_steps(self, self._fetch_flow(prompt, route, task, expected_tokens))
+    
+    def _fetch_streaming(self, prompt: str, route: Route, task: Optional[str], expected_tokens: Optional[int],
+                         on_field: Optional[Callable[[tuple, Any], None]]) -> Tuple[str, bool]:
+        return run_steps(self, self._fetch_streaming_flow(prompt, route, task, expected_tokens, on_field))
+    
+    def _coalesced(self, key: str, prompt: str, route: Route, task: Optional[str],
+                   expected_tokens: Optional[int] = None) -> Tuple[str, bool]:
+        return self.single_flight.do(key, lambda: self._fetch(prompt, route, task, expected_tokens))
+    
+    def _acquire(self, tokens: int):
+        self.rate_limiter.acquire(tokens)
+    
+    def _send(self, kwargs: Dict):
+        """Make the API call; returns (response headers, parsed response or stream)"""
+        raw = self.client.chat.completions.with_raw_response.create(**kwargs)
+        return raw.headers, raw.parse()
+    
+    def _read_stream(self, stream, on_text: Callable[[str], None]) -> Tuple[Optional[str], Any]:
+        """Feed each streamed text delta to on_text; returns (finish_reason, usage or None)"""
+        finish_reason = None
+        usage = None
+        for chunk in stream:
+            usage = self._chunk_usage(chunk) or usage
+            if not chunk.choices:
+                continue
+            if chunk.choices[0].delta.content:
+                on_text(chunk.choices[0].delta.content)
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+        return finish_reason, usage
+    
+    def _sleep(self, seconds: float):
+        time.sleep(seconds)
+    
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, APIStatusError):
+            return error.status_code in (408, 409, 429) or error.status_code >= 500
+        return isinstance(error, APIConnectionError)
+    
+    @staticmethod
+    def _failed_generation(error: Exception) -> Optional[str]:
+        """
+        Output rejected by JSON mode (400 json_validate_failed)
+        
+        Groq returns the rejected text in the error body. It is usually valid
+        apart from a small defect that parse_json can repair, which is cheaper
+        than asking again.
+        """
+        if not isinstance(error, APIStatusError) or error.status_code != 400:
+            return None
+        body = getattr(error, 'body', None)
+        if isinstance(body, dict) and isinstance(body.get('error'), dict):
+            body = body['error']
+        if not isinstance(body, dict) or body.get('code') != 'json_validate_failed':
+            return None
+        failed = body.get('failed_generation')
+        return failed.strip() if isinstance(failed, str) and failed.strip() else None
+    
+    @staticmethod
+    def _error_headers(error: Exception):
+        response = getattr(error, 'response', None)
+        return getattr(response, 'headers', None)
+    
+    @staticmethod
+    def _used_tokens(response) -> Optional[int]:
+        usage = getattr(response, 'usage', None)
+        return getattr(usage, 'total_tokens', None)
+    
+    @staticmethod
+    def _chunk_usage(chunk):
+        """Usage sent with the last streamed chunk (Groq puts it under x_groq)"""
+        return getattr(getattr(chunk, 'x_groq', None), 'usage', None) or getattr(chunk, 'usage', None)
+    
+    def stream_complete(self, prompt: str, temperature: Optional[float] = None, max_tokens: Optional[int] = None,
+                        on_field: Optional[Callable[[tuple, Any], None]] = None,
+                        parse: Optional[Callable[[str], Any]] = None, task: Optional[str] = None,
+                        expected_tokens: Optional[int] = None) -> Any:
+        """
+        complete() over the streaming API, reporting JSON fields as they close
+        
+        Args:
+            on_field: Called with (path, value) for every top-level field and
+                top-level array element as soon as it is complete (see
+                IncrementalJSONParser). Cached responses are replayed through
+                the same callback. A truncated stream is retried with a larger
+                budget: on_field first gets (RESTART_PATH, None), so it can
+                clear what it showed, and then the fields of the new attempt.
+            expected_tokens: See complete()
+        
+        Returns:
+            Same as complete(). An escalated retry is not streamed.
+        """
+        return run_steps(self, self._stream_complete_flow(prompt, temperature, max_tokens, on_field, parse, task,
+                                                          expected_tokens))
+    
+    def _stream_complete_flow(self, prompt: str, temperature: Optional[float] = None, max_tokens: Optional[int] = None,
+                              on_field: Optional[Callable[[tuple, Any], None]] = None,
+                              parse: Optional[Callable[[str], Any]] = None, task: Optional[str] = None,
+                              expected_tokens: Optional[int] = None) -> Flow:
+        route = self._resolve_route(task, temperature, max_tokens)
+        cache_key, content = self._cache_lookup(prompt, route)
+        on_field = self._once_per_field(on_field)
+        truncated = False
+        
+        from_cache = content is not None
+        if from_cache:
+            self._report_fields(IncrementalJSONParser().feed(content), on_field)
+        else:
+            content, truncated = yield call('_fetch_streaming', prompt, route, task, expected_tokens, on_field)
+        
+        try:
+            return self._finish_completion(cache_key, content, from_cache, parse, truncated)
+        except ValueError as e:
+            escalated = self._escalation(route, parse, task, e)
+            if escalated is None:
+                raise
+            return (yield from self._complete_on_flow(prompt, escalated, parse, task, expected_tokens))
+    
+    def _fetch_streaming_flow(self, prompt: str, route: Route, task: Optional[str], expected_tokens: Optional[int],
+                              on_field: Optional[Callable[[tuple, Any], None]]) -> Flow:
+        """_fetch_flow over the streaming API, reporting fields to on_field as they arrive"""
+        budget = self._initial_budget(route, task, expected_tokens)
+        retry = False
+        while True:
+            if retry:
+                self._report_fields([(RESTART_PATH, None)], on_field)
+            retry = True
+            parser = IncrementalJSONParser()
+            started = time.monotonic()
+            budgeted = route._replace(max_tokens=budget)
+            stream = yield from self._request_flow(prompt, budgeted, stream=True)
+            finish_reason, usage = yield call('_read_stream', stream,
+                                              lambda text: self._report_fields(parser.feed(text), on_field))
+            content = parser.buffer.strip()
+            # Estimate the usage when the stream did not report it
+            prompt_tokens = getattr(usage, 'prompt_tokens', None) or estimate_tokens(prompt)
+            completion_tokens = getattr(usage, 'completion_tokens', None) or estimate_tokens(content)
+            self.rate_limiter.settle(self._reservation(prompt, budgeted), prompt_tokens + completion_tokens)
+            self.router.record(task, route.model, time.monotonic() - started, prompt_tokens, completion_tokens)
+            if finish_reason != "length":
+                if expected_tokens:
+                    self.budgeter.observe(task, expected_tokens, completion_tokens)
+                return content, False
+            budget = self._grow_budget(task, budget, route)
+            if budget is None:
+                return content, True
+    
+    @staticmethod
+    def _once_per_field(on_field: Optional[Callable[[tuple, Any], None]]) -> Optional[Callable[[tuple, Any], None]]:
+        """Wrap on_field so each field is reported once per stream attempt"""
+        if on_field is None:
+            return None
+        reported = set()
+        
+        def report(path: tuple, value: Any):
+            if path == RESTART_PATH:
+                reported.clear()
+                on_field(path, value)
+            elif path not in reported:
+                reported.add(path)
+                on_field(path, value)
+        
+        return report
+    
+    @staticmethod
+    def _report_fields(events: List[FieldEvent], on_field: Optional[Callable[[tuple, Any], None]]):
+        if on_field is None:
+            return
+        for path, value in events:
+            try:
+                on_field(path, value)
+            except Exception as e:
+                # A broken UI callback must not abort the completion
+                print(f"Error in streaming callback: {e}")
+    
+    def _cache_key(self, prompt: str, route: Route) -> str:
+        return ResponseCache.make_key(route.model, prompt, route.temperature, route.max_tokens, route.json_mode)
+    
+    def _cache_lookup(self, prompt: str, route: Route):
+        """Return (cache_key, cached content or None); key is None without a cache"""
+        if self.response_cache is None:
+            return None, None
+        cache_key = self._cache_key(prompt, route)
+        return cache_key, self.response_cache.get(cache_key)
+    
+    def _finish_completion(self, cache_key: Optional[str], content: str, from_cache: bool,
+                           parse: Optional[Callable[[str], Any]], truncated: bool = False) -> Any:
+        """Parse a completion and cache it once it parsed cleanly and was complete"""
+        result = parse(content) if parse else content
+        
+        if truncated:
+            # A partial answer is never cached; parsed callers get it as an error
+            if parse:
+                raise TruncatedJSONError(result)
+            return result
+        if cache_key is not None and not from_cache:
+            self.response_cache.set(cache_key, content)
+        return result
+    
+    def parse_json(self, content: str, brackets: str = '{[') -> Any:
+        """
+        Parse the JSON payload of a completion, repairing common defects
+        
+        Args:
+            content: Completion text
+            brackets: Containers the payload may start with ('[' for a list)
+        
+        Returns:
+            Parsed value. The repairs it needed are tallied in json_repairs.
+        
+        Raises:
+            json.JSONDecodeError: If the payload cannot be repaired
+            TruncatedJSONError: If the payload was cut off; its value is the
+                repaired part
+        """
+        try:
+            result, repairs = loads_tolerant(content, brackets)
+        except json.JSONDecodeError:
+            self.json_repairs.record_failure()
+            raise
+        self.json_repairs.record(repairs)
+        if TRUNCATED in repairs:
+            raise TruncatedJSONError(result)
+        return result
+    
+    def conform(self, data: Any, schema: Schema, prompt: str, task: Optional[str] = None) -> Dict:
+        """
+        Validate a parsed answer and ask again for only the fields that failed
+        
+        Args:
+            data: Parsed completion
+            schema: Expected shape (see schemas)
+            prompt: Prompt that produced data; repeated in the follow-up
+            task: Route for the follow-up request
+        
+        Returns:
+            The cleaned answer. Fields still invalid after the follow-up are
+            left empty.
+        
+        Raises:
+            ValueError: If data is not a JSON object
+        """
+        return run_steps(self, self._conform_flow(data, schema, prompt, task))
+    
+    def _conform_flow(self, data: Any, schema: Schema, prompt: str, task: Optional[str] = None,
+                      truncated: bool = False) -> Flow:
+        cleaned, errors = schema.validate(data)
+        self.schema_stats["validated"] += 1
+        if truncated:
+            errors.update(self._unfinished_fields(schema, data))
+        if not errors:
+            return cleaned
+        
+        fix_prompt, expected_tokens = self._fix_request(schema, data, errors, prompt)
+        try:
+            fixes = yield from self._complete_flow(fix_prompt, task=task, parse=self.parse_json,
+                                                   expected_tokens=expected_tokens)
+        except Exception as e:
+            print(f"Error fixing {schema.name} fields: {e}")
+            fixes = None
+        return self._merge_fixes(schema, data, cleaned, errors, fixes)
+    
+    def _structured_flow(self, prompt: str, schema: Schema, task: str, expected_tokens: int,
+                         on_field: Optional[Callable[[tuple, Any], None]] = None) -> Flow:
+        """
+        JSON completion conformed to schema
+        
+        An answer cut off at the route's max_tokens is not thrown away: the
+        fields it did not finish are asked for again like invalid ones.
+        """
+        try:
+            if on_field:
+                data = yield from self._stream_complete_flow(prompt, task=task, on_field=on_field,
+                                                             parse=self.parse_json, expected_tokens=expected_tokens)
+            else:
+                data = yield from self._complete_flow(prompt, task=task, parse=self.parse_json,
+                                                      expected_tokens=expected_tokens)
+        except TruncatedJSONError as e:
+            print(f"{schema.name} answer was cut off; asking again for the unfinished fields")
+            return (yield from self._conform_flow(e.value, schema, prompt, task, truncated=True))
+        return (yield from self._conform_flow(data, schema, prompt, task))
+    
+    @staticmethod
+    def _unfinished_fields(schema: Schema, data: Dict) -> Dict[str, str]:
+        """Problems for the fields a cut-off answer did not finish: the last one it started and all it left out"""
+        unfinished = {key: "missing, the answer was cut off" for key in schema.fields if key not in data}
+        last = next(reversed(data), None)
+        if last in schema.fields:
+            unfinished[last] = "incomplete, the answer was cut off"
+        return unfinished
+    
+    def _fix_request(self, schema: Schema, data: Dict, errors: Dict[str, str], prompt: str) -> Tuple[str, int]:
+        """Follow-up prompt for the failing fields and the expected size of its answer"""
+        fields = schema.failing_fields(errors)
+        self.schema_stats["follow_ups"] += 1
+        print(f"{schema.name} answer failed validation in {', '.join(fields)}; asking for those fields only")
+        previous = json.dumps({field: data.get(field) for field in fields})
+        return schema.fix_prompt(prompt, data, errors), int(estimate_tokens(previous) * 1.3) + 100
+    
+    def _merge_fixes(self, schema: Schema, data: Dict, cleaned: Dict, errors: Dict[str, str], fixes: Any) -> Dict:
+        """Put the corrected fields into the answer and validate it again"""
+        if not isinstance(fixes, dict):
+            self.schema_stats["unfixed"] += 1
+            return cleaned
+        merged = dict(data)
+        merged.update({field: fixes[field] for field in schema.failing_fields(errors) if field in fixes})
+        repaired, remaining = schema.validate(merged)
+        self.schema_stats["unfixed" if remaining else "fixed"] += 1
+        return repaired
+    
+    def extract_resume_info(self, resume_text: str, target_role: str, raise_errors: bool = False) -> Dict:
+        """
+        Extract structured information from resume text with improved parsing
+        
+        Resumes with clean section headings are handled locally by
+        LocalResumeExtractor. Only when its confidence is too low do we call
+        the LLM, and then only for the fields it could not fill reliably.
+        The text is compacted first (see compact_resume_text) to cut prompt tokens.
+        
+        Args:
+            resume_text: Plain resume text
+            target_role: Target role to record in the result
+            raise_errors: Raise when the LLM call fails instead of returning
+                the empty resume from _create_minimal_resume
+        
+        Returns:
+            Resume dict, or _create_minimal_resume() if the LLM call fails
+        """
+        return run_steps(self, self._extraction_flow(resume_text, target_role, raise_errors))
+    
+    def _extraction_flow(self, resume_text: str, target_role: str, raise_errors: bool = False) -> Flow:
+        local_data, fields, prompt = self._extraction_request(resume_text, target_role)
+        if prompt is None:
+            return local_data
+        
+        try:
+            # The extract route uses a low temperature for accurate extraction
+            parsed_data = yield from self._structured_flow(
+                prompt, RESUME_SCHEMA.subset(fields), "extract",
+                expected_extraction_tokens(resume_text, len(fields), len(EXTRACTION_FIELDS))
+            )
+            return self._finish_extraction(local_data, fields, parsed_data, target_role)
+        
+        except json.JSONDecodeError as je:
+            print(f"JSON parse error in extraction: {je}")
+            print(f"Problematic JSON: {je.doc[:500]}...")
+            if raise_errors:
+                raise
+            return self._create_minimal_resume(target_role)
+        except Exception as e:
+            print(f"Error extracting resume info: {e}")
+            if raise_errors:
+                raise
+            return self._create_minimal_resume(target_role)
+    
+    def _extraction_request(self, resume_text: str, target_role: str):
+        """
+        Compact the text, run local extraction and build the LLM prompt
+        
+        Returns:
+            (local_data, fields to request, prompt). prompt is None when the
+            local result is confident enough to return as is.
+        """
+        resume_text, compaction = compact_resume_text(resume_text)
+        self.compaction_stats["calls"] += 1
+        self.compaction_stats["original_tokens"] += compaction["original_tokens"]
+        self.compaction_stats["saved_tokens"] += compaction["saved_tokens"]
+        print(f"Compacted resume text: saved ~{compaction['saved_tokens']} tokens ({compaction['saved_percent']}%)")
+        
+        local = LocalResumeExtractor.extract(resume_text, target_role)
+        local_data = self._validate_resume_data(local["data"], target_role)
+        
+        if local["confidence"] >= self.local_extraction_threshold:
+            if not local["low_confidence_fields"]:
+                self.extraction_stats["local"] += 1
+                print(f"Extracted resume info locally (confidence {local['confidence']})")
+                return local_data, [], None
+            fields = local["low_confidence_fields"]
+        else:
+            fields = list(EXTRACTION_FIELDS.keys())
+        
+        schema = ",\n".join(
+            f'    "{field}": {json.dumps(target_role) if field == "target_role" else EXTRACTION_FIELDS[field]}'
+            for field in fields
+        )
+        
+        prompt = f"""
+You are an expert resume parser. Extract the following information from the resume text and return it as a JSON object.
+
+Resume Text:
+{resume_text}
+
+Target Role: {target_role}
+
+Extract and return ONLY a valid JSON object with these fields:
+{{
+{schema}
 }}
 
 IMPORTANT:
@@ -70,54 +684,32 @@ IMPORTANT:
 
 Return ONLY the JSON object, no additional text.
 """
+        return local_data, fields, prompt
+    
+    def _finish_extraction(self, local_data: Dict, fields: List[str], parsed_data: Dict, target_role: str) -> Dict:
+        """Merge LLM output for the requested fields into the local result"""
+        # Keep confident local values, let the LLM fill everything else
+        merged = dict(local_data)
+        for field in fields:
+            if parsed_data.get(field):
+                merged[field] = parsed_data[field]
         
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.2,  # Lower temperature for more accurate extraction
-                max_tokens=2500
-            )
-            
-            result = response.choices[0].message.content.strip()
-            result = self._extract_json(result)
-            
-            # Clean up JSON before parsing
-            result = result.replace('\n', ' ').replace('\r', '')
-            result = re.sub(r',\s*}', '}', result)  # Remove trailing commas
-            result = re.sub(r',\s*]', ']', result)
-            
-            parsed_data = json.loads(result.strip())
-            
-            # Validate and clean the extracted data
-            parsed_data = self._validate_resume_data(parsed_data, target_role)
-            
-            print(f"Successfully extracted resume info")
-            return parsed_data
-            
-        except json.JSONDecodeError as je:
-            print(f"JSON parse error in extraction: {je}")
-            print(f"Problematic JSON: {result[:500]}...")
-            return self._create_minimal_resume(target_role)
-        except Exception as e:
-            print(f"Error extracting resume info: {e}")
-            return self._create_minimal_resume(target_role)
+        # Validate and clean the extracted data
+        parsed_data = self._validate_resume_data(merged, target_role)
+        
+        self.extraction_stats["partial" if len(fields) < len(EXTRACTION_FIELDS) else "llm"] += 1
+        print(f"Successfully extracted resume info")
+        return parsed_data
     
     def _validate_resume_data(self, data: Dict, target_role: str) -> Dict:
         """Validate and ensure all required fields exist"""
-        validated = {
-            "name": data.get("name", ""),
-            "email": data.get("email", ""),
-            "phone": data.get("phone", ""),
-            "target_role": data.get("target_role", target_role),
-            "professional_summary": data.get("professional_summary", data.get("summary", "")),
-            "skills": data.get("skills", []),
-            "experience": data.get("experience", []),
-            "education": data.get("education", []),
-            "projects": data.get("projects", []),
-            "certifications": data.get("certifications", []),
-            "languages": data.get("languages", [])
-        }
+        data = dict(data)
+        data.setdefault("target_role", target_role)
+        data.setdefault("professional_summary", data.get("summary", ""))
+        cleaned, _ = RESUME_SCHEMA.validate(data)
+        
+        validated = self._create_minimal_resume(target_role)
+        validated.update({key: cleaned[key] for key in validated if key in cleaned})
         return validated
     
     def _create_minimal_resume(self, target_role: str) -> Dict:
@@ -136,8 +728,31 @@ Return ONLY the JSON object, no additional text.
             "languages": []
         }
     
-    def generate_resume_content(self, user_data: Dict, job_description: Optional[str] = None) -> Dict:
-        """Generate optimized resume content based on user data and job description"""
+    def generate_resume_content(self, user_data: Dict, job_description: Optional[str] = None,
+                                on_field: Optional[Callable[[tuple, Any], None]] = None) -> Dict:
+        """
+        Generate optimized resume content based on user data and job description
+        
+        Pass on_field to stream the completion: it receives each field (and
+        each experience/project entry) as soon as it is generated.
+        """
+        return run_steps(self, self._generation_flow(user_data, job_description, on_field))
+    
+    def _generation_flow(self, user_data: Dict, job_description: Optional[str] = None,
+                         on_field: Optional[Callable[[tuple, Any], None]] = None) -> Flow:
+        prompt = self._generation_prompt(user_data, job_description)
+        
+        try:
+            parsed_data = yield from self._structured_flow(prompt, GENERATED_RESUME_SCHEMA, "generate",
+                                                           expected_generation_tokens(user_data), on_field)
+            print(f"Successfully generated resume content")
+            return parsed_data
+        
+        except Exception as e:
+            print(f"Error generating resume content: {e}")
+            return {}
+    
+    def _generation_prompt(self, user_data: Dict, job_description: Optional[str] = None) -> str:
         jd_context = f"\n\nJob Description:\n{job_description}" if job_description else ""
         
         prompt = f"""
@@ -199,33 +814,41 @@ Guidelines:
 
 Return ONLY the JSON object, no additional text.
 """
-        
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.5,
-                max_tokens=2500
-            )
-            
-            result = response.choices[0].message.content.strip()
-            result = self._extract_json(result)
-            parsed_data = json.loads(result.strip())
-            print(f"Successfully generated resume content")
-            return parsed_data
-            
-        except Exception as e:
-            print(f"Error generating resume content: {e}")
-            return {}
+        return prompt
     
     def calculate_ats_score(self, resume_data: Dict, job_description: Optional[str] = None) -> Dict:
         """
         Calculate ACCURATE, DYNAMIC ATS score based on actual resume content
         Uses hybrid approach: AI analysis + rule-based scoring
         """
+        return run_steps(self, self._score_flow(resume_data, job_description))
+    
+    def _score_flow(self, resume_data: Dict, job_description: Optional[str] = None) -> Flow:
         # First, calculate base score using rules
         base_score = self._calculate_base_score(resume_data, job_description)
+        prompt = self._score_prompt(resume_data, job_description, base_score)
+        
+        try:
+            parsed_data = yield from self._structured_flow(prompt, SCORE_SCHEMA, "score", SCORE_EXPECTED_TOKENS)
+            return self._finish_score(parsed_data, base_score)
+        
+        except Exception as e:
+            print(f"Error calculating ATS score: {e}")
+            return self._fallback_score(base_score, job_description)
+    
+    def quick_ats_score(self, resume_data: Dict, job_description: Optional[str] = None) -> Dict:
+        """
+        Rule-based ATS score without the LLM call
         
+        Same shape as calculate_ats_score, with empty feedback, so it can be
+        shown while the detailed analysis is still running.
+        """
+        base_score = self._calculate_base_score(resume_data, job_description)
+        score_data = self._fallback_score(base_score, job_description)
+        score_data["summary"] = f"Resume scored {base_score}/100. Detailed AI feedback is loading..."
+        return score_data
+    
+    def _score_prompt(self, resume_data: Dict, job_description: Optional[str], base_score: int) -> str:
         # Then get AI analysis for detailed feedback
         jd_context = f"\n\nJob Description:\n{job_description}" if job_description else ""
         
@@ -278,51 +901,40 @@ Be specific and actionable in improvements. Severity: "error" (critical), "warni
 
 Return ONLY the JSON object.
 """
+        return prompt
+    
+    def _finish_score(self, parsed_data: Dict, base_score: int) -> Dict:
+        # Use the calculated base score, not AI's guess
+        parsed_data['overall_score'] = base_score
+        parsed_data['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                max_tokens=1800
-            )
-            
-            result = response.choices[0].message.content.strip()
-            result = self._extract_json(result)
-            parsed_data = json.loads(result.strip())
-            
-            # Use the calculated base score, not AI's guess
-            parsed_data['overall_score'] = base_score
-            parsed_data['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            print(f"Successfully calculated ATS score: {base_score}")
-            return parsed_data
-            
-        except Exception as e:
-            print(f"Error calculating ATS score: {e}")
-            # Return base score with minimal feedback on error
-            return {
-                "overall_score": base_score,
-                "category_scores": {
-                    "content": base_score,
-                    "format": base_score,
-                    "optimization": base_score // 2 if not job_description else base_score,
-                    "best_practices": base_score,
-                    "application_ready": base_score
-                },
-                "breakdown": {},
-                "strengths": ["Resume structure is present"],
-                "improvements": {
-                    "content": [],
-                    "format": [],
-                    "optimization": [],
-                    "best_practices": [],
-                    "application_ready": []
-                },
-                "missing_keywords": [],
-                "summary": f"Resume scored {base_score}/100. Further analysis unavailable.",
-                "last_updated": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
+        print(f"Successfully calculated ATS score: {base_score}")
+        return parsed_data
+    
+    def _fallback_score(self, base_score: int, job_description: Optional[str] = None) -> Dict:
+        """Return base score with minimal feedback when AI analysis fails"""
+        return {
+            "overall_score": base_score,
+            "category_scores": {
+                "content": base_score,
+                "format": base_score,
+                "optimization": base_score // 2 if not job_description else base_score,
+                "best_practices": base_score,
+                "application_ready": base_score
+            },
+            "breakdown": {},
+            "strengths": ["Resume structure is present"],
+            "improvements": {
+                "content": [],
+                "format": [],
+                "optimization": [],
+                "best_practices": [],
+                "application_ready": []
+            },
+            "missing_keywords": [],
+            "summary": f"Resume scored {base_score}/100. Further analysis unavailable.",
+            "last_updated": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
     
     def _calculate_base_score(self, resume_data: Dict, job_description: str = "") -> int:
         """
@@ -417,17 +1029,3 @@ Return ONLY the JSON object.
         
         # Ensure score is within 0-100
         return max(0, min(100, score))
-    
-    def _extract_json(self, text: str) -> str:
-        """Extract JSON from text that might have markdown formatting"""
-        if "```json" in text:
-            text = text.split("```json")[1].split("```")[0].strip()
-        elif "```" in text:
-            text = text.split("```")[1].split("```")[0].strip()
-        
-        # Try to find JSON object or array in the text
-        json_match = re.search(r'(\{.*\}|\[.*\])', text, re.DOTALL)
-        if json_match:
-            text = json_match.group(0)
-        
-        return text
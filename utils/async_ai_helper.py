@@ -0,0 +1,199 @@
+"""
+Async AI Helper Module
+Non-blocking Groq calls over one shared, keep-alive HTTP client
+"""
+
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import importlib.util
+import os
+import threading
+
+import httpx
+from groq import AsyncGroq
+
+from .ai_helper import AIHelper
+from .model_router import Route
+from .rate_limiter import AsyncSingleFlight
+from .schemas import Schema
+from .steps import arun_steps
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client(max_connections: Optional[int] = None,
+                       max_keepalive_connections: Optional[int] = None,
+                       keepalive_expiry: Optional[float] = None,
+                       timeout: Optional[float] = None) -> httpx.AsyncClient:
+    """
+    Build a pooled AsyncClient for the Groq API
+    
+    Unset limits come from LLM_MAX_CONNECTIONS, LLM_MAX_KEEPALIVE,
+    LLM_KEEPALIVE_EXPIRY and LLM_TIMEOUT. HTTP/2 is enabled when h2 is
+    installed so concurrent requests share a connection.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections or int(os.getenv('LLM_MAX_CONNECTIONS', '100')),
+        max_keepalive_connections=max_keepalive_connections or int(os.getenv('LLM_MAX_KEEPALIVE', '20')),
+        keepalive_expiry=keepalive_expiry or float(os.getenv('LLM_KEEPALIVE_EXPIRY', '30'))
+    )
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=limits,
+        timeout=timeout or float(os.getenv('LLM_TIMEOUT', '60'))
+    )
+
+
+def get_io_loop() -> asyncio.AbstractEventLoop:
+    """Event loop (on a daemon thread) that owns every pooled connection"""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-io-loop", daemon=True).start()
+        return _loop
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """Process-wide client shared by every AsyncAIHelper that is not given its own"""
+    global _http_client
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = create_http_client()
+        return _http_client
+
+
+class AsyncAIHelper:
+    """
+    Awaitable front end for an AIHelper
+    
+    Holds an AIHelper and runs its flows (see steps.py) with awaitable
+    transport calls, so prompts, parsing, validation, the response cache,
+    rate limiter, router and stats are the helper's own; only the Groq
+    client and request coalescing are async. The AIHelper keeps its
+    blocking methods for sync callers.
+    
+    All instances share one connection pool, so many Streamlit sessions
+    multiplex their requests over a few keep-alive connections instead of
+    each holding a worker thread for a whole round-trip. Connections live on
+    a background event loop (get_io_loop); the methods can be awaited from
+    any loop, and sync code can use run() or submit().
+    """
+    
+    def __init__(self, helper: AIHelper, http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            helper: AIHelper whose cache, rate limiter, router and stats are used
+            http_client: Private pooled client (see create_http_client).
+                Defaults to the shared client.
+        """
+        self.helper = helper
+        self._owns_http_client = http_client is not None
+        self.http_client = http_client or get_shared_http_client()
+        # Retries are done in the helper's request flow, like AIHelper's client
+        self.client = AsyncGroq(api_key=helper.client.api_key, http_client=self.http_client, max_retries=0)
+        # Coalescing happens on the I/O loop, where every request runs
+        self.single_flight = AsyncSingleFlight()
+    
+    def submit(self, coro: Awaitable) -> Future:
+        """Schedule a coroutine on the I/O loop and return a concurrent Future"""
+        return asyncio.run_coroutine_threadsafe(coro, get_io_loop())
+    
+    def run(self, coro: Awaitable) -> Any:
+        """Run a coroutine on the I/O loop and block until it finishes"""
+        return self.submit(coro).result()
+    
+    async def _on_io_loop(self, coro: Awaitable) -> Any:
+        loop = get_io_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+    
+    def parse_json(self, content: str, brackets: str = '{[') -> Any:
+        """AIHelper.parse_json, so flows that parse answers can take either helper"""
+        return self.helper.parse_json(content, brackets)
+    
+    async def complete(self, prompt: str, temperature: Optional[float] = None, max_tokens: Optional[int] = None,
+                       parse: Optional[Callable[[str], Any]] = None, task: Optional[str] = None,
+                       expected_tokens: Optional[int] = None) -> Any:
+        """Awaitable AIHelper.complete"""
+        return await arun_steps(self, self.helper._complete_flow(prompt, temperature, max_tokens, parse, task,
+                                                                 expected_tokens))
+    
+    async def stream_complete(self, prompt: str, temperature: Optional[float] = None, max_tokens: Optional[int] = None,
+                              on_field: Optional[Callable[[tuple, Any], None]] = None,
+                              parse: Optional[Callable[[str], Any]] = None, task: Optional[str] = None,
+                              expected_tokens: Optional[int] = None) -> Any:
+        """Awaitable AIHelper.stream_complete (on_field runs on the I/O loop thread)"""
+        return await arun_steps(self, self.helper._stream_complete_flow(prompt, temperature, max_tokens, on_field,
+                                                                        parse, task, expected_tokens))
+    
+    async def conform(self, data: Any, schema: Schema, prompt: str, task: Optional[str] = None) -> Dict:
+        """Awaitable AIHelper.conform"""
+        return await arun_steps(self, self.helper._conform_flow(data, schema, prompt, task))
+    
+    async def extract_resume_info(self, resume_text: str, target_role: str, raise_errors: bool = False) -> Dict:
+        """Awaitable AIHelper.extract_resume_info"""
+        return await arun_steps(self, self.helper._extraction_flow(resume_text, target_role, raise_errors))
+    
+    async def generate_resume_content(self, user_data: Dict, job_description: Optional[str] = None,
+                                      on_field: Optional[Callable[[tuple, Any], None]] = None) -> Dict:
+        """Awaitable AIHelper.generate_resume_content"""
+        return await arun_steps(self, self.helper._generation_flow(user_data, job_description, on_field))
+    
+    async def calculate_ats_score(self, resume_data: Dict, job_description: Optional[str] = None) -> Dict:
+        """Awaitable AIHelper.calculate_ats_score"""
+        return await arun_steps(self, self.helper._score_flow(resume_data, job_description))
+    
+    # Transport (see AIHelper): requests and streams run on the I/O loop
+    
+    async def _fetch(self, prompt: str, route: Route, task: Optional[str],
+                     expected_tokens: Optional[int] = None) -> Tuple[str, bool]:
+        return await arun_steps(self, self.helper._fetch_flow(prompt, route, task, expected_tokens))
+    
+    async def _fetch_streaming(self, prompt: str, route: Route, task: Optional[str], expected_tokens: Optional[int],
+                               on_field: Optional[Callable[[tuple, Any], None]]) -> Tuple[str, bool]:
+        return await self._on_io_loop(arun_steps(self, self.helper._fetch_streaming_flow(prompt, route, task,
+                                                                                         expected_tokens, on_field)))
+    
+    async def _coalesced(self, key: str, prompt: str, route: Route, task: Optional[str],
+                         expected_tokens: Optional[int] = None) -> Tuple[str, bool]:
+        return await self._on_io_loop(self.single_flight.do(key, lambda: self._fetch(prompt, route, task,
+                                                                                      expected_tokens)))
+    
+    async def _acquire(self, tokens: int):
+        await self.helper.rate_limiter.aacquire(tokens)
+    
+    async def _send(self, kwargs: Dict):
+        raw = await self.client.chat.completions.with_raw_response.create(**kwargs)
+        return raw.headers, await raw.parse()
+    
+    async def _read_stream(self, stream, on_text: Callable[[str], None]) -> Tuple[Optional[str], Any]:
+        finish_reason = None
+        usage = None
+        async for chunk in stream:
+            usage = AIHelper._chunk_usage(chunk) or usage
+            if not chunk.choices:
+                continue
+            if chunk.choices[0].delta.content:
+                on_text(chunk.choices[0].delta.content)
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+        return finish_reason, usage
+    
+    async def _sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+    
+    async def aclose(self):
+        """Close a private http_client (the shared pool stays open)"""
+        if self._owns_http_client:
+            await self._on_io_loop(self.http_client.aclose())
@@ -0,0 +1,198 @@
+"""
+Batch Ingest Module
+Parses and extracts a whole directory (or manifest) of resumes into JSONL
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import os
+import logging
+
+from .resume_parser import ResumeParser
+
+logger = logging.getLogger(__name__)
+
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+# Legacy Word files are rejected by ResumeParser.preflight; skipped when scanning
+# a directory instead of failing again on every resumed run
+UNSUPPORTED_EXTENSIONS = ('.doc',)
+
+
+def collect_inputs(source: str, default_role: str = "General") -> List[Tuple[str, str]]:
+    """
+    Build the list of (path, target_role) jobs for a batch
+    
+    Args:
+        source: A directory (searched recursively for PDF/DOCX files;
+            legacy .doc files are logged and left out) or a
+            manifest file. Manifest lines are either plain paths or JSON
+            objects with "path" and optional "target_role". Relative paths
+            are resolved against the manifest's directory.
+        default_role: Target role used when the manifest does not give one
+    
+    Returns:
+        Sorted list of (absolute path, target role) pairs
+    """
+    jobs = []
+    if os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for filename in files:
+                if filename.lower().endswith(RESUME_EXTENSIONS):
+                    jobs.append((os.path.abspath(os.path.join(root, filename)), default_role))
+                elif filename.lower().endswith(UNSUPPORTED_EXTENSIONS):
+                    logger.warning(f"[skipped] {os.path.join(root, filename)}: legacy .doc files are not supported")
+        return sorted(jobs)
+    
+    base_dir = os.path.dirname(os.path.abspath(source))
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('{'):
+                entry = json.loads(line)
+                path = entry['path']
+                role = entry.get('target_role') or default_role
+            else:
+                path, role = line, default_role
+            jobs.append((os.path.abspath(os.path.join(base_dir, path)), role))
+    return jobs
+
+
+def load_checkpoint(output_path: str) -> set:
+    """
+    Return the paths already ingested successfully in a previous run
+    
+    Lines that are not valid JSON (e.g. a partial write from a crash) and
+    records with a non-"ok" status are ignored, so those files are retried.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get('status') == 'ok':
+                done.add(record.get('path'))
+    return done
+
+
+def _init_parse_worker():
+    # Pages are already parsed one file per process; avoid nested pools
+    ResumeParser.MAX_PDF_WORKERS = 1
+
+
+def _parse_file(path: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Process pool worker: returns (text, sha256, error)"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        text = ResumeParser.parse_resume(data, filename=path)
+        if not text:
+            return None, digest, "No text could be extracted"
+        return text, digest, None
+    except Exception as e:
+        return None, None, f"{type(e).__name__}: {e}"
+
+
+class BatchIngestor:
+    """Parse resumes in a process pool and extract them with bounded LLM concurrency"""
+    
+    def __init__(self, ai_helper=None, parse_workers: int = None, extract_concurrency: int = 4):
+        """
+        Args:
+            ai_helper: AIHelper used for extraction. If None only parsing runs
+                and the raw text is written instead of structured data.
+            parse_workers: Size of the parsing process pool (defaults to CPU count)
+            extract_concurrency: Maximum extract_resume_info calls in flight
+        """
+        self.ai_helper = ai_helper
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.extract_concurrency = extract_concurrency
+    
+    def run(self, jobs: List[Tuple[str, str]], output_path: str, resume: bool = True) -> Dict:
+        """
+        Ingest every job, appending one JSON record per file to output_path
+        
+        Args:
+            jobs: (path, target_role) pairs, e.g. from collect_inputs
+            output_path: JSONL file, also used as the checkpoint
+            resume: Skip files already recorded with status "ok"
+        
+        Returns:
+            Counts of ok / failed (unreadable) / error (extraction failed) / skipped files
+        """
+        done = load_checkpoint(output_path) if resume else set()
+        todo = [(path, role) for path, role in jobs if path not in done]
+        summary = {"total": len(jobs), "skipped": len(jobs) - len(todo), "ok": 0, "failed": 0, "error": 0}
+        if not todo:
+            return summary
+        
+        mode = 'a' if resume else 'w'
+        self._terminate_partial_line(output_path, mode)
+        
+        with open(output_path, mode, encoding='utf-8') as out, \
+                ProcessPoolExecutor(max_workers=self.parse_workers, initializer=_init_parse_worker) as parse_pool, \
+                ThreadPoolExecutor(max_workers=self.extract_concurrency) as extract_pool:
+            
+            pending = {}
+            for path, role in todo:
+                pending[parse_pool.submit(_parse_file, path)] = ('parse', path, role, None)
+            
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, path, role, digest = pending.pop(future)
+                    
+                    if stage == 'parse':
+                        text, digest, error = future.result()
+                        if error:
+                            self._write(out, summary, path, digest, 'failed', error=error)
+                        elif self.ai_helper is None:
+                            self._write(out, summary, path, digest, 'ok', text=text)
+                        else:
+                            extract_future = extract_pool.submit(self.ai_helper.extract_resume_info, text, role,
+                                                                 raise_errors=True)
+                            pending[extract_future] = ('extract', path, role, digest)
+                        continue
+                    
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        # The LLM call failed (rate limit, outage...); not "ok", so a resumed run retries it
+                        self._write(out, summary, path, digest, 'error', error=f"{type(e).__name__}: {e}")
+                        continue
+                    self._write(out, summary, path, digest, 'ok', data=data)
+        
+        return summary
+    
+    @staticmethod
+    def _terminate_partial_line(output_path: str, mode: str):
+        """Make sure appended records start on a fresh line after a crash"""
+        if mode != 'a' or not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+            return
+        with open(output_path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+    
+    @staticmethod
+    def _write(out, summary: Dict, path: str, digest: Optional[str], status: str, **fields):
+        record = {
+            "path": path,
+            "sha256": digest,
+            "status": status,
+            "ingested_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        record.update(fields)
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+        summary[status] += 1
+        logger.info(f"[{status}] {path}")
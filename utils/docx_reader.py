@@ -0,0 +1,146 @@
+"""
+DOCX Reader Module
+Single-pass text extraction straight from the DOCX package XML
+"""
+
+from io import BytesIO
+from typing import List, Tuple
+import xml.etree.ElementTree as ET
+import zipfile
+import re
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+
+# Wrappers whose children should be treated as if they were inline
+_TRANSPARENT = {W + 'sdt', W + 'sdtContent', W + 'customXml', W + 'smartTag'}
+
+# Property elements never contain document text (and w:pPr/w:tabs/w:tab
+# would otherwise be mistaken for a tab character)
+_SKIP = {W + 'pPr', W + 'rPr', W + 'tblPr', W + 'trPr', W + 'tcPr', W + 'sectPr', W + 'tblGrid'}
+
+_PART_PATTERN = re.compile(r'^word/(header|footer)(\d*)\.xml$')
+
+Block = Tuple[str, str]
+
+
+def read_docx_blocks(data: bytes) -> List[Block]:
+    """
+    Extract text blocks from a DOCX in reading order
+    
+    Headers come first, then the body (paragraphs, table rows and text boxes
+    in document order), then footers. Each XML part is parsed exactly once
+    and no python-docx objects are built.
+    
+    Args:
+        data: Raw DOCX bytes
+    
+    Returns:
+        List of (kind, text) where kind is one of "header", "paragraph",
+        "table_row", "textbox" or "footer". Table rows join their cells
+        with " | ".
+    """
+    with zipfile.ZipFile(BytesIO(data)) as package:
+        names = package.namelist()
+        headers, footers = [], []
+        for name in sorted(names):
+            match = _PART_PATTERN.match(name)
+            if match:
+                (headers if match.group(1) == 'header' else footers).append(name)
+        
+        blocks: List[Block] = []
+        _read_part(package, headers, 'header', blocks)
+        
+        body = ET.fromstring(package.read('word/document.xml')).find(W + 'body')
+        if body is not None:
+            _walk(body, 'paragraph', blocks)
+        
+        _read_part(package, footers, 'footer', blocks)
+    return blocks
+
+
+def _read_part(package: zipfile.ZipFile, names: List[str], kind: str, blocks: List[Block]):
+    """Add header/footer text, skipping repeats (first/even/default variants)"""
+    seen = set()
+    for name in names:
+        part_blocks: List[Block] = []
+        _walk(ET.fromstring(package.read(name)), kind, part_blocks)
+        for _, text in part_blocks:
+            if text not in seen:
+                seen.add(text)
+                blocks.append((kind, text))
+
+
+def _walk(container, kind: str, blocks: List[Block]):
+    """Walk a block-level container (body, cell, text box, header)"""
+    for child in container:
+        tag = child.tag
+        if tag == W + 'p':
+            _paragraph(child, kind, blocks)
+        elif tag == W + 'tbl':
+            _table(child, blocks, kind)
+        elif tag in _TRANSPARENT:
+            _walk(child, kind, blocks)
+        elif tag == MC + 'AlternateContent':
+            _walk(_pick_alternate(child), kind, blocks)
+
+
+def _paragraph(paragraph, kind: str, blocks: List[Block]):
+    parts: List[str] = []
+    text_boxes = []
+    _collect_runs(paragraph, parts, text_boxes)
+    text = ''.join(parts).strip()
+    if text:
+        blocks.append((kind, text))
+    # Text boxes are anchored to the paragraph; emit them right after it
+    for box in text_boxes:
+        _walk(box, 'textbox', blocks)
+
+
+def _collect_runs(element, parts: List[str], text_boxes: list):
+    for child in element:
+        tag = child.tag
+        if tag == W + 't':
+            parts.append(child.text or '')
+        elif tag == W + 'tab':
+            parts.append('\t')
+        elif tag in (W + 'br', W + 'cr'):
+            parts.append('\n')
+        elif tag == W + 'txbxContent':
+            text_boxes.append(child)
+        elif tag == MC + 'AlternateContent':
+            _collect_runs(_pick_alternate(child), parts, text_boxes)
+        elif tag in _SKIP:
+            continue
+        else:
+            _collect_runs(child, parts, text_boxes)
+
+
+def _table(table, blocks: List[Block], kind: str):
+    for row in _children(table, W + 'tr'):
+        cells = []
+        for cell in _children(row, W + 'tc'):
+            cell_blocks: List[Block] = []
+            _walk(cell, kind, cell_blocks)
+            cell_text = '\n'.join(text for _, text in cell_blocks)
+            if cell_text:
+                cells.append(cell_text)
+        if cells:
+            blocks.append(('table_row', ' | '.join(cells)))
+
+
+def _children(element, tag: str):
+    """Yield children with the given tag, looking through content controls"""
+    for child in element:
+        if child.tag == tag:
+            yield child
+        elif child.tag in _TRANSPARENT:
+            yield from _children(child, tag)
+
+
+def _pick_alternate(alternate):
+    """Use mc:Choice (or mc:Fallback) so text boxes are not read twice"""
+    choice = alternate.find(MC + 'Choice')
+    if choice is None:
+        choice = alternate.find(MC + 'Fallback')
+    return choice if choice is not None else []
@@ -0,0 +1,88 @@
+"""
+Edit History Module
+Bounded undo/redo log of section edits for the resume agent
+"""
+
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+import copy
+
+# Marks a section that did not exist before an edit, so undo removes it again
+_MISSING = object()
+
+
+class EditHistory:
+    """
+    Undo/redo stacks of reverse section edits
+    
+    Instead of a snapshot of the whole resume per version, each entry holds
+    only the section an edit replaced: (section, previous value). Undoing
+    puts the previous value back and moves the current one onto the redo
+    stack, so memory grows with the size of the changed section, not the
+    resume. Values are deep-copied on the way in, so later in-place changes
+    to the resume cannot alter the history.
+    """
+    
+    def __init__(self, limit: int = 50):
+        """
+        Args:
+            limit: Most undo steps kept; older ones are dropped (0 = no limit)
+        """
+        self.limit = limit
+        self._undo: deque = deque(maxlen=limit or None)
+        self._redo: List[Tuple[str, Any]] = []
+    
+    def __len__(self) -> int:
+        return len(self._undo)
+    
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+    
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+    
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+    
+    def record(self, state: Dict, section: str):
+        """
+        Remember a section before it is replaced
+        
+        Call this before writing the new value into state. A new edit
+        discards anything that could have been redone.
+        """
+        self._undo.append((section, self._snapshot(state, section)))
+        self._redo.clear()
+    
+    def undo(self, state: Dict) -> Optional[str]:
+        """Restore the section changed by the last edit; returns it, or None if there is nothing to undo"""
+        if not self._undo:
+            return None
+        section, previous = self._undo.pop()
+        self._redo.append((section, self._snapshot(state, section)))
+        self._restore(state, section, previous)
+        return section
+    
+    def redo(self, state: Dict) -> Optional[str]:
+        """Re-apply the last undone edit; returns its section, or None if there is nothing to redo"""
+        if not self._redo:
+            return None
+        section, value = self._redo.pop()
+        self._undo.append((section, self._snapshot(state, section)))
+        self._restore(state, section, value)
+        return section
+    
+    @staticmethod
+    def _snapshot(state: Dict, section: str) -> Any:
+        return copy.deepcopy(state[section]) if section in state else _MISSING
+    
+    @staticmethod
+    def _restore(state: Dict, section: str, value: Any):
+        if value is _MISSING:
+            state.pop(section, None)
+        else:
+            # Stored values stay private to the history; the resume gets its own copy
+            state[section] = copy.deepcopy(value)
@@ -0,0 +1,147 @@
+"""
+JSON Patch Module
+RFC 6902 patches (with RFC 6901 pointers) applied to plain JSON values
+"""
+
+from typing import Any, Dict, List
+import copy
+
+
+class JSONPatchError(ValueError):
+    """A patch operation that cannot be applied to the document"""
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """'/a/b~1c/0' -> ['a', 'b/c', '0']; '' is the whole document"""
+    if pointer == "":
+        return []
+    if not pointer.startswith('/'):
+        raise JSONPatchError(f"Invalid JSON pointer '{pointer}'")
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _index(container: List, token: str, path: str, allow_end: bool = False) -> int:
+    if token == '-' and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token[0] == '0'):
+        raise JSONPatchError(f"Invalid list index '{token}' in '{path}'")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JSONPatchError(f"List index {index} out of range in '{path}'")
+    return index
+
+
+def _resolve(document: Any, tokens: List[str], path: str) -> Any:
+    """Value at tokens"""
+    value = document
+    for token in tokens:
+        if isinstance(value, dict):
+            if token not in value:
+                raise JSONPatchError(f"Path '{path}' does not exist")
+            value = value[token]
+        elif isinstance(value, list):
+            value = value[_index(value, token, path)]
+        else:
+            raise JSONPatchError(f"Path '{path}' does not exist")
+    return value
+
+
+def get_value(document: Any, path: str) -> Any:
+    """Value at a JSON pointer"""
+    return _resolve(document, parse_pointer(path), path)
+
+
+def _add(document: Any, tokens: List[str], value: Any, path: str) -> Any:
+    if not tokens:
+        return value
+    parent = _resolve(document, tokens[:-1], path)
+    if isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, tokens[-1], path, allow_end=True), value)
+    else:
+        raise JSONPatchError(f"Cannot add to '{path}': parent is not an object or array")
+    return document
+
+
+def _remove(document: Any, tokens: List[str], path: str) -> Any:
+    """Remove the value at tokens and return it"""
+    if not tokens:
+        raise JSONPatchError("Cannot remove the whole document")
+    parent = _resolve(document, tokens[:-1], path)
+    if isinstance(parent, dict):
+        if tokens[-1] not in parent:
+            raise JSONPatchError(f"Path '{path}' does not exist")
+        return parent.pop(tokens[-1])
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, tokens[-1], path))
+    raise JSONPatchError(f"Path '{path}' does not exist")
+
+
+def _apply_operation(document: Any, operation: Dict) -> Any:
+    if not isinstance(operation, dict):
+        raise JSONPatchError(f"Patch operations must be objects, got {operation!r}")
+    op = operation.get('op')
+    path = operation.get('path')
+    if not isinstance(path, str):
+        raise JSONPatchError(f"Operation '{op}' needs a string 'path'")
+    tokens = parse_pointer(path)
+    
+    if op in ('add', 'replace', 'test') and 'value' not in operation:
+        raise JSONPatchError(f"Operation '{op}' at '{path}' needs a 'value'")
+    
+    if op == 'add':
+        return _add(document, tokens, copy.deepcopy(operation['value']), path)
+    if op == 'remove':
+        _remove(document, tokens, path)
+        return document
+    if op == 'replace':
+        if not tokens:
+            return copy.deepcopy(operation['value'])
+        _remove(document, tokens, path)
+        return _add(document, tokens, copy.deepcopy(operation['value']), path)
+    if op == 'test':
+        if _resolve(document, tokens, path) != operation['value']:
+            raise JSONPatchError(f"Test failed at '{path}'")
+        return document
+    
+    source = operation.get('from')
+    if not isinstance(source, str):
+        raise JSONPatchError(f"Operation '{op}' needs a string 'from'")
+    source_tokens = parse_pointer(source)
+    if op == 'copy':
+        value = copy.deepcopy(_resolve(document, source_tokens, source))
+        return _add(document, tokens, value, path)
+    if op == 'move':
+        if tokens[:len(source_tokens)] == source_tokens and len(tokens) > len(source_tokens):
+            raise JSONPatchError(f"Cannot move '{source}' into its own child '{path}'")
+        if tokens == source_tokens:
+            return document
+        value = _remove(document, source_tokens, source)
+        return _add(document, tokens, value, path)
+    raise JSONPatchError(f"Unknown patch operation '{op}'")
+
+
+def apply_patch(document: Any, patch: List[Dict]) -> Any:
+    """
+    Apply a JSON Patch without modifying the original
+    
+    Operations are applied in order to a deep copy; if any of them fails the
+    whole patch fails and the document is left as it was.
+    
+    Args:
+        document: JSON value to patch
+        patch: List of RFC 6902 operations (add, remove, replace, move, copy, test)
+    
+    Returns:
+        The patched copy
+    
+    Raises:
+        JSONPatchError: If an operation is malformed or does not apply
+    """
+    if not isinstance(patch, list):
+        raise JSONPatchError("A patch must be a list of operations")
+    result = copy.deepcopy(document)
+    for operation in patch:
+        result = _apply_operation(result, operation)
+    return result
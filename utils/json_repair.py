@@ -0,0 +1,415 @@
+"""
+JSON Repair Module
+One-pass extraction and repair of the JSON payload in an LLM completion
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+import json
+import re
+import threading
+
+_WHITESPACE = ' \t\r\n'
+_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?$')
+_NUMBER_CHARS = set('0123456789+-.eE')
+_WORD_END = set(',:}]' + _WHITESPACE)
+_VALUE_END = set(',}]\n')
+# After a closing quote: delimiters, or a newline/value start where a comma is missing
+_STRING_FOLLOWERS = set(',:}]"{[\r\n')
+
+# Bare words and what they mean in JSON
+_LITERALS = {
+    'true': 'true', 'false': 'false', 'null': 'null',
+    'True': 'true', 'False': 'false', 'None': 'null',
+    'NaN': 'null', 'Infinity': 'null', '-Infinity': 'null', 'undefined': 'null',
+}
+_CONTROL_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t', '\b': '\\b', '\f': '\\f'}
+_CLOSERS = {'{': '}', '[': ']'}
+
+# Names of the defects repair_json fixes
+TRAILING_COMMA = 'trailing_comma'
+MISSING_COMMA = 'missing_comma'
+MISSING_COLON = 'missing_colon'
+MISSING_VALUE = 'missing_value'
+EXTRA_COMMA = 'extra_comma'
+SINGLE_QUOTES = 'single_quotes'
+UNQUOTED_KEY = 'unquoted_key'
+UNQUOTED_STRING = 'unquoted_string'
+UNESCAPED_QUOTE = 'unescaped_quote'
+CONTROL_CHARACTER = 'control_character'
+INVALID_ESCAPE = 'invalid_escape'
+INVALID_NUMBER = 'invalid_number'
+NON_JSON_LITERAL = 'non_json_literal'
+COMMENT = 'comment'
+MISMATCHED_BRACKET = 'mismatched_bracket'
+TRUNCATED = 'truncated'
+
+# Repairs that mean a candidate was guessed into shape rather than fixed,
+# e.g. "{placeholders}" in prose becoming {"placeholders": null}
+_GUESSWORK = {MISSING_COLON, MISSING_VALUE, UNQUOTED_STRING, MISMATCHED_BRACKET}
+MAX_CANDIDATES = 16
+
+_FENCE = re.compile(r'```[ \t]*(?:json)?[ \t]*\r?\n', re.IGNORECASE)
+
+
+class TruncatedJSONError(ValueError):
+    """A payload that was cut off before its end; value is what could be recovered"""
+    
+    def __init__(self, value: Any, message: str = "The answer was cut off before it was complete"):
+        super().__init__(message)
+        self.value = value
+
+
+class _Repairer:
+    """Single left-to-right pass over the text, writing repaired JSON to out"""
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.n = len(text)
+        self.out: List[str] = []
+        self.repairs: List[str] = []
+        # One frame per open container: [opening bracket, state]; objects go
+        # key -> colon -> value -> after, arrays go value -> after
+        self.stack: List[List[str]] = []
+    
+    def note(self, repair: str):
+        if repair not in self.repairs:
+            self.repairs.append(repair)
+    
+    def run(self, start: int) -> str:
+        text = self.text
+        i = self._open(start, text[start])
+        
+        while self.stack and i < self.n:
+            c = text[i]
+            if c in _WHITESPACE:
+                i += 1
+                continue
+            if c == '/' and text[i + 1:i + 2] in ('/', '*'):
+                i = self._skip_comment(i)
+                continue
+            if text.startswith('```', i):
+                break  # closing fence of an unfinished payload
+            
+            frame = self.stack[-1]
+            state = frame[1]
+            if state == 'after':
+                i = self._after_value(i, c, frame)
+            elif state == 'key':
+                i = self._key(i, c, frame)
+            elif state == 'colon':
+                if c == ':':
+                    self.out.append(':')
+                    i += 1
+                else:
+                    self.note(MISSING_COLON)
+                    self.out.append(':')
+                frame[1] = 'value'
+            else:
+                i = self._value(i, c, frame)
+        
+        if self.stack:
+            self._close_truncated()
+        return ''.join(self.out)
+    
+    def _open(self, i: int, bracket: str) -> int:
+        self.out.append(bracket)
+        self.stack.append([bracket, 'key' if bracket == '{' else 'value'])
+        return i + 1
+    
+    def _close(self, i: int, c: str) -> int:
+        bracket = self.stack.pop()[0]
+        closer = _CLOSERS[bracket]
+        if c != closer:
+            self.note(MISMATCHED_BRACKET)
+        self.out.append(closer)
+        if self.stack:
+            self.stack[-1][1] = 'after'
+        return i + 1
+    
+    def _after_value(self, i: int, c: str, frame: List[str]) -> int:
+        if c == ',':
+            following = self._peek(i + 1)
+            if following in ('}', ']'):
+                self.note(TRAILING_COMMA)
+            elif following:
+                self.out.append(',')
+                frame[1] = 'key' if frame[0] == '{' else 'value'
+            return i + 1
+        if c in '}]':
+            return self._close(i, c)
+        self.note(MISSING_COMMA)
+        self.out.append(',')
+        frame[1] = 'key' if frame[0] == '{' else 'value'
+        return i
+    
+    def _key(self, i: int, c: str, frame: List[str]) -> int:
+        if c == '}' or c == ']':
+            return self._close(i, c)
+        if c == ',':
+            self.note(EXTRA_COMMA)
+            return i + 1
+        frame[1] = 'colon'
+        if c in '"\'':
+            return self._string(i, c)
+        # Unquoted key: read up to the colon
+        end = i
+        while end < self.n and self.text[end] not in ':,{}[]\n':
+            end += 1
+        self.note(UNQUOTED_KEY)
+        self.out.append(json.dumps(self.text[i:end].strip()))
+        return end
+    
+    def _value(self, i: int, c: str, frame: List[str]) -> int:
+        if c in '}]':
+            if frame[0] == '{':
+                self.note(MISSING_VALUE)
+                self.out.append('null')
+                frame[1] = 'after'
+            return self._close(i, c)
+        if c == ',':
+            if frame[0] == '{':
+                self.note(MISSING_VALUE)
+                self.out.append('null')
+                frame[1] = 'after'
+                return i
+            self.note(EXTRA_COMMA)
+            return i + 1
+        
+        frame[1] = 'after'
+        if c in '{[':
+            return self._open(i, c)
+        if c in '"\'':
+            return self._string(i, c)
+        if c in '-+.' or c.isdigit():
+            return self._number(i)
+        return self._word(i)
+    
+    def _string(self, i: int, quote: str) -> int:
+        """Copy a string starting at the quote at i, returning the index after it"""
+        text, n, out = self.text, self.n, self.out
+        if quote == "'":
+            self.note(SINGLE_QUOTES)
+        out.append('"')
+        j = i + 1
+        while j < n:
+            ch = text[j]
+            if ch == '\\':
+                escaped = text[j + 1:j + 2]
+                if escaped == 'u' and re.match(r'[0-9a-fA-F]{4}$', text[j + 2:j + 6]):
+                    out.append(text[j:j + 6])
+                    j += 6
+                    continue
+                if escaped and escaped in '"\\/bfnrt':
+                    out.append('\\' + escaped)
+                elif escaped == "'":
+                    self.note(INVALID_ESCAPE)
+                    out.append("'")
+                elif escaped:
+                    self.note(INVALID_ESCAPE)
+                    out.append('\\\\' + escaped)
+                j += 2
+                continue
+            if ch == quote and self._string_ends(j + 1):
+                out.append('"')
+                return j + 1
+            if ch == '"':
+                if quote == '"':
+                    self.note(UNESCAPED_QUOTE)
+                out.append('\\"')
+            elif ch < ' ':
+                self.note(CONTROL_CHARACTER)
+                out.append(_CONTROL_ESCAPES.get(ch, '\\u%04x' % ord(ch)))
+            else:
+                out.append(ch)
+            j += 1
+        
+        self.note(TRUNCATED)
+        out.append('"')
+        return n
+    
+    def _string_ends(self, j: int) -> bool:
+        """Whether a quote followed by text[j:] closes the string or is part of it"""
+        while j < self.n and self.text[j] in ' \t':
+            j += 1
+        # Anything that may follow a string closes it; other text means the
+        # quote was meant literally ("the "best" way")
+        return j >= self.n or self.text[j] in _STRING_FOLLOWERS
+    
+    def _number(self, i: int) -> int:
+        end = i
+        while end < self.n and self.text[end] in _NUMBER_CHARS:
+            end += 1
+        token = self.text[i:end]
+        if token == '-' and self.text.startswith('Infinity', end):
+            return self._word(i)
+        if _NUMBER.match(token):
+            self.out.append(token)
+            return end
+        self.note(INVALID_NUMBER)
+        try:
+            number = float(token)
+            self.out.append(str(int(number)) if number.is_integer() and 'e' not in token.lower() else repr(number))
+        except ValueError:
+            self.out.append(json.dumps(token))
+        return end
+    
+    def _word(self, i: int) -> int:
+        """A bare word in value position: a literal, or text the model forgot to quote"""
+        end = i
+        while end < self.n and self.text[end] not in _WORD_END:
+            end += 1
+        word = self.text[i:end]
+        if word in _LITERALS:
+            if _LITERALS[word] != word:
+                self.note(NON_JSON_LITERAL)
+            self.out.append(_LITERALS[word])
+            return end
+        # Unquoted text runs to the end of the line or the next delimiter
+        while end < self.n and self.text[end] not in _VALUE_END:
+            end += 1
+        self.note(UNQUOTED_STRING)
+        self.out.append(json.dumps(self.text[i:end].strip()))
+        return end
+    
+    def _skip_comment(self, i: int) -> int:
+        self.note(COMMENT)
+        if self.text[i + 1] == '/':
+            end = self.text.find('\n', i)
+            return self.n if end < 0 else end + 1
+        end = self.text.find('*/', i + 2)
+        return self.n if end < 0 else end + 2
+    
+    def _peek(self, i: int) -> str:
+        """Next character that is not whitespace or a comment"""
+        while i < self.n:
+            c = self.text[i]
+            if c in _WHITESPACE:
+                i += 1
+            elif c == '/' and self.text[i + 1:i + 2] in ('/', '*'):
+                i = self._skip_comment(i)
+            else:
+                return c
+        return ''
+    
+    def _close_truncated(self):
+        """Close whatever the completion left open when it was cut off"""
+        self.note(TRUNCATED)
+        while self.stack:
+            bracket, state = self.stack[-1]
+            if state == 'colon':
+                self.out.append(':null')
+            elif state == 'value' and bracket == '{':
+                self.out.append('null')
+            elif state in ('key', 'value') and self.out[-1] == ',':
+                self.out.pop()
+            self._close(self.n, _CLOSERS[bracket])
+
+
+def find_json_starts(text: str, brackets: str = '{[') -> List[int]:
+    """
+    Indices where the payload may start, in the order they are tried
+    
+    The first opening bracket inside a ```json fence comes first, then
+    every opening bracket in the text from left to right.
+    """
+    starts = []
+    fence = _FENCE.search(text)
+    if fence:
+        inside = [text.find(bracket, fence.end()) for bracket in brackets]
+        inside = [start for start in inside if start >= 0]
+        if inside:
+            starts.append(min(inside))
+    for i, c in enumerate(text):
+        if len(starts) >= MAX_CANDIDATES:
+            break
+        if c in brackets and i not in starts:
+            starts.append(i)
+    return starts
+
+
+def repair_json(text: str, brackets: str = '{[') -> Tuple[str, List[str]]:
+    """
+    Extract the JSON object or array from text and repair it
+    
+    Candidates are tried in the order of find_json_starts: the payload of a
+    ```json fence, then each opening bracket. The first candidate that needs
+    no guesswork (see _GUESSWORK) wins, so braces in the prose around the
+    payload are skipped. Anything outside the chosen value is dropped.
+    While copying the value the common defects of model output are fixed in
+    the same pass: trailing or missing commas, single quotes, unquoted keys,
+    raw newlines and stray quotes in strings, Python literals, comments, and
+    containers left open when the completion was cut off.
+    
+    Args:
+        text: Completion text
+        brackets: Which containers may start the payload ('[' to skip an
+            object wrapper and take the first array)
+    
+    Returns:
+        (JSON text, names of the repairs that were needed, in order)
+    
+    Raises:
+        json.JSONDecodeError: If no candidate can be repaired without
+            guesswork
+    """
+    for start in find_json_starts(text, brackets):
+        repairer = _Repairer(text)
+        repaired = repairer.run(start)
+        if _GUESSWORK.isdisjoint(repairer.repairs):
+            return repaired, repairer.repairs
+    raise json.JSONDecodeError("No JSON object or array found", text, 0)
+
+
+def loads_tolerant(text: str, brackets: str = '{[') -> Tuple[Any, List[str]]:
+    """
+    Parse the JSON payload of a completion, repairing it if needed
+    
+    Text that is already valid JSON (after dropping fences and prose) is
+    returned with an empty repair list.
+    
+    Returns:
+        (parsed value, repairs applied)
+    
+    Raises:
+        json.JSONDecodeError: If the payload cannot be repaired; doc is the
+            original text
+    """
+    repaired, repairs = repair_json(text, brackets)
+    try:
+        return json.loads(repaired), repairs
+    except json.JSONDecodeError as e:
+        raise json.JSONDecodeError(e.msg, text, e.pos) from e
+
+
+class JSONRepairStats:
+    """Thread-safe tally of how often completions needed which repair"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._parsed = 0
+        self._repaired = 0
+        self._failed = 0
+        self._repairs: Dict[str, int] = {}
+    
+    def record(self, repairs: Iterable[str]):
+        repairs = list(repairs)
+        with self._lock:
+            self._parsed += 1
+            if repairs:
+                self._repaired += 1
+            for repair in repairs:
+                self._repairs[repair] = self._repairs.get(repair, 0) + 1
+    
+    def record_failure(self):
+        with self._lock:
+            self._failed += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Parsed, repaired and failed payloads and the count per repair"""
+        with self._lock:
+            return {
+                "parsed": self._parsed,
+                "repaired": self._repaired,
+                "failed": self._failed,
+                "repairs": dict(sorted(self._repairs.items(), key=lambda item: -item[1]))
+            }
@@ -0,0 +1,218 @@
+"""
+Local Commands Module
+Deterministic resume agent commands applied without calling the LLM
+"""
+
+from typing import Any, Dict, List, Optional
+import re
+
+from .local_extractor import EMAIL_PATTERN, PHONE_PATTERN
+
+# Command word -> list section
+_LIST_SECTIONS = {
+    'skill': 'skills',
+    'skills': 'skills',
+    'certification': 'certifications',
+    'certifications': 'certifications',
+    'certificate': 'certifications',
+    'certificates': 'certifications',
+    'language': 'languages',
+    'languages': 'languages',
+}
+_SECTION_WORD = r'(?P<section>skills?|certifications?|certificates?|languages?)'
+_ARTICLE = r'(?:(?:my|the|a|an)\s+)?'
+
+# "add Python and SQL to skills", "remove AWS from my certifications"
+ITEMS_SECTION_PATTERN = re.compile(
+    rf'^(?P<verb>add|include|append|insert|remove|delete|drop)\s+(?P<items>.+?)\s+'
+    rf'(?:to|in|into|under|from)\s+{_ARTICLE}{_SECTION_WORD}(?:\s+(?:section|list))?$',
+    re.IGNORECASE
+)
+# "add skill Python", "remove certification: AWS Solutions Architect"
+SECTION_ITEMS_PATTERN = re.compile(
+    rf'^(?P<verb>add|include|append|insert|remove|delete|drop)\s+{_ARTICLE}(?:new\s+)?{_SECTION_WORD}\s*:?\s+(?P<items>.+)$',
+    re.IGNORECASE
+)
+# "change phone to +1 555 0100", "set my email address to a@b.com"
+FIELD_PATTERN = re.compile(
+    r'^(?:change|set|update|replace)\s+' + _ARTICLE +
+    r'(?P<field>phone(?:\s+number)?|mobile(?:\s+number)?|e-?mail(?:\s+address)?|full\s+name|name|target\s+role|target\s+job)'
+    r'\s*(?:to|with|as|=|:)\s*(?P<value>.+)$',
+    re.IGNORECASE
+)
+_FIELDS = {'phone': 'phone', 'mobile': 'phone', 'email': 'email', 'e-mail': 'email',
+           'name': 'name', 'full': 'name', 'target': 'target_role'}
+
+# Items that describe what to add instead of naming it ("relevant skills", "keywords from the job")
+VAGUE_ITEMS_PATTERN = re.compile(
+    r'^(?:in|on|for|about|from|to|with)\b|\b(?:related|relevant|more|some|missing|matching|based|appropriate|'
+    r'suitable|keywords?|job|description|that|which|any|all|my|the)\b',
+    re.IGNORECASE
+)
+_ITEM_SEPARATOR = re.compile(r'\s*,\s*(?:and\s+)?|\s+and\s+')
+_QUOTES = '"\'“”‘’`'
+
+# What the value of a name/target role change may look like to be applied
+# as given: quoted, or a few words that name it rather than describe it
+# ("something more senior", "a title that fits the job" go to the LLM)
+MAX_LITERAL_WORDS = 6
+VAGUE_VALUE_PATTERN = re.compile(
+    r'\b(?:something|anything|some|more|less|better|different|appropriate|relevant|suitable|matching|'
+    r'based|similar|like|than|that|which|fits?|my)\b',
+    re.IGNORECASE
+)
+
+
+class LocalCommandRouter:
+    """
+    Match mechanical agent commands and build their edit without the LLM
+    
+    route() returns an edit in the same shape as the LLM's edit answer
+    (section, updated_content, action, explanation, change_type), or None
+    when the command needs the model: free-form rewrites, ambiguous
+    removals, values that do not look right or only describe the new value,
+    and sections in an unexpected shape.
+    """
+    
+    @staticmethod
+    def route(user_command: str, resume_state: Dict) -> Optional[Dict]:
+        """
+        Edit for a deterministic command
+        
+        Args:
+            user_command: The user's command
+            resume_state: Current resume data (not modified)
+        
+        Returns:
+            Edit dict for ResumeAgent._apply_edit, or None to use the LLM
+        """
+        command = user_command.strip().rstrip('.!').strip()
+        
+        match = ITEMS_SECTION_PATTERN.match(command) or SECTION_ITEMS_PATTERN.match(command)
+        if match:
+            section = _LIST_SECTIONS[match.group('section').lower()]
+            if VAGUE_ITEMS_PATTERN.search(match.group('items')):
+                return None
+            items = LocalCommandRouter._split_items(match.group('items'))
+            if not items:
+                return None
+            if match.group('verb').lower() in ('remove', 'delete', 'drop'):
+                return LocalCommandRouter._remove_items(resume_state, section, items)
+            return LocalCommandRouter._add_items(resume_state, section, items)
+        
+        match = FIELD_PATTERN.match(command)
+        if match:
+            field = _FIELDS[match.group('field').split()[0].lower()]
+            return LocalCommandRouter._set_field(field, match.group('value'))
+        
+        return None
+    
+    @staticmethod
+    def _split_items(text: str) -> List[str]:
+        """'Python, SQL and "Go"' -> ['Python', 'SQL', 'Go']"""
+        items = []
+        for item in _ITEM_SEPARATOR.split(text):
+            item = item.strip().strip(_QUOTES).strip()
+            if item and item.lower() not in (existing.lower() for existing in items):
+                items.append(item)
+        return items
+    
+    @staticmethod
+    def _item_text(item: Any) -> str:
+        if isinstance(item, dict):
+            return str(item.get('name', item.get('skill', '')))
+        return str(item)
+    
+    @staticmethod
+    def _section_lists(content: Any) -> Optional[Dict[str, List]]:
+        """Copies of the lists in a list section ({'': [...]} for a plain list); None for other shapes"""
+        if content is None:
+            return {'': []}
+        if isinstance(content, list):
+            return {'': list(content)}
+        if isinstance(content, dict) and content and all(isinstance(value, list) for value in content.values()):
+            return {key: list(value) for key, value in content.items()}
+        return None
+    
+    @staticmethod
+    def _rebuild(lists: Dict[str, List]) -> Any:
+        return lists[''] if '' in lists else lists
+    
+    @staticmethod
+    def _add_items(resume_state: Dict, section: str, items: List[str]) -> Optional[Dict]:
+        lists = LocalCommandRouter._section_lists(resume_state.get(section))
+        if lists is None:
+            return None
+        existing = {LocalCommandRouter._item_text(item).lower() for values in lists.values() for item in values}
+        added = [item for item in items if item.lower() not in existing]
+        label = section.replace('_', ' ')
+        if not added:
+            return {
+                "section": section,
+                "updated_content": None,
+                "action": f"{', '.join(items)} already in {label}",
+                "explanation": "Nothing was changed.",
+                "change_type": "add"
+            }
+        # Categorised skills get new entries in their first (technical) list
+        target = '' if '' in lists else ('technical' if 'technical' in lists else next(iter(lists)))
+        lists[target].extend(added)
+        return {
+            "section": section,
+            "updated_content": LocalCommandRouter._rebuild(lists),
+            "action": f"Added {', '.join(added)} to {label}",
+            "explanation": f"Added {len(added)} item{'s' if len(added) != 1 else ''} to {label}; nothing else was changed.",
+            "change_type": "add"
+        }
+    
+    @staticmethod
+    def _remove_items(resume_state: Dict, section: str, items: List[str]) -> Optional[Dict]:
+        lists = LocalCommandRouter._section_lists(resume_state.get(section))
+        if lists is None:
+            return None
+        removed = []
+        for item in items:
+            needle = item.lower()
+            positions = [(key, index) for key, values in lists.items() for index, value in enumerate(values)
+                         if LocalCommandRouter._item_text(value).lower() == needle]
+            if not positions:
+                # "remove certification AWS" may name just part of the entry
+                positions = [(key, index) for key, values in lists.items() for index, value in enumerate(values)
+                             if needle in LocalCommandRouter._item_text(value).lower()]
+            if len(positions) != 1:
+                # Nothing or several entries match: let the model interpret it
+                return None
+            key, index = positions[0]
+            removed.append(LocalCommandRouter._item_text(lists[key].pop(index)))
+        label = section.replace('_', ' ')
+        return {
+            "section": section,
+            "updated_content": LocalCommandRouter._rebuild(lists),
+            "action": f"Removed {', '.join(removed)} from {label}",
+            "explanation": f"Removed {len(removed)} item{'s' if len(removed) != 1 else ''} from {label}; nothing else was changed.",
+            "change_type": "remove"
+        }
+    
+    @staticmethod
+    def _set_field(field: str, value: str) -> Optional[Dict]:
+        value = value.strip()
+        quoted = len(value) > 1 and value[0] in _QUOTES and value[-1] in _QUOTES
+        value = value.strip(_QUOTES).strip()
+        if not value:
+            return None
+        if field == 'email' and not EMAIL_PATTERN.fullmatch(value):
+            return None
+        if field == 'phone' and not PHONE_PATTERN.fullmatch(value):
+            return None
+        if field in ('name', 'target_role') and not quoted and (
+                len(value.split()) > MAX_LITERAL_WORDS or VAGUE_VALUE_PATTERN.search(value)):
+            # A description of the value, not the value itself
+            return None
+        label = field.replace('_', ' ')
+        return {
+            "section": field,
+            "updated_content": value,
+            "action": f"Changed {label} to {value}",
+            "explanation": f"Updated the {label}.",
+            "change_type": "modify"
+        }
@@ -0,0 +1,380 @@
+"""
+Local Extractor Module
+Deterministic, rule-based resume extraction used before falling back to the LLM
+"""
+
+from typing import Dict, List, Optional, Tuple
+import re
+
+EMAIL_PATTERN = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+PHONE_PATTERN = re.compile(r'\+?\(?\d[\d\s().-]{8,}\d')
+
+_MONTH = r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?'
+_DATE = rf'(?:{_MONTH}\s+)?(?:\d{{1,2}}/)?(?:19|20)\d{{2}}'
+DURATION_PATTERN = re.compile(
+    rf'({_DATE}\s*(?:-|–|—|to)\s*(?:{_DATE}|Present|Current|Now|Ongoing)|{_DATE})',
+    re.IGNORECASE
+)
+YEAR_PATTERN = re.compile(r'(?:19|20)\d{2}')
+GPA_PATTERN = re.compile(r'(?:GPA|CGPA|CPI)\s*[:\-]?\s*(\d+(?:\.\d+)?(?:\s*/\s*\d+(?:\.\d+)?)?)', re.IGNORECASE)
+
+BULLET_PATTERN = re.compile(r'^\s*(?:[•●▪◦■►\-\*–]|o\s|\d+[.)]\s)\s*')
+
+DEGREE_PATTERN = re.compile(
+    r"\b(?:Bachelor|Master|Ph\.?D|Doctor|Associate|Diploma|MBA|B\.?\s?(?:S|A|E|Sc|Tech|Com)\b\.?|"
+    r"M\.?\s?(?:S|A|E|Sc|Tech|Com)\b\.?|High School|Secondary)",
+    re.IGNORECASE
+)
+INSTITUTION_PATTERN = re.compile(r'\b(?:University|College|Institute|School|Academy|Polytechnic)\b', re.IGNORECASE)
+
+# Prose rather than a "Title | Company | Dates" header: ends a sentence or starts with a pronoun
+SENTENCE_PATTERN = re.compile(r'(?:\b[a-z]+[.!?]$|^(?:I|We|My|Our)\b)')
+# Longest title or company name we take at face value
+HEADER_MAX_WORDS = 10
+_EDUCATION_SEPARATOR = re.compile(r'\s*[|,;]\s*|\s+[–—-]\s+')
+
+# Canonical field -> heading aliases (matched case-insensitively on their own line)
+SECTION_HEADINGS = {
+    "professional_summary": ["summary", "professional summary", "profile", "professional profile",
+                             "objective", "career objective", "about me", "about"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history", "internships", "internship"],
+    "education": ["education", "academic background", "academics", "education and training",
+                  "qualifications", "academic qualifications"],
+    "skills": ["skills", "technical skills", "core competencies", "key skills", "competencies",
+               "skills and tools", "tools and technologies", "technologies"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects", "selected projects"],
+    "certifications": ["certifications", "certificates", "licenses and certifications",
+                       "licenses & certifications", "courses and certifications"],
+    "languages": ["languages", "spoken languages", "language skills"],
+}
+
+_HEADING_LOOKUP = {alias: field for field, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+# Field weights for the overall confidence score
+_WEIGHTS = {
+    "name": 1.0, "email": 1.0, "phone": 0.5, "professional_summary": 1.0, "skills": 1.5,
+    "experience": 2.0, "education": 1.5, "projects": 1.0, "certifications": 0.5, "languages": 0.5,
+}
+
+
+class LocalResumeExtractor:
+    """Fill the extract_resume_info schema from headings and regexes, with confidences"""
+    
+    # Fields scoring below this are handed to the LLM
+    FIELD_THRESHOLD = 0.6
+    
+    @staticmethod
+    def extract(resume_text: str, target_role: str) -> Dict:
+        """
+        Extract structured resume data without calling the LLM
+        
+        Args:
+            resume_text: Plain resume text from ResumeParser
+            target_role: Target role to record in the result
+        
+        Returns:
+            {"data": <resume dict>, "confidence": 0-1,
+             "field_confidence": {field: 0-1}, "low_confidence_fields": [...]}
+        """
+        lines = [line.strip() for line in resume_text.splitlines()]
+        header_lines, sections, unknown_headings = LocalResumeExtractor._segment(lines)
+        
+        data = {
+            "name": "", "email": "", "phone": "", "target_role": target_role,
+            "professional_summary": "", "skills": [], "education": [], "experience": [],
+            "projects": [], "certifications": [], "languages": []
+        }
+        confidence = {}
+        
+        email_match = EMAIL_PATTERN.search(resume_text)
+        data["email"] = email_match.group(0) if email_match else ""
+        # The contact regexes are reliable, so a miss usually means the field is absent
+        confidence["email"] = 1.0 if email_match else 0.8
+        
+        phone = LocalResumeExtractor._find_phone(header_lines or lines[:15])
+        data["phone"] = phone
+        confidence["phone"] = 1.0 if phone else 0.8
+        
+        data["name"] = LocalResumeExtractor._find_name(header_lines or lines[:5])
+        confidence["name"] = 0.9 if data["name"] else 0.0
+        
+        # Missing sections are only trusted as "absent" when the resume has clear
+        # headings and every heading was recognised
+        if len(sections) < 2:
+            absent_confidence = 0.2
+        elif unknown_headings:
+            absent_confidence = 0.5
+        else:
+            absent_confidence = 0.9
+        
+        summary_lines = sections.get("professional_summary")
+        if summary_lines:
+            data["professional_summary"] = ' '.join(BULLET_PATTERN.sub('', line) for line in summary_lines)
+            confidence["professional_summary"] = 1.0
+        else:
+            confidence["professional_summary"] = absent_confidence
+        
+        for field, parser in (
+            ("skills", LocalResumeExtractor._parse_list),
+            ("certifications", LocalResumeExtractor._parse_lines),
+            ("languages", LocalResumeExtractor._parse_list),
+            ("experience", LocalResumeExtractor._parse_experience),
+            ("education", LocalResumeExtractor._parse_education),
+            ("projects", LocalResumeExtractor._parse_projects),
+        ):
+            section_lines = sections.get(field)
+            if section_lines is None:
+                confidence[field] = absent_confidence
+                continue
+            value, field_confidence = parser(section_lines)
+            data[field] = value
+            confidence[field] = field_confidence
+        
+        total_weight = sum(_WEIGHTS.values())
+        overall = sum(confidence[field] * weight for field, weight in _WEIGHTS.items()) / total_weight
+        
+        return {
+            "data": data,
+            "confidence": round(overall, 3),
+            "field_confidence": confidence,
+            "low_confidence_fields": [
+                field for field, value in confidence.items()
+                if value < LocalResumeExtractor.FIELD_THRESHOLD
+            ]
+        }
+    
+    @staticmethod
+    def _match_heading(line: str) -> Optional[str]:
+        cleaned = re.sub(r'[^a-z& ]', '', line.lower()).strip()
+        cleaned = re.sub(r'\s+', ' ', cleaned)
+        return _HEADING_LOOKUP.get(cleaned)
+    
+    @staticmethod
+    def _looks_like_heading(line: str) -> bool:
+        letters = re.sub(r'[^A-Za-z]', '', line)
+        return (4 <= len(letters) and len(line) <= 40 and line.upper() == line
+                and not re.search(r'\d', line) and not BULLET_PATTERN.match(line))
+    
+    @staticmethod
+    def _segment(lines: List[str]) -> Tuple[List[str], Dict[str, List[str]], List[str]]:
+        """Split lines into the pre-heading block and known sections"""
+        header_lines: List[str] = []
+        sections: Dict[str, List[str]] = {}
+        unknown_headings: List[str] = []
+        current = None
+        
+        for line in lines:
+            if not line:
+                continue
+            field = LocalResumeExtractor._match_heading(line) if len(line) <= 40 else None
+            if field:
+                current = field
+                sections.setdefault(field, [])
+                continue
+            if current and LocalResumeExtractor._looks_like_heading(line) and not DURATION_PATTERN.search(line):
+                # An all-caps line we don't recognise: content after it is unclassified
+                unknown_headings.append(line)
+                current = '_unknown'
+                continue
+            if current is None:
+                header_lines.append(line)
+            elif current != '_unknown':
+                sections[current].append(line)
+        
+        return header_lines, sections, unknown_headings
+    
+    @staticmethod
+    def _find_phone(lines: List[str]) -> str:
+        for line in lines:
+            for match in PHONE_PATTERN.finditer(line):
+                candidate = match.group(0).strip()
+                digits = re.sub(r'\D', '', candidate)
+                # Skip year ranges like "2019 2021" that look numeric
+                if 10 <= len(digits) <= 15 and not DURATION_PATTERN.fullmatch(candidate):
+                    return candidate
+        return ""
+    
+    @staticmethod
+    def _find_name(lines: List[str]) -> str:
+        for line in lines:
+            if EMAIL_PATTERN.search(line) or re.search(r'\d', line):
+                continue
+            candidate = re.split(r'\s[|,–-]\s', line)[0].strip()
+            words = candidate.split()
+            if 2 <= len(words) <= 4 and all(re.fullmatch(r"[A-Za-z][A-Za-z.'-]*", word) for word in words):
+                return candidate.title() if candidate.isupper() else candidate
+        return ""
+    
+    @staticmethod
+    def _split_items(text: str) -> List[str]:
+        return [item.strip(' .') for item in re.split(r'[,;|•·]', text) if item.strip(' .')]
+    
+    @staticmethod
+    def _parse_list(lines: List[str]) -> Tuple[List[str], float]:
+        """Comma/bullet separated items, dropping "Category:" prefixes"""
+        items = []
+        for line in lines:
+            line = BULLET_PATTERN.sub('', line)
+            if ':' in line:
+                line = line.split(':', 1)[1]
+            for item in LocalResumeExtractor._split_items(line):
+                if item not in items and len(item) <= 60:
+                    items.append(item)
+        return items, 1.0 if items else 0.3
+    
+    @staticmethod
+    def _parse_lines(lines: List[str]) -> Tuple[List[str], float]:
+        """One item per line (certifications)"""
+        items = [BULLET_PATTERN.sub('', line).strip() for line in lines]
+        items = [item for item in items if item]
+        return items, 1.0 if items else 0.3
+    
+    @staticmethod
+    def _entries(lines: List[str]) -> List[Tuple[List[str], List[str]]]:
+        """Group lines into (header lines, bullet lines) entries"""
+        entries = []
+        for line in lines:
+            if BULLET_PATTERN.match(line):
+                if not entries:
+                    entries.append(([], []))
+                entries[-1][1].append(BULLET_PATTERN.sub('', line).strip())
+            elif entries and not entries[-1][1] and len(entries[-1][0]) < 3:
+                entries[-1][0].append(line)
+            elif entries and entries[-1][1] and not DURATION_PATTERN.search(line) and len(line) > 60:
+                # Wrapped continuation of the previous bullet
+                entries[-1][1][-1] += ' ' + line
+            else:
+                entries.append(([line], []))
+        return entries
+    
+    @staticmethod
+    def _split_title_company(text: str) -> Tuple[str, str]:
+        for separator in (r'\s+\|\s+', r'\s+at\s+', r'\s+@\s+', r'\s+[–—-]\s+', r',\s+'):
+            parts = re.split(separator, text, maxsplit=1)
+            if len(parts) == 2 and parts[0] and parts[1]:
+                return parts[0].strip(), parts[1].strip()
+        return text.strip(), ""
+    
+    @staticmethod
+    def _reads_as_sentence(text: str) -> bool:
+        return len(text.split()) > HEADER_MAX_WORDS or bool(SENTENCE_PATTERN.search(text.strip()))
+    
+    @staticmethod
+    def _parse_experience(lines: List[str]) -> Tuple[List[Dict], float]:
+        experience = []
+        scores = []
+        for header, bullets in LocalResumeExtractor._entries(lines):
+            header_text = ' | '.join(header)
+            duration_match = DURATION_PATTERN.search(header_text)
+            duration = duration_match.group(0).strip() if duration_match else ""
+            remainder = DURATION_PATTERN.sub('', header_text) if duration else header_text
+            remainder = re.sub(r'(\s*\|\s*)+', ' | ', remainder).strip(' |,–-')
+            title, company = LocalResumeExtractor._split_title_company(remainder)
+            if not title and not bullets:
+                continue
+            experience.append({
+                "title": title,
+                "company": company,
+                "duration": duration,
+                "responsibilities": bullets
+            })
+            if LocalResumeExtractor._reads_as_sentence(title) or LocalResumeExtractor._reads_as_sentence(company):
+                # Prose split at an arbitrary separator, not a job header
+                scores.append(0.0)
+            elif not duration and (not company or not bullets):
+                # Without dates only bullets show these lines are a job; joined
+                # lines split at " | " are not a title/company pair by themselves
+                scores.append(0.0)
+            else:
+                scores.append((bool(title) + bool(company) + bool(duration) + bool(bullets)) / 4)
+        
+        if not experience:
+            return [], 0.3
+        return experience, sum(scores) / len(scores)
+    
+    @staticmethod
+    def _parse_education(lines: List[str]) -> Tuple[List[Dict], float]:
+        education = []
+        scores = []
+        for header, bullets in LocalResumeExtractor._entries(lines):
+            text = ' | '.join(header + bullets)
+            degree_line = next((line for line in header + bullets if DEGREE_PATTERN.search(line)), "")
+            institution_line = next((line for line in header + bullets if INSTITUTION_PATTERN.search(line)), "")
+            if degree_line and degree_line == institution_line:
+                degree, institution = LocalResumeExtractor._split_title_company(
+                    LocalResumeExtractor._education_text(degree_line)
+                )
+                if not INSTITUTION_PATTERN.search(institution) and INSTITUTION_PATTERN.search(degree):
+                    degree, institution = institution, degree
+            else:
+                degree = LocalResumeExtractor._education_text(degree_line)
+                institution = institution_line
+            institution = LocalResumeExtractor._education_text(institution, drop_degree=True)
+            years = YEAR_PATTERN.findall(text)
+            gpa_match = GPA_PATTERN.search(text)
+            if not degree and not institution:
+                continue
+            education.append({
+                "degree": degree,
+                "institution": institution,
+                "year": years[-1] if years else "",
+                "gpa": gpa_match.group(1) if gpa_match else ""
+            })
+            scores.append((bool(degree) + bool(institution) + bool(years)) / 3)
+        
+        if not education:
+            return [], 0.3
+        return education, sum(scores) / len(scores)
+    
+    @staticmethod
+    def _education_text(line: str, drop_degree: bool = False) -> str:
+        """
+        An education line without its dates and GPA
+        
+        With drop_degree, parts naming a degree are removed as well, so
+        "B.S. Computer Science, Stanford University, GPA: 3.8" leaves just
+        the institution.
+        """
+        parts = []
+        for part in _EDUCATION_SEPARATOR.split(DURATION_PATTERN.sub('', line)):
+            part = GPA_PATTERN.sub('', part).strip(' |,–-:')
+            if not part:
+                continue
+            # Two capitals are a state ("Boston, MA"), not a degree
+            if (drop_degree and DEGREE_PATTERN.search(part) and not INSTITUTION_PATTERN.search(part)
+                    and not re.fullmatch(r'[A-Z]{2}', part)):
+                continue
+            parts.append(part)
+        return ', '.join(parts)
+    
+    @staticmethod
+    def _parse_projects(lines: List[str]) -> Tuple[List[Dict], float]:
+        projects = []
+        for header, bullets in LocalResumeExtractor._entries(lines):
+            name = header[0] if header else ""
+            technologies = []
+            description_lines = header[1:]
+            if ' | ' in name:
+                name, tech_text = name.split(' | ', 1)
+                technologies = LocalResumeExtractor._split_items(tech_text)
+            achievements = []
+            for bullet in bullets:
+                tech_match = re.match(r'(?:Technologies|Tech Stack|Tools|Built with)\s*:\s*(.+)', bullet, re.IGNORECASE)
+                if tech_match:
+                    technologies.extend(LocalResumeExtractor._split_items(tech_match.group(1)))
+                else:
+                    achievements.append(bullet)
+            if not name and not achievements:
+                continue
+            projects.append({
+                "name": DURATION_PATTERN.sub('', name).strip(' |,–-'),
+                "description": ' '.join(description_lines),
+                "technologies": technologies,
+                "achievements": achievements
+            })
+        
+        if not projects:
+            return [], 0.3
+        named = sum(1 for project in projects if project["name"])
+        return projects, 0.5 + 0.5 * named / len(projects)
@@ -0,0 +1,566 @@
+"""
+Mock LLM Module
+Local stand-in for the Groq/OpenAI chat-completions API, for offline runs and load tests
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import itertools
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from .text_compactor import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Groq's client posts to {GROQ_BASE_URL}/openai/v1/chat/completions, OpenAI's
+# to {base_url}/chat/completions; any path with this suffix is accepted
+COMPLETIONS_SUFFIX = "/chat/completions"
+DEFAULT_UPSTREAM = "https://api.groq.com/openai/v1"
+
+# Command words that pick the section a mock edit answers for. The mock keeps
+# its own table so it does not import the agent it is used to exercise.
+_EDIT_SECTIONS = {
+    'professional_summary': ('summary', 'objective', 'profile'),
+    'skills': ('skill',),
+    'experience': ('experience', 'job', 'work', 'role'),
+    'projects': ('project',),
+    'education': ('education', 'degree'),
+    'certifications': ('certif',),
+}
+
+
+class LatencyModel:
+    """
+    Delay before a mock response, drawn from a distribution
+    
+    Specs (seconds):
+        fixed:0.5          always 0.5
+        uniform:0.2,1.5    uniform between 0.2 and 1.5
+        normal:0.8,0.2     mean 0.8, standard deviation 0.2 (floored at 0)
+        lognormal:0.8,0.5  median 0.8, sigma 0.5 (long right tail, like real APIs)
+        replay             the latency recorded with each replayed response
+    """
+    
+    KINDS = ('fixed', 'uniform', 'normal', 'lognormal', 'replay')
+    
+    def __init__(self, kind: str = 'fixed', a: float = 0.0, b: float = 0.0, rng: Optional[random.Random] = None):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution '{kind}' (use one of {', '.join(self.KINDS)})")
+        self.kind = kind
+        self.a = a
+        self.b = b
+        self.rng = rng or random.Random()
+    
+    @classmethod
+    def from_spec(cls, spec: str, rng: Optional[random.Random] = None) -> 'LatencyModel':
+        """Build from a spec such as 'lognormal:0.8,0.5' (see class docstring)"""
+        kind, _, params = spec.partition(':')
+        values = [float(value) for value in params.split(',') if value.strip()]
+        values += [0.0] * (2 - len(values))
+        return cls(kind.strip(), values[0], values[1], rng)
+    
+    def sample(self, recorded: Optional[float] = None) -> float:
+        """
+        Args:
+            recorded: Latency stored with a replayed response, used by 'replay'
+        """
+        if self.kind == 'replay':
+            return recorded if recorded is not None else 0.0
+        if self.kind == 'uniform':
+            return self.rng.uniform(self.a, self.b)
+        if self.kind == 'normal':
+            return max(0.0, self.rng.gauss(self.a, self.b))
+        if self.kind == 'lognormal':
+            return self.rng.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+        return self.a
+
+
+class ReplayStore:
+    """
+    Recorded completions, looked up by the messages of the request
+    
+    The store is a JSONL file of {"key", "model", "content", "latency",
+    "usage"} records. The model is not part of the key, so recordings still
+    replay after a route change. Several records with the same key are
+    returned in turn.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._records: Dict[str, List[Dict]] = {}
+        self._cycles: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        if path:
+            self.load(path)
+    
+    @staticmethod
+    def make_key(messages: List[Dict]) -> str:
+        payload = json.dumps(messages, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def load(self, path: str):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning("Skipping malformed line %d of %s", line_number, path)
+                        continue
+                    self._records.setdefault(record["key"], []).append(record)
+        except FileNotFoundError:
+            pass
+    
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._records.values())
+    
+    def lookup(self, messages: List[Dict]) -> Optional[Dict]:
+        key = self.make_key(messages)
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                return None
+            cycle = self._cycles.setdefault(key, itertools.cycle(records))
+            return next(cycle)
+    
+    def record(self, messages: List[Dict], model: str, content: str, latency: float, usage: Optional[Dict] = None):
+        """Add a completion and append it to the file"""
+        record = {
+            "key": self.make_key(messages), "model": model, "content": content,
+            "latency": round(latency, 3), "usage": usage
+        }
+        with self._lock:
+            self._records.setdefault(record["key"], []).append(record)
+            self._cycles.pop(record["key"], None)
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record) + "\n")
+
+
+class MockLLMServer:
+    """
+    HTTP server that answers chat completions like Groq does
+    
+    Each request is answered, in order of preference, from the replay store,
+    from the upstream API (when recording), or with a synthetic answer of the
+    right shape for the app's prompts (see synthetic_completion). Latency,
+    generation speed, max_tokens truncation, streaming, 429s with
+    retry-after and 5xx errors are all simulated, so AIHelper's cache,
+    budgeting, retries and rate limiting run exactly as against the real API.
+    
+    Point the app at it with GROQ_BASE_URL=<server.base_url> (any API key).
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, store: Optional[ReplayStore] = None,
+                 latency: Optional[LatencyModel] = None, tokens_per_second: Optional[float] = None,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, seed: Optional[int] = None,
+                 upstream: Optional[str] = None):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one; see base_url)
+            store: Recorded responses to replay (and to record into)
+            latency: Delay before the first token (default: none)
+            tokens_per_second: Generation speed added on top of latency
+                (None = instant)
+            error_rate: Share of requests answered with a 500/503
+            rate_limit_rate: Share of requests answered with a 429
+            seed: Seed for latency and error sampling, for repeatable runs
+            upstream: Base URL of a real API. Requests missing from the
+                store are forwarded there and recorded.
+        """
+        self.rng = random.Random(seed)
+        self.store = store if store is not None else ReplayStore()
+        self.latency = latency or LatencyModel()
+        self.latency.rng = self.rng
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.upstream = upstream.rstrip('/') if upstream else None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "replayed": 0, "recorded": 0, "synthetic": 0,
+                      "errors": 0, "rate_limited": 0, "truncated": 0, "streamed": 0}
+        
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> 'MockLLMServer':
+        """Serve from a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-llm", daemon=True)
+        self._thread.start()
+        return self
+    
+    def serve_forever(self):
+        self.httpd.serve_forever()
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def __enter__(self) -> 'MockLLMServer':
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+    
+    def injected_error(self) -> Optional[Tuple[int, Dict, Dict[str, str]]]:
+        """(status, body, headers) of a simulated failure, or None"""
+        with self._lock:
+            draw = self.rng.random()
+        if draw < self.rate_limit_rate:
+            self._count("rate_limited")
+            retry_after = f"{self.rng.uniform(0.2, 2.0):.2f}"
+            return 429, _error_body("Rate limit reached (mock)", "rate_limit_exceeded"), {
+                "retry-after": retry_after, "x-ratelimit-remaining-requests": "0",
+                "x-ratelimit-reset-requests": f"{retry_after}s"
+            }
+        if draw < self.rate_limit_rate + self.error_rate:
+            self._count("errors")
+            status = self.rng.choice((500, 503))
+            return status, _error_body("Internal server error (mock)", "internal_server_error"), {}
+        return None
+    
+    def answer(self, request: Dict, authorization: Optional[str]) -> Tuple[str, float, Optional[float]]:
+        """(content, delay before answering, recorded latency) for a request"""
+        messages = request.get("messages") or []
+        record = self.store.lookup(messages)
+        if record is not None:
+            self._count("replayed")
+            latency = record.get("latency")
+            return record["content"], self.latency.sample(latency), latency
+        
+        if self.upstream:
+            started = time.monotonic()
+            content, usage = self._forward(request, authorization)
+            latency = time.monotonic() - started
+            self.store.record(messages, request.get("model", ""), content, latency, usage)
+            self._count("recorded")
+            return content, 0.0, latency
+        
+        self._count("synthetic")
+        return synthetic_completion(messages), self.latency.sample(), None
+    
+    def _forward(self, request: Dict, authorization: Optional[str]) -> Tuple[str, Optional[Dict]]:
+        """Non-streaming call to the upstream API"""
+        payload = dict(request)
+        payload.pop("stream", None)
+        upstream_request = urllib.request.Request(
+            self.upstream + COMPLETIONS_SUFFIX, data=json.dumps(payload).encode('utf-8'),
+            headers={"Content-Type": "application/json", "Authorization": authorization or ""}
+        )
+        with urllib.request.urlopen(upstream_request, timeout=120) as response:
+            body = json.loads(response.read().decode('utf-8'))
+        return body["choices"][0]["message"]["content"], body.get("usage")
+    
+    def generation_time(self, tokens: int) -> float:
+        return tokens / self.tokens_per_second if self.tokens_per_second else 0.0
+    
+    def next_id(self) -> str:
+        return f"chatcmpl-mock-{next(self._ids)}"
+
+
+def _error_body(message: str, code: str) -> Dict:
+    return {"error": {"message": message, "type": "mock_error", "code": code}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+    
+    def do_GET(self):
+        if self.path.rstrip('/').endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+        else:
+            self._send_json(404, _error_body("Not found", "not_found"))
+    
+    def do_POST(self):
+        mock: MockLLMServer = self.server.mock
+        if not self.path.rstrip('/').endswith(COMPLETIONS_SUFFIX):
+            self._send_json(404, _error_body("Not found", "not_found"))
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, json.JSONDecodeError):
+            self._send_json(400, _error_body("Request body is not valid JSON", "invalid_request"))
+            return
+        mock._count("requests")
+        
+        failure = mock.injected_error()
+        if failure is not None:
+            status, body, headers = failure
+            self._send_json(status, body, headers)
+            return
+        
+        try:
+            content, delay, _ = mock.answer(request, self.headers.get('Authorization'))
+        except (urllib.error.URLError, KeyError, ValueError) as e:
+            self._send_json(502, _error_body(f"Upstream request failed: {e}", "upstream_error"))
+            return
+        
+        content, finish_reason = self._limit(content, request.get("max_tokens"))
+        prompt_tokens = sum(estimate_tokens(str(m.get("content", ""))) for m in request.get("messages") or [])
+        completion_tokens = estimate_tokens(content)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+        time.sleep(delay)
+        
+        if request.get("stream"):
+            mock._count("streamed")
+            self._stream(request, content, finish_reason, usage)
+            return
+        time.sleep(mock.generation_time(completion_tokens))
+        self._send_json(200, {
+            "id": mock.next_id(),
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason,
+                "logprobs": None
+            }],
+            "usage": usage
+        })
+    
+    def _limit(self, content: str, max_tokens: Optional[int]) -> Tuple[str, str]:
+        """Cut the answer off at max_tokens like the real API does"""
+        if max_tokens and estimate_tokens(content) > max_tokens:
+            self.server.mock._count("truncated")
+            return content[:max_tokens * 4], "length"
+        return content, "stop"
+    
+    def _stream(self, request: Dict, content: str, finish_reason: str, usage: Dict):
+        mock: MockLLMServer = self.server.mock
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        
+        completion_id = mock.next_id()
+        chunk_chars = 16  # about four tokens per event
+        pieces = [content[i:i + chunk_chars] for i in range(0, len(content), chunk_chars)]
+        try:
+            for piece in pieces:
+                time.sleep(mock.generation_time(estimate_tokens(piece)))
+                self._event(completion_id, request, {"content": piece}, None)
+            self._event(completion_id, request, {}, finish_reason, usage)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up mid-stream
+    
+    def _event(self, completion_id: str, request: Dict, delta: Dict, finish_reason: Optional[str],
+               usage: Optional[Dict] = None):
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        }
+        if usage:
+            # Groq reports a stream's usage on its last chunk
+            chunk["x_groq"] = {"usage": usage}
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+        self.wfile.flush()
+    
+    def _send_json(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+# Synthetic answers: deterministic, schema-shaped stand-ins for the app's prompts
+
+_SAMPLE_RESUME = {
+    "name": "Alex Morgan",
+    "email": "alex.morgan@example.com",
+    "phone": "+1 555 010 0199",
+    "professional_summary": "Software engineer with 6 years of experience building data-heavy web services. "
+                            "Led migrations that cut infrastructure cost by 30% and improved p95 latency by 45%.",
+    "skills": ["Python", "SQL", "AWS", "Docker", "Kubernetes", "PostgreSQL", "React", "CI/CD"],
+    "experience": [{
+        "title": "Senior Software Engineer",
+        "company": "Example Corp",
+        "duration": "Jan 2021 - Present",
+        "responsibilities": [
+            "Led a team of 4 engineers delivering a billing platform processing $2M per month",
+            "Reduced API p95 latency by 45% through caching and query optimization"
+        ]
+    }],
+    "education": [{"degree": "B.S. Computer Science", "institution": "State University", "year": "2018", "gpa": ""}],
+    "projects": [{
+        "name": "Resume Analyzer",
+        "description": "Tool that scores resumes against job descriptions",
+        "technologies": ["Python", "FastAPI"],
+        "achievements": ["Used by 500+ students"]
+    }],
+    "certifications": ["AWS Certified Developer"],
+    "languages": ["English"]
+}
+
+_SAMPLE_SUGGESTIONS = [
+    "Add quantifiable metrics to each experience entry (e.g., 'Reduced costs by 20%')",
+    "Include more keywords from the job description in your skills section",
+    "Shorten the professional summary to 2-3 focused sentences",
+    "Start every bullet point with a strong action verb",
+    "List certifications relevant to the target role"
+]
+
+
+def _section_after(prompt: str, heading: str) -> Optional[Any]:
+    """JSON that follows a heading such as 'Current Resume State:' in a prompt"""
+    start = prompt.find(heading)
+    if start < 0:
+        return None
+    try:
+        value, _ = json.JSONDecoder().raw_decode(prompt[start + len(heading):].lstrip())
+        return value
+    except ValueError:
+        return None
+
+
+def _mock_edit(prompt: str) -> Dict:
+    """Apply 'add X to <section>' commands; other commands return the section unchanged"""
+    state = _section_after(prompt, "Current Resume State:") or {}
+    match = re.search(r'User Command:\s*(.*)', prompt)
+    command = match.group(1).strip() if match else ""
+    lowered = command.lower()
+    section = next((name for name, keywords in _EDIT_SECTIONS.items()
+                    if any(keyword in lowered for keyword in keywords)), 'professional_summary')
+    content = state.get(section, [] if section != 'professional_summary' else "")
+    
+    added = re.match(r'add\s+(.+?)\s+to\b', command, re.IGNORECASE)
+    if added and isinstance(content, list):
+        content = content + [added.group(1)]
+        action = f"Added {added.group(1)} to {section}"
+    else:
+        action = f"Reviewed {section}"
+    return {"section": section, "action": action, "updated_content": content,
+            "explanation": f"{action} (mock response).", "change_type": "add" if added else "modify"}
+
+
+def _mock_patch(prompt: str) -> Dict:
+    """JSON Patch answer to a single-section edit prompt"""
+    match = re.search(r'User Command:\s*(.*)', prompt)
+    command = match.group(1).strip() if match else ""
+    added = re.match(r'add\s+(.+?)\s+to\b', command, re.IGNORECASE)
+    patch = [{"op": "add", "path": "/-", "value": added.group(1)}] if added else []
+    action = f"Added {added.group(1)}" if added else "No change needed"
+    return {"action": action, "patch": patch, "explanation": f"{action} (mock response).",
+            "change_type": "add" if added else "modify"}
+
+
+def _mock_score() -> Dict:
+    categories = ("content", "format", "optimization", "best_practices", "application_ready")
+    return {
+        "category_scores": dict(zip(categories, (78, 85, 70, 80, 75))),
+        "breakdown": {
+            "keyword_match": {"score": 21, "max": 30},
+            "skills_alignment": {"score": 19, "max": 25},
+            "experience_relevance": {"score": 15, "max": 20},
+            "formatting": {"score": 13, "max": 15},
+            "completeness": {"score": 8, "max": 10}
+        },
+        "strengths": ["Quantified achievements", "Clear section structure", "Relevant technical skills"],
+        "improvements": {
+            "content": [],
+            "format": [],
+            "optimization": [{
+                "severity": "warning", "message": "Missing job description keywords",
+                "detail": "Several keywords from the posting do not appear in the resume.", "section": "skills"
+            }],
+            "best_practices": [],
+            "application_ready": []
+        },
+        "missing_keywords": ["Terraform", "GraphQL"],
+        "summary": "Solid, ATS-friendly resume (mock analysis). Add the missing keywords to improve the match."
+    }
+
+
+def _mock_generation(prompt: str) -> Dict:
+    user_data = _section_after(prompt, "User Information:") or {}
+    skills = user_data.get("skills") or _SAMPLE_RESUME["skills"]
+    return {
+        "professional_summary": user_data.get("professional_summary") or _SAMPLE_RESUME["professional_summary"],
+        "skills": {"technical": skills if isinstance(skills, list) else _SAMPLE_RESUME["skills"],
+                   "soft": ["Communication", "Leadership"]},
+        "experience": [
+            {"title": entry.get("title", ""), "company": entry.get("company", ""),
+             "duration": entry.get("duration", ""),
+             "achievements": entry.get("responsibilities") or entry.get("achievements") or []}
+            for entry in user_data.get("experience") or _SAMPLE_RESUME["experience"]
+            if isinstance(entry, dict)
+        ],
+        "education": user_data.get("education") or _SAMPLE_RESUME["education"],
+        "projects": user_data.get("projects") or _SAMPLE_RESUME["projects"],
+        "certifications": user_data.get("certifications") or [],
+        "keywords": skills[:5] if isinstance(skills, list) else []
+    }
+
+
+def synthetic_completion(messages: List[Dict]) -> str:
+    """
+    Plausible answer to one of the app's prompts, recognised by its wording
+    
+    Extraction, generation, scoring, edit, patch and suggestion prompts get JSON of
+    the shape their schemas expect; field-fix follow-ups get an empty object
+    and anything else a short text reply.
+    """
+    prompt = str(messages[-1].get("content", "")) if messages else ""
+    if "Your previous answer to the request above had these problems" in prompt:
+        answer: Any = {}
+    elif "expert resume parser" in prompt:
+        answer = _SAMPLE_RESUME
+    elif "expert resume writer" in prompt:
+        answer = _mock_generation(prompt)
+    elif "ATS (Applicant Tracking System) expert" in prompt:
+        answer = _mock_score()
+    elif "JSON Patch (RFC 6902)" in prompt:
+        answer = _mock_patch(prompt)
+    elif "resume editing assistant" in prompt:
+        answer = _mock_edit(prompt)
+    elif "suggestions" in prompt and "JSON array" in prompt:
+        answer = _SAMPLE_SUGGESTIONS
+    else:
+        return "SUCCESS"
+    return json.dumps(answer, indent=2)
@@ -0,0 +1,153 @@
+"""
+Model Router Module
+Per-task choice of model, temperature and max_tokens, with per-route stats
+"""
+
+from typing import Dict, NamedTuple, Optional
+import json
+import os
+import threading
+
+DEFAULT_MODEL = "llama-3.1-8b-instant"
+ESCALATION_MODEL = "llama-3.3-70b-versatile"
+
+
+class Route(NamedTuple):
+    """How one kind of request is sent"""
+    model: str
+    temperature: float
+    max_tokens: int
+    escalate_to: Optional[str] = None  # retried on this model if the JSON does not parse
+    json_mode: bool = False  # request response_format json_object (answers must be objects)
+
+
+DEFAULT_ROUTES = {
+    "extract": Route(DEFAULT_MODEL, 0.2, 2500, ESCALATION_MODEL, json_mode=True),
+    "generate": Route(DEFAULT_MODEL, 0.5, 2500, ESCALATION_MODEL, json_mode=True),
+    "score": Route(DEFAULT_MODEL, 0.3, 1800, ESCALATION_MODEL, json_mode=True),
+    "edit": Route(DEFAULT_MODEL, 0.2, 2000, ESCALATION_MODEL, json_mode=True),
+    "patch": Route(DEFAULT_MODEL, 0.2, 1200, ESCALATION_MODEL, json_mode=True),
+    "suggest": Route(DEFAULT_MODEL, 0.5, 600),  # answers with a bare JSON array
+}
+
+# Accepted value types per Route field (bool is excluded from the numbers)
+_FIELD_TYPES = {
+    "model": (str,),
+    "temperature": (int, float),
+    "max_tokens": (int,),
+    "escalate_to": (str, type(None)),
+    "json_mode": (bool,),
+}
+
+
+class ModelRouter:
+    """
+    Routing table for AIHelper tasks (extract, generate, score, edit, patch, suggest)
+    
+    Every route starts from DEFAULT_ROUTES and can be overridden field by
+    field, so a deployment can e.g. keep small edits on the 8B model and send
+    extraction to a larger one. Latency and token usage are recorded per route.
+    """
+    
+    def __init__(self, routes: Optional[Dict[str, Dict]] = None, default_model: str = DEFAULT_MODEL):
+        """
+        Args:
+            routes: Overrides per task, e.g. {"edit": {"max_tokens": 800}}.
+                Keys are Route fields; unknown tasks are added. Unknown
+                fields and values of the wrong type are logged and ignored.
+            default_model: Model for tasks without a route and for the
+                built-in routes that default to the 8B model
+        """
+        self.default_model = default_model
+        # Built-in routes on the small model follow default_model
+        self.routes = {
+            task: route._replace(model=default_model) if route.model == DEFAULT_MODEL else route
+            for task, route in DEFAULT_ROUTES.items()
+        }
+        for task, override in (routes or {}).items():
+            override = self._valid_override(task, override)
+            if override:
+                self.routes[task] = self.routes.get(task, self._fallback_route())._replace(**override)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict] = {}
+    
+    @staticmethod
+    def _valid_override(task: str, override) -> Dict:
+        """Keep the override fields that name a Route field and have its type; log the rest"""
+        if not isinstance(override, dict):
+            print(f"Ignoring route override for {task}: expected an object, got {type(override).__name__}")
+            return {}
+        valid = {}
+        for field, value in override.items():
+            types = _FIELD_TYPES.get(field)
+            if types is None:
+                print(f"Ignoring unknown route field {task}.{field}")
+            elif isinstance(value, bool) != (bool in types) or not isinstance(value, types):
+                print(f"Ignoring route field {task}.{field}: invalid value {value!r}")
+            elif field == "max_tokens" and value <= 0:
+                print(f"Ignoring route field {task}.{field}: invalid value {value!r}")
+            else:
+                valid[field] = value
+        return valid
+    
+    def _fallback_route(self) -> Route:
+        return Route(self.default_model, 0.3, 1024)
+    
+    def route(self, task: Optional[str]) -> Route:
+        return self.routes.get(task) or self._fallback_route()
+    
+    def _entry(self, task: Optional[str]) -> Dict:
+        return self._stats.setdefault(task or "default", {
+            "calls": 0, "escalations": 0, "latency_total": 0.0,
+            "prompt_tokens": 0, "completion_tokens": 0, "models": {}
+        })
+    
+    def record(self, task: Optional[str], model: str, latency: float,
+               prompt_tokens: Optional[int], completion_tokens: Optional[int]):
+        """Record one upstream call (cache hits are not calls)"""
+        with self._lock:
+            entry = self._entry(task)
+            entry["calls"] += 1
+            entry["latency_total"] += latency
+            entry["prompt_tokens"] += prompt_tokens or 0
+            entry["completion_tokens"] += completion_tokens or 0
+            entry["models"][model] = entry["models"].get(model, 0) + 1
+    
+    def record_escalation(self, task: Optional[str]):
+        with self._lock:
+            self._entry(task)["escalations"] += 1
+    
+    def stats(self) -> Dict[str, Dict]:
+        """Per-route calls, escalations, average latency and token totals"""
+        with self._lock:
+            return {
+                task: {
+                    "calls": entry["calls"],
+                    "escalations": entry["escalations"],
+                    "avg_latency": round(entry["latency_total"] / entry["calls"], 3) if entry["calls"] else 0.0,
+                    "prompt_tokens": entry["prompt_tokens"],
+                    "completion_tokens": entry["completion_tokens"],
+                    "models": dict(entry["models"])
+                }
+                for task, entry in self._stats.items()
+            }
+
+
+def create_model_router_from_env() -> ModelRouter:
+    """
+    Build the router from LLM_DEFAULT_MODEL and LLM_ROUTES
+    
+    LLM_ROUTES is a JSON object of per-task overrides, e.g.
+    {"extract": {"model": "llama-3.3-70b-versatile"}, "edit": {"max_tokens": 800}}
+    """
+    routes = {}
+    raw = os.getenv('LLM_ROUTES', '').strip()
+    if raw:
+        try:
+            routes = json.loads(raw)
+        except json.JSONDecodeError as e:
+            print(f"Ignoring invalid LLM_ROUTES: {e}")
+    if not isinstance(routes, dict):
+        print("Ignoring invalid LLM_ROUTES: expected a JSON object")
+        routes = {}
+    return ModelRouter(routes, os.getenv('LLM_DEFAULT_MODEL', DEFAULT_MODEL))
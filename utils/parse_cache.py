@@ -0,0 +1,162 @@
+"""
+Parse Cache Module
+Content-addressed cache for extracted resume text
+"""
+
+from collections import OrderedDict
+from typing import Optional
+import hashlib
+import os
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ParseCache:
+    """
+    Two-tier cache for parsed resume text keyed by file content hash.
+
+    The memory tier is an LRU bounded by entry count. The optional disk tier
+    stores one UTF-8 text file per key and evicts the least recently used
+    files once the directory grows beyond ``max_disk_bytes``.
+    """
+
+    def __init__(self, max_entries: int = 128, disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = 50 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(data: bytes, version: str) -> str:
+        """Build a cache key from the raw file bytes and the parser version"""
+        digest = hashlib.sha256()
+        digest.update(version.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached text for key, promoting disk hits into memory"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        text = self._disk_get(key)
+        if text is not None:
+            self._memory_put(key, text)
+            with self._lock:
+                self.hits += 1
+            return text
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, text: str):
+        """Store text in both tiers"""
+        self._memory_put(key, text)
+        self._disk_put(key, text)
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._memory.clear()
+        if self.disk_dir and os.path.isdir(self.disk_dir):
+            for filename in os.listdir(self.disk_dir):
+                if filename.endswith('.txt'):
+                    try:
+                        os.remove(os.path.join(self.disk_dir, filename))
+                    except OSError:
+                        pass
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current memory size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory)
+            }
+
+    def _memory_put(self, key: str, text: str):
+        with self._lock:
+            self._memory[key] = text
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.txt")
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            # Touch the file so eviction sees it as recently used
+            os.utime(path, None)
+            return text
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Parse cache read failed for {key[:12]}: {e}")
+            return None
+
+    def _disk_put(self, key: str, text: str):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Parse cache write failed for {key[:12]}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self._evict_disk()
+
+    def _evict_disk(self):
+        """Remove least recently used files until the tier fits its budget"""
+        entries = []
+        total = 0
+        for filename in os.listdir(self.disk_dir):
+            if not filename.endswith('.txt'):
+                continue
+            path = os.path.join(self.disk_dir, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_disk_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
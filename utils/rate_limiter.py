@@ -0,0 +1,301 @@
+"""
+Rate Limiter Module
+Client-side request/token budgets, retry backoff and request coalescing for the LLM API
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_UNIT_SECONDS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate-limit duration header into seconds
+    
+    Accepts plain seconds ("12", "0.5") and Groq's reset format
+    ("2m59.56s", "7.66s", "350ms").
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _UNIT_SECONDS[unit] for number, unit in parts)
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    try:
+        return int(float(headers.get(name)))
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_delay(attempt: int, headers: Optional[Mapping[str, str]] = None,
+                base: float = 1.0, cap: float = 30.0) -> float:
+    """
+    Seconds to wait before retry number attempt + 1
+    
+    Honors retry-after, or the reset time of an exhausted request/token
+    budget, when the server sends one. Otherwise uses exponential backoff
+    with jitter so concurrent clients do not retry in lockstep.
+    """
+    headers = headers or {}
+    hint = parse_duration(headers.get('retry-after'))
+    if hint is None and _header_int(headers, 'x-ratelimit-remaining-tokens') == 0:
+        hint = parse_duration(headers.get('x-ratelimit-reset-tokens'))
+    if hint is None and _header_int(headers, 'x-ratelimit-remaining-requests') == 0:
+        hint = parse_duration(headers.get('x-ratelimit-reset-requests'))
+    if hint is not None:
+        return min(hint, cap * 4) + random.uniform(0, base)
+    
+    backoff = min(cap, base * 2 ** attempt)
+    return backoff / 2 + random.uniform(0, backoff / 2)
+
+
+class TokenBucket:
+    """Thread-safe bucket refilled continuously to `per_minute` units per minute"""
+    
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / 60)
+        self.updated = now
+    
+    def reserve(self, amount: float) -> float:
+        """
+        Take amount from the bucket and return how long to wait before using it
+        
+        The level may go negative; later callers then queue behind the debt,
+        which keeps callers roughly first-come first-served without polling.
+        """
+        with self._lock:
+            self._refill()
+            self.level -= min(amount, self.capacity)
+            return max(0.0, -self.level * 60 / self.capacity)
+    
+    def refund(self, amount: float):
+        with self._lock:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+    
+    def set_remaining(self, remaining: float):
+        """Lower the level to what the server says is left"""
+        with self._lock:
+            self._refill()
+            self.level = min(self.level, float(remaining))
+    
+    def set_capacity(self, capacity: float):
+        with self._lock:
+            self._refill()
+            self.capacity = float(capacity)
+            self.level = min(self.level, self.capacity)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budget shared by all callers
+    
+    Callers reserve one request plus an estimate of the tokens they will use
+    (prompt + max_tokens) before each call, settle the estimate against the
+    real usage afterwards, and feed response headers back so the buckets track
+    the server's view of the limits.
+    """
+    
+    # Longest pause a retry-after / reset header can impose on every caller
+    MAX_PAUSE = float(os.getenv('LLM_MAX_PAUSE', '60'))
+    
+    def __init__(self, requests_per_minute: Optional[float] = 30, tokens_per_minute: Optional[float] = 6000):
+        """
+        Args:
+            requests_per_minute: Request budget (None or 0 = unlimited)
+            tokens_per_minute: Token budget (None or 0 = unlimited)
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "throttled_seconds": 0.0}
+    
+    def _reserve(self, tokens: int) -> float:
+        delay = 0.0
+        if self.requests is not None:
+            delay = max(delay, self.requests.reserve(1))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.reserve(tokens))
+        with self._lock:
+            delay = max(delay, self._blocked_until - time.monotonic())
+            self.stats["requests"] += 1
+            if delay > 0:
+                self.stats["throttled_seconds"] = round(self.stats["throttled_seconds"] + delay, 3)
+        return max(0.0, delay)
+    
+    def acquire(self, tokens: int):
+        """Block until one request and `tokens` tokens fit in the budget"""
+        delay = self._reserve(tokens)
+        if delay:
+            time.sleep(delay)
+    
+    async def aacquire(self, tokens: int):
+        """Awaitable acquire"""
+        delay = self._reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+    
+    def settle(self, reserved: int, used: Optional[int]):
+        """Give back the part of a token reservation that was not used"""
+        if self.tokens is not None and used is not None and used < reserved:
+            self.tokens.refund(reserved - used)
+    
+    def record_retry(self):
+        with self._lock:
+            self.stats["retries"] += 1
+    
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]):
+        """Sync the buckets with x-ratelimit-* and retry-after response headers"""
+        if not headers:
+            return
+        if self.tokens is not None:
+            limit = _header_int(headers, 'x-ratelimit-limit-tokens')
+            if limit:
+                self.tokens.set_capacity(limit)
+            remaining = _header_int(headers, 'x-ratelimit-remaining-tokens')
+            if remaining is not None:
+                self.tokens.set_remaining(remaining)
+        
+        # Pause every caller, not just the one that was told to back off
+        pause = parse_duration(headers.get('retry-after'))
+        if pause is None and _header_int(headers, 'x-ratelimit-remaining-requests') == 0:
+            pause = parse_duration(headers.get('x-ratelimit-reset-requests'))
+        if pause:
+            if pause > self.MAX_PAUSE:
+                # A bogus or day-long reset must not stall the whole app
+                print(f"Rate limit pause of {pause:.0f}s from response headers clamped to {self.MAX_PAUSE:.0f}s")
+                pause = self.MAX_PAUSE
+            with self._lock:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Let identical concurrent calls share the first caller's result"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.coalesced = 0
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn() unless a call with the same key is in flight; then wait for it"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            # Followers must not read a missing result as None after e.g. KeyboardInterrupt
+            call.error = e if isinstance(e, Exception) else RuntimeError(f"Coalesced call was interrupted: {e!r}")
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines running on one event loop"""
+    
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+    
+    async def do(self, key: str, fn: Callable[[], Awaitable]) -> Any:
+        """
+        Await fn() unless a call with the same key is in flight; then share its result
+        
+        If the leading call is cancelled, its followers are not: the next one
+        runs fn() itself.
+        """
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this caller was cancelled
+        
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+            if not future.done():
+                # Cancelled (CancelledError is not an Exception): release the followers
+                future.cancel()
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> RateLimiter:
+    """
+    Process-wide limiter, since the budget belongs to the API key
+    
+    LLM_REQUESTS_PER_MINUTE and LLM_TOKENS_PER_MINUTE set the starting
+    budgets (0 disables one); the token budget then follows the server's
+    x-ratelimit-limit-tokens header.
+    """
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(
+                float(os.getenv('LLM_REQUESTS_PER_MINUTE', '30')),
+                float(os.getenv('LLM_TOKENS_PER_MINUTE', '6000'))
+            )
+        return _shared_limiter
@@ -0,0 +1,182 @@
+"""
+Response Cache Module
+Pluggable caches for LLM completions keyed by a prompt fingerprint
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache(ABC):
+    """Base class: stores completion text by fingerprint and counts hits/misses"""
+    
+    def __init__(self, ttl: Optional[float] = 3600):
+        """
+        Args:
+            ttl: Seconds an entry stays valid (None = forever)
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: float, max_tokens: int, json_mode: bool = False) -> str:
+        """Fingerprint every request parameter that can change the completion"""
+        params = {"model": model, "prompt": prompt, "temperature": temperature, "max_tokens": max_tokens}
+        if json_mode:
+            params["json_mode"] = True
+        payload = json.dumps(params, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    def set(self, key: str, value: str):
+        self._set(key, value)
+    
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+    
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+    
+    @abstractmethod
+    def _get(self, key: str) -> Optional[str]:
+        """Stored value for key, or None if it is missing or expired"""
+    
+    @abstractmethod
+    def _set(self, key: str, value: str):
+        """Store value under key, evicting entries beyond the backend's limits"""
+    
+    @abstractmethod
+    def clear(self):
+        """Drop every entry"""
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-process LRU with a TTL"""
+    
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = 3600):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created, value = entry
+            if self._expired(created):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def _set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteResponseCache(ResponseCache):
+    """Persistent cache shared across processes through a SQLite file"""
+    
+    # Expired and surplus rows are pruned once per this many writes, not on every write
+    PRUNE_EVERY = 100
+    
+    def __init__(self, path: str = "llm_cache.sqlite3", ttl: Optional[float] = 24 * 3600,
+                 max_entries: int = 10000):
+        super().__init__(ttl)
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses(created)")
+            self._prune()
+    
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self._expired(created):
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            return value
+    
+    def _set(self, key: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created) VALUES (?, ?, ?)",
+                (key, value, time.time())
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._prune()
+    
+    def _prune(self):
+        """Delete expired rows, then the oldest rows beyond max_entries (caller holds the lock)"""
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+        # created of the newest row past the limit, found through the index; None while under it
+        row = self._conn.execute(
+            "SELECT created FROM responses ORDER BY created DESC LIMIT 1 OFFSET ?",
+            (self.max_entries,)
+        ).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM responses WHERE created <= ?", (row[0],))
+    
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+
+def create_response_cache_from_env() -> Optional[ResponseCache]:
+    """
+    Build the cache selected by LLM_CACHE_BACKEND ("memory", "sqlite" or "none")
+    
+    LLM_CACHE_TTL sets the TTL in seconds and LLM_CACHE_PATH the SQLite file.
+    """
+    backend = os.getenv('LLM_CACHE_BACKEND', 'memory').lower()
+    ttl = float(os.getenv('LLM_CACHE_TTL', '3600'))
+    if backend == 'none':
+        return None
+    if backend == 'sqlite':
+        return SQLiteResponseCache(os.getenv('LLM_CACHE_PATH', 'llm_cache.sqlite3'), ttl=ttl)
+    return MemoryResponseCache(ttl=ttl)
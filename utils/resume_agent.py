@@ -8,15 +8,51 @@ Features:
 - Auto-adjustment of font/text size
 """
 
+from collections import OrderedDict
+import copy
 import difflib
-from typing import Dict, List, Tuple
+import hashlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import os
 import re
 import json
 import html as html_module
 
+from .edit_history import EditHistory
+from .json_patch import JSONPatchError, apply_patch
+from .local_commands import LocalCommandRouter
+from .schemas import EDIT_SCHEMA, PATCH_EDIT_SCHEMA
+from .steps import Flow, arun_steps, call, run_steps
+from .stream_json import RESTART_PATH
+from .templates import render_fragment, render_page
+from .token_budget import SUGGEST_EXPECTED_TOKENS, expected_edit_tokens
+
 class ResumeAgent:
     """AI-powered interactive resume editor with PDF-style preview"""
     
+    # Words that tie a command to the section it edits
+    SECTION_KEYWORDS = {
+        'professional_summary': ('summary', 'objective', 'profile'),
+        'skills': ('skill',),
+        'experience': ('experience', 'job', 'work', 'role', 'responsibilit'),
+        'projects': ('project',),
+        'education': ('education', 'degree', 'university', 'college', 'gpa'),
+        'certifications': ('certif',),
+    }
+    
+    # Words that make a command apply to the whole resume
+    WHOLE_RESUME_WORDS = ('whole resume', 'entire resume', 'everything', 'all sections', 'auto-adjust')
+    
+    # Undo steps kept per agent (0 = no limit)
+    HISTORY_LIMIT = int(os.getenv('AGENT_HISTORY_LIMIT', '50'))
+    
+    # Sections of the A4 preview in page order; the header shows these fields
+    PAGE_SECTIONS = ('header', 'professional_summary', 'skills', 'experience', 'projects', 'education', 'certifications')
+    HEADER_FIELDS = ('name', 'email', 'phone', 'target_role')
+    
+    # Rendered section fragments kept per agent (shared by all templates)
+    FRAGMENT_CACHE_SIZE = 64
+    
     @staticmethod
     def _clean_html(text: str) -> str:
         """Remove HTML tags from text and unescape HTML entities"""
@@ -28,258 +64,374 @@ class ResumeAgent:
         text = html_module.unescape(text)
         return text.strip()
     
-    def __init__(self, ai_helper, template_name: str = "professional"):
-        """Initialize the resume agent with AI helper and template"""
+    def __init__(self, ai_helper, template_name: str = "professional", history_limit: Optional[int] = None):
+        """Initialize the resume agent with AI helper, template and undo history size"""
         self.ai_helper = ai_helper
         self.resume_state = {}
         self.chat_history = []
-        self.version_history = []
+        self.history = EditHistory(self.HISTORY_LIMIT if history_limit is None else history_limit)
         self.changed_sections = set()  # Track which sections were changed
         self.template_name = template_name
-        
+        self.edit_stats = {"local": 0, "patch": 0, "patch_failed": 0, "full": 0}
+        self._fragments = OrderedDict()  # (section, content hash, highlighted) -> HTML
+        self.render_stats = {"rendered": 0, "cached": 0}
+    
     def initialize_resume(self, resume_data: Dict):
         """Initialize resume state from data"""
-        self.resume_state = resume_data.copy()
-        self.version_history = [resume_data.copy()]
+        # A deep copy, so edits never reach lists shared with the caller's data
+        self.resume_state = copy.deepcopy(resume_data)
+        self.history.clear()
         self.changed_sections = set()
-        
+    
     def get_resume_pdf_html(self, highlight_changes: bool = False) -> str:
         """
         Convert resume to PDF-like A4 HTML format with optional highlighting
         
+        Each section is rendered separately and its fragment cached under a
+        hash of its content and its highlight flag, so a call after an edit
+        only re-renders the sections that changed. The markup is the same for
+        every template; the template only selects the stylesheet.
+        
         Args:
             highlight_changes: Whether to highlight recently changed sections
-            
+        
         Returns:
             HTML string with A4 page styling
         """
-        # A4 proportions: 210mm x 297mm
-        html = f"""
-        <div style="
-            background: white;
-            width: 100%;
-            max-width: 794px;
-            min-height: 1123px;
-            margin: 0 auto;
-            padding: 50px 60px;
-            box-shadow: 0 0 15px rgba(0,0,0,0.1);
-            font-family: 'Arial', 'Helvetica', sans-serif;
-            font-size: 11pt;
-            line-height: 1.6;
-            color: #000;
-            box-sizing: border-box;
-        ">
-        """
-        
-        # Name - Header
-        name = self.resume_state.get('name', 'N/A')
-        highlight_name = 'background-color: #fff3cd; border-left: 4px solid #ffc107;' if 'name' in self.changed_sections else ''
-        html += f"""
-        <div style="text-align: center; margin-bottom: 20px; padding: 10px; {highlight_name}">
-            <h1 style="margin: 0; font-size: 24pt; font-weight: bold; color: #1a1a1a;">{name}</h1>
-        """
-        
-        # Contact Info
-        contact_parts = []
-        if self.resume_state.get('email'):
-            contact_parts.append(self.resume_state['email'])
-        if self.resume_state.get('phone'):
-            contact_parts.append(self.resume_state['phone'])
-        
-        contact_text = ' | '.join(contact_parts)
-        html += f'<p style="margin: 5px 0 0 0; font-size: 10pt; color: #555;">{contact_text}</p>'
-        
-        if self.resume_state.get('target_role'):
-            html += f'<p style="margin: 5px 0 0 0; font-size: 10pt; color: #555; font-style: italic;">Target Role: {self.resume_state["target_role"]}</p>'
-        
-        html += '</div>'
-        
-        # Professional Summary
-        if self.resume_state.get('professional_summary'):
-            highlight_summary = 'background-color: #fff3cd; border-left: 4px solid #ffc107; padding-left: 10px;' if 'professional_summary' in self.changed_sections else ''
-            html += f"""
-            <div style="margin-bottom: 20px; {highlight_summary}">
-                <h2 style="font-size: 14pt; font-weight: bold; color: #2c3e50; margin: 0 0 8px 0; border-bottom: 2px solid #3498db; padding-bottom: 4px;">PROFESSIONAL SUMMARY</h2>
-                <p style="margin: 0; text-align: justify;">{self.resume_state['professional_summary']}</p>
-            </div>
-            """
-        
-        # Skills
-        if self.resume_state.get('skills'):
-            highlight_skills = 'background-color: #fff3cd; border-left: 4px solid #ffc107; padding-left: 10px;' if 'skills' in self.changed_sections else ''
-            html += f"""
-            <div style="margin-bottom: 20px; {highlight_skills}">
-                <h2 style="font-size: 14pt; font-weight: bold; color: #2c3e50; margin: 0 0 8px 0; border-bottom: 2px solid #3498db; padding-bottom: 4px;">SKILLS</h2>
-            """
-            
-            skills = self.resume_state['skills']
-            if isinstance(skills, dict):
-                if skills.get('technical'):
-                    tech_skills = ', '.join([str(s) for s in skills['technical']])
-                    html += f'<p style="margin: 4px 0;"><strong>Technical:</strong> {tech_skills}</p>'
-                if skills.get('soft'):
-                    soft_skills = ', '.join([str(s) for s in skills['soft']])
-                    html += f'<p style="margin: 4px 0;"><strong>Soft Skills:</strong> {soft_skills}</p>'
-            elif isinstance(skills, list):
-                skill_strings = []
-                for skill in skills:
-                    if isinstance(skill, str):
-                        skill_strings.append(skill)
-                    elif isinstance(skill, dict):
-                        skill_strings.append(skill.get('name', skill.get('skill', str(skill))))
-                html += f'<p style="margin: 4px 0;">{", ".join(skill_strings)}</p>'
-            
-            html += '</div>'
-        
-        # Professional Experience
-        if self.resume_state.get('experience'):
-            highlight_exp = 'background-color: #fff3cd; border-left: 4px solid #ffc107; padding-left: 10px;' if 'experience' in self.changed_sections else ''
-            html += f"""
-            <div style="margin-bottom: 20px; {highlight_exp}">
-                <h2 style="font-size: 14pt; font-weight: bold; color: #2c3e50; margin: 0 0 8px 0; border-bottom: 2px solid #3498db; padding-bottom: 4px;">PROFESSIONAL EXPERIENCE</h2>
-            """
-            
-            for exp in self.resume_state['experience']:
-                # Handle both string and dict formats
-                if isinstance(exp, str):
-                    # If exp is a string, display it as a simple bullet point
-                    html += f"""
-                    <div style="margin-bottom: 15px;">
-                        <p style="margin: 0;">{html_module.escape(self._clean_html(exp))}</p>
-                    </div>
-                    """
-                    continue
-                
-                # Handle dict format
-                if not isinstance(exp, dict):
-                    continue
-                    
-                # Clean and escape HTML from data
-                title = html_module.escape(self._clean_html(str(exp.get('title', ''))))
-                company = html_module.escape(self._clean_html(str(exp.get('company', ''))))
-                duration = html_module.escape(self._clean_html(str(exp.get('duration', ''))))
-                
-                html += f"""
-                <div style="margin-bottom: 15px;">
-                    <p style="margin: 0; font-weight: bold; font-size: 11pt;">{title} | {company}</p>
-                    <p style="margin: 2px 0 6px 0; font-size: 9pt; color: #666; font-style: italic;">{duration}</p>
-                    <ul style="margin: 0; padding-left: 20px;">
-                """
-                
-                achievements = exp.get('responsibilities', exp.get('achievements', []))
-                if isinstance(achievements, str):
-                    achievements = [achievements]
-                elif not isinstance(achievements, list):
-                    achievements = []
-                    
-                for achievement in achievements:
-                    # Clean and escape each achievement
-                    clean_achievement = html_module.escape(self._clean_html(str(achievement)))
-                    html += f'<li style="margin-bottom: 4px;">{clean_achievement}</li>'
-                
-                html += '</ul></div>'
-            
-            html += '</div>'
+        body = ''.join(
+            self._section_html(section, highlight_changes and self._is_changed(section))
+            for section in self.PAGE_SECTIONS
+        )
+        return render_page(body, self.template_name)
+    
+    def _is_changed(self, section: str) -> bool:
+        if section == 'header':
+            return any(field in self.changed_sections for field in self.HEADER_FIELDS)
+        return section in self.changed_sections
+    
+    def _section_html(self, section: str, highlighted: bool) -> str:
+        """Fragment for one page section, from the cache when its inputs are unchanged"""
+        if section == 'header':
+            content = {field: self.resume_state.get(field) for field in self.HEADER_FIELDS}
+        else:
+            content = self.resume_state.get(section)
+        payload = json.dumps(content, sort_keys=True, default=str)
+        key = (section, hashlib.sha256(payload.encode('utf-8')).hexdigest(), highlighted)
         
-        # Projects
-        if self.resume_state.get('projects'):
-            highlight_proj = 'background-color: #fff3cd; border-left: 4px solid #ffc107; padding-left: 10px;' if 'projects' in self.changed_sections else ''
-            html += f"""
-            <div style="margin-bottom: 20px; {highlight_proj}">
-                <h2 style="font-size: 14pt; font-weight: bold; color: #2c3e50; margin: 0 0 8px 0; border-bottom: 2px solid #3498db; padding-bottom: 4px;">PROJECTS</h2>
-            """
-            
-            for proj in self.resume_state['projects']:
-                # Handle both string and dict formats
-                if isinstance(proj, str):
-                    html += f'<div style="margin-bottom: 12px;"><p style="margin: 0;">{html_module.escape(self._clean_html(proj))}</p></div>'
-                    continue
-                
-                if not isinstance(proj, dict):
-                    continue
-                    
-                html += f'<div style="margin-bottom: 12px;"><p style="margin: 0; font-weight: bold;">{html_module.escape(self._clean_html(proj.get("name", "")))}</p>'
-                
-                if proj.get('technologies'):
-                    technologies = proj['technologies']
-                    tech_list = ', '.join([str(t) for t in technologies]) if isinstance(technologies, list) else str(technologies)
-                    html += f'<p style="margin: 2px 0; font-size: 9pt; color: #666;"><em>Technologies: {html_module.escape(self._clean_html(tech_list))}</em></p>'
-                
-                if proj.get('description'):
-                    html += f'<p style="margin: 4px 0;">{html_module.escape(self._clean_html(proj["description"]))}</p>'
-                
-                if proj.get('achievements'):
-                    achievements = proj['achievements']
-                    if isinstance(achievements, str):
-                        achievements = [achievements]
-                    
-                    if isinstance(achievements, list):
-                        html += '<ul style="margin: 4px 0; padding-left: 20px;">'
-                        for ach in achievements:
-                            html += f'<li style="margin-bottom: 2px;">{html_module.escape(self._clean_html(str(ach)))}</li>'
-                        html += '</ul>'
-                
-                html += '</div>'
-            
-            html += '</div>'
+        fragment = self._fragments.get(key)
+        if fragment is not None:
+            self._fragments.move_to_end(key)
+            self.render_stats["cached"] += 1
+            return fragment
         
-        # Education
-        if self.resume_state.get('education'):
-            highlight_edu = 'background-color: #fff3cd; border-left: 4px solid #ffc107; padding-left: 10px;' if 'education' in self.changed_sections else ''
-            html += f"""
-            <div style="margin-bottom: 20px; {highlight_edu}">
-                <h2 style="font-size: 14pt; font-weight: bold; color: #2c3e50; margin: 0 0 8px 0; border-bottom: 2px solid #3498db; padding-bottom: 4px;">EDUCATION</h2>
-            """
+        fragment = getattr(self, f"_render_{section}")(content, " highlighted" if highlighted else "")
+        self.render_stats["rendered"] += 1
+        self._fragments[key] = fragment
+        if len(self._fragments) > self.FRAGMENT_CACHE_SIZE:
+            self._fragments.popitem(last=False)
+        return fragment
+    
+    @classmethod
+    def _text(cls, value: Any) -> str:
+        """Plain text of a resume value (tags stripped; the template escapes it)"""
+        return cls._clean_html(str(value)) if value is not None else ''
+    
+    @classmethod
+    def _bullets(cls, items: Any) -> str:
+        if isinstance(items, str):
+            items = [items]
+        elif not isinstance(items, list):
+            return ''
+        return render_fragment('bullets', items=''.join(render_fragment('bullet', text=cls._text(item)) for item in items))
+    
+    @classmethod
+    def _render_header(cls, contact: Dict, highlight: str) -> str:
+        name = 'N/A' if contact.get('name') is None else contact['name']
+        target_role = contact.get('target_role')
+        return render_fragment(
+            'header', highlight=highlight, name=cls._text(name),
+            contact=' | '.join(cls._text(contact[field]) for field in ('email', 'phone') if contact.get(field)),
+            target_role=render_fragment('target_role', role=cls._text(target_role)) if target_role else None
+        )
+    
+    @classmethod
+    def _render_professional_summary(cls, summary: Any, highlight: str) -> str:
+        if not summary:
+            return ''
+        return render_fragment('section', highlight=highlight, title="PROFESSIONAL SUMMARY",
+                               body=render_fragment('summary', text=cls._text(summary)))
+    
+    @classmethod
+    def _render_skills(cls, skills: Any, highlight: str) -> str:
+        if not skills:
+            return ''
+        parts = []
+        if isinstance(skills, dict):
+            for key, label in (('technical', "Technical"), ('soft', "Soft Skills")):
+                if skills.get(key):
+                    parts.append(render_fragment('skill_group', label=label, skills=', '.join(cls._text(s) for s in skills[key])))
+        elif isinstance(skills, list):
+            skill_strings = []
+            for skill in skills:
+                if isinstance(skill, str):
+                    skill_strings.append(cls._text(skill))
+                elif isinstance(skill, dict):
+                    skill_strings.append(cls._text(skill.get('name', skill.get('skill', str(skill)))))
+            parts.append(render_fragment('skills', skills=', '.join(skill_strings)))
+        return render_fragment('section', highlight=highlight, title="SKILLS", body=''.join(parts))
+    
+    @classmethod
+    def _render_experience(cls, experience: Any, highlight: str) -> str:
+        if not experience:
+            return ''
+        parts = []
+        for exp in experience:
+            # Handle both string and dict formats
+            if isinstance(exp, str):
+                parts.append(render_fragment('entry_text', text=cls._text(exp)))
+            elif isinstance(exp, dict):
+                parts.append(render_fragment(
+                    'job', title=cls._text(exp.get('title', '')), company=cls._text(exp.get('company', '')),
+                    duration=cls._text(exp.get('duration', '')),
+                    bullets=cls._bullets(exp.get('responsibilities', exp.get('achievements', [])))
+                ))
+        return render_fragment('section', highlight=highlight, title="PROFESSIONAL EXPERIENCE", body=''.join(parts))
+    
+    @classmethod
+    def _render_projects(cls, projects: Any, highlight: str) -> str:
+        if not projects:
+            return ''
+        parts = []
+        for proj in projects:
+            # Handle both string and dict formats
+            if isinstance(proj, str):
+                parts.append(render_fragment('entry_text', text=cls._text(proj)))
+                continue
+            if not isinstance(proj, dict):
+                continue
             
-            for edu in self.resume_state['education']:
-                # Handle both string and dict formats
-                if isinstance(edu, str):
-                    html += f'<div style="margin-bottom: 8px;"><p style="margin: 0;">{html_module.escape(self._clean_html(edu))}</p></div>'
-                    continue
-                
-                if not isinstance(edu, dict):
-                    continue
-                    
-                html += f'<div style="margin-bottom: 8px;">'
-                html += f'<p style="margin: 0; font-weight: bold;">{html_module.escape(self._clean_html(edu.get("degree", "")))} | {html_module.escape(self._clean_html(edu.get("institution", "")))}</p>'
-                html += f'<p style="margin: 2px 0; font-size: 9pt; color: #666;">{html_module.escape(self._clean_html(edu.get("year", "")))}'
-                
+            details = []
+            technologies = proj.get('technologies')
+            if technologies:
+                tech_list = ', '.join(str(t) for t in technologies) if isinstance(technologies, list) else technologies
+                details.append(render_fragment('technologies', technologies=cls._text(tech_list)))
+            if proj.get('description'):
+                details.append(render_fragment('description', text=cls._text(proj['description'])))
+            parts.append(render_fragment('project', name=cls._text(proj.get('name', '')), details=''.join(details),
+                                         bullets=cls._bullets(proj['achievements']) if proj.get('achievements') else None))
+        return render_fragment('section', highlight=highlight, title="PROJECTS", body=''.join(parts))
+    
+    @classmethod
+    def _render_education(cls, education: Any, highlight: str) -> str:
+        if not education:
+            return ''
+        parts = []
+        for edu in education:
+            # Handle both string and dict formats
+            if isinstance(edu, str):
+                parts.append(render_fragment('entry_text', text=cls._text(edu)))
+            elif isinstance(edu, dict):
+                details = cls._text(edu.get('year', ''))
                 if edu.get('gpa'):
-                    html += f' | GPA: {html_module.escape(self._clean_html(str(edu["gpa"])))}'
-                
-                html += '</p></div>'
-            
-            html += '</div>'
-        
-        # Certifications
-        if self.resume_state.get('certifications'):
-            highlight_cert = 'background-color: #fff3cd; border-left: 4px solid #ffc107; padding-left: 10px;' if 'certifications' in self.changed_sections else ''
-            html += f"""
-            <div style="margin-bottom: 20px; {highlight_cert}">
-                <h2 style="font-size: 14pt; font-weight: bold; color: #2c3e50; margin: 0 0 8px 0; border-bottom: 2px solid #3498db; padding-bottom: 4px;">CERTIFICATIONS</h2>
-                <ul style="margin: 0; padding-left: 20px;">
-            """
-            
-            for cert in self.resume_state['certifications']:
-                # Handle any list item type
-                html += f'<li style="margin-bottom: 4px;">{html_module.escape(self._clean_html(str(cert)))}</li>'
-            
-            html += '</ul></div>'
-        
-        html += '</div>'
-        return html
+                    details += f" | GPA: {cls._text(edu['gpa'])}"
+                parts.append(render_fragment('degree', degree=cls._text(edu.get('degree', '')),
+                                             institution=cls._text(edu.get('institution', '')), details=details))
+        return render_fragment('section', highlight=highlight, title="EDUCATION", body=''.join(parts))
     
-    def process_command(self, user_command: str, job_description: str = "") -> Tuple[str, str]:
+    @classmethod
+    def _render_certifications(cls, certifications: Any, highlight: str) -> str:
+        if not certifications:
+            return ''
+        return render_fragment('section', highlight=highlight, title="CERTIFICATIONS", body=cls._bullets(certifications))
+    
+    def process_command(self, user_command: str, job_description: str = "",
+                        on_field: Optional[Callable[[tuple, Any], None]] = None) -> Tuple[str, str]:
         """
         Process user command and update ONLY the specific section mentioned
+        
+        Mechanical commands ("add Python to skills", "change phone to ...")
+        are applied by LocalCommandRouter without calling the LLM. A command
+        that clearly targets one section is sent with just that section, and
+        the model answers with a JSON Patch that is applied locally. Other
+        commands, and patches that do not apply, fall back to sending the
+        whole resume.
+        With on_field the completion is streamed and each field of the edit
+        (section, action, explanation, ...) is reported as it arrives.
         Returns: (response_message, pdf_html)
         """
-        # Store old version
-        old_state = self.resume_state.copy()
+        return run_steps(self.ai_helper, self._command_flow(user_command, job_description, on_field))
+    
+    async def aprocess_command(self, user_command: str, job_description: str = "",
+                               on_field: Optional[Callable[[tuple, Any], None]] = None) -> Tuple[str, str]:
+        """process_command for an AsyncAIHelper; awaits the completion instead of blocking"""
+        return await arun_steps(self.ai_helper, self._command_flow(user_command, job_description, on_field))
+    
+    def _command_flow(self, user_command: str, job_description: str,
+                      on_field: Optional[Callable[[tuple, Any], None]]) -> Flow:
+        """process_command's steps; the yielded calls go to the AI helper"""
+        self._record_command(user_command)
+        local_edit = self._local_edit(user_command)
+        if local_edit is not None:
+            return self._apply_edit(local_edit)
         
+        try:
+            edit_data = None
+            request = self._patch_request(user_command, job_description)
+            if request is not None:
+                section, prompt, expected_tokens = request
+                if on_field:
+                    patch_data = yield call('stream_complete', prompt, task="patch", on_field=self._patch_fields(section, on_field),
+                                            parse=self._parse_edit_response, expected_tokens=expected_tokens)
+                else:
+                    patch_data = yield call('complete', prompt, task="patch", parse=self._parse_edit_response,
+                                            expected_tokens=expected_tokens)
+                patch_data = yield call('conform', patch_data, PATCH_EDIT_SCHEMA, prompt, task="patch")
+                edit_data = self._patched_edit(section, patch_data)
+            
+            if edit_data is None:
+                # The edit route uses a low temperature for consistent edits
+                prompt = self._edit_prompt(user_command, job_description)
+                if on_field:
+                    edit_data = yield call('stream_complete', prompt, task="edit", on_field=on_field, parse=self._parse_edit_response,
+                                           expected_tokens=self._expected_edit_tokens(user_command))
+                else:
+                    edit_data = yield call('complete', prompt, task="edit", parse=self._parse_edit_response,
+                                           expected_tokens=self._expected_edit_tokens(user_command))
+                edit_data = yield call('conform', edit_data, EDIT_SCHEMA, prompt, task="edit")
+                self.edit_stats["full"] += 1
+            return self._apply_edit(edit_data)
+        except Exception as e:
+            return self._command_error(e)
+    
+    def _guess_section(self, user_command: str) -> Optional[str]:
+        """Section a command most likely edits, from the words it uses"""
+        command = user_command.lower()
+        for section, keywords in self.SECTION_KEYWORDS.items():
+            if any(keyword in command for keyword in keywords):
+                return section
+        return None
+    
+    def _expected_edit_tokens(self, user_command: str) -> int:
+        """Output size for an edit: the targeted section, or the largest one if unclear"""
+        section = self._guess_section(user_command)
+        if section is not None:
+            return expected_edit_tokens(self.resume_state.get(section))
+        sections = [value for value in self.resume_state.values() if isinstance(value, (list, dict, str))]
+        return max((expected_edit_tokens(value) for value in sections), default=expected_edit_tokens(None))
+    
+    def _record_command(self, user_command: str):
         # Add to chat history
         self.chat_history.append({"role": "user", "content": user_command})
+    
+    def _local_edit(self, user_command: str) -> Optional[Dict]:
+        """Edit for a command that needs no LLM call, or None"""
+        edit_data = LocalCommandRouter.route(user_command, self.resume_state)
+        if edit_data is not None:
+            self.edit_stats["local"] += 1
+        return edit_data
+    
+    def _target_section(self, user_command: str) -> Optional[str]:
+        """
+        The one section a command edits, or None
+        
+        None when the command mentions several sections, none, or the
+        whole resume; those need the full resume in the prompt.
+        """
+        command = user_command.lower()
+        if any(word in command for word in self.WHOLE_RESUME_WORDS):
+            return None
+        matches = [section for section, keywords in self.SECTION_KEYWORDS.items()
+                   if any(keyword in command for keyword in keywords)]
+        return matches[0] if len(matches) == 1 else None
+    
+    def _section_content(self, section: str) -> Any:
+        content = self.resume_state.get(section)
+        if content is None:
+            return "" if section == 'professional_summary' else []
+        return content
+    
+    def _patch_request(self, user_command: str, job_description: str) -> Optional[Tuple[str, str, int]]:
+        """(section, prompt, expected_tokens) for a single-section patch edit, or None"""
+        section = self._target_section(user_command)
+        if section is None:
+            return None
+        content = self._section_content(section)
+        
+        prompt = f"""
+You are an AI resume editing assistant. Apply the user's command to ONE section of a resume.
+
+Section: {section}
+Current content of the section:
+{json.dumps(content, indent=1)}
+
+User Command: {user_command}
+
+Job Description (if provided): {job_description}
+
+Describe the change as a JSON Patch (RFC 6902) against the section content above. Paths are relative to the
+section: "/-" appends to a list, "/2" is its third item, "/0/responsibilities/1" is the second responsibility
+of the first entry, and "" replaces the whole section. Change ONLY what the command asks for.
+
+Return a JSON object with:
+{{
+    "action": "what you're doing (brief, e.g., 'Added Python to skills')",
+    "patch": [{{"op": "add|remove|replace|move|copy|test", "path": "/...", "value": "..."}}],
+    "explanation": "what you changed (1-2 sentences)",
+    "change_type": "add|modify|remove|optimize"
+}}
+
+Return ONLY the JSON object.
+"""
+        return section, prompt, expected_edit_tokens(content)
+    
+    @staticmethod
+    def _patch_fields(section: str, on_field: Callable[[tuple, Any], None]) -> Callable[[tuple, Any], None]:
+        """Report the locally chosen section at once (again after a stream restart) and hide patch operations"""
+        on_field(('section',), section)
         
+        def report(path: tuple, value: Any):
+            if path == RESTART_PATH:
+                on_field(path, value)
+                on_field(('section',), section)
+            elif path[0] != 'patch':
+                on_field(path, value)
+        
+        return report
+    
+    def _patched_edit(self, section: str, patch_data: Dict) -> Optional[Dict]:
+        """Apply a patch answer to its section; None if it does not apply"""
+        patch = [self._relative_operation(operation, section) for operation in patch_data.get('patch') or []]
+        try:
+            updated_content = apply_patch(self._section_content(section), patch)
+        except JSONPatchError as e:
+            print(f"Patch for {section} did not apply ({e}); falling back to a full edit")
+            self.edit_stats["patch_failed"] += 1
+            return None
+        
+        self.edit_stats["patch"] += 1
+        return {
+            "section": section,
+            "updated_content": updated_content,
+            "action": patch_data.get('action') or f"Updated {section.replace('_', ' ')}",
+            "explanation": patch_data.get('explanation', ''),
+            "change_type": patch_data.get('change_type', 'modify')
+        }
+    
+    def _relative_operation(self, operation: Dict, section: str) -> Dict:
+        """Strip a leading /<section> the model sometimes adds to paths"""
+        content = self._section_content(section)
+        if isinstance(content, dict) and section in content:
+            return operation
+        prefix = f"/{section}"
+        operation = dict(operation)
+        for key in ('path', 'from'):
+            value = operation.get(key)
+            if isinstance(value, str) and (value == prefix or value.startswith(prefix + "/")):
+                operation[key] = value[len(prefix):]
+        return operation
+    
+    def _edit_prompt(self, user_command: str, job_description: str) -> str:
+        """Prompt for an edit that gets the whole resume"""
         # Analyze command - identify SPECIFIC section and change
         prompt = f"""
 You are an AI resume editing assistant. Analyze the user's command and make ONLY the specific changes requested. Do not modify other sections.
@@ -309,76 +461,51 @@ Return a JSON object with:
 
 Return ONLY the JSON object.
 """
-        
+        return prompt
+    
+    def _parse_edit_response(self, result: str) -> Dict:
+        """Parse the edit JSON returned for a command"""
         try:
-            response = self.ai_helper.client.chat.completions.create(
-                model=self.ai_helper.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.2,  # Lower temperature for more consistent edits
-                max_tokens=2000
-            )
-            
-            result = response.choices[0].message.content.strip()
-            
-            # Enhanced JSON extraction with better error handling
-            try:
-                # Remove markdown code blocks
-                if "```json" in result:
-                    result = result.split("```json")[1].split("```")[0].strip()
-                elif "```" in result:
-                    result = result.split("```")[1].split("```")[0].strip()
-                
-                # Find JSON object more carefully
-                json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', result, re.DOTALL)
-                if json_match:
-                    result = json_match.group(0)
-                
-                # Clean up common JSON issues
-                result = result.replace('\n', ' ').replace('\r', '')
-                # Remove any trailing commas before closing braces
-                result = re.sub(r',\s*}', '}', result)
-                result = re.sub(r',\s*]', ']', result)
-                
-                edit_data = json.loads(result.strip())
-                
-            except json.JSONDecodeError as je:
-                # If JSON parsing fails, try to extract key information manually
-                print(f"JSON parse error at line {je.lineno} column {je.colno}: {je.msg}")
-                print(f"Problematic JSON: {result[:500]}...")
-                raise ValueError(f"Failed to parse AI response as JSON. Error at column {je.colno}: {je.msg}")
-            
-            # Apply the edit to ONLY the specified section
-            section = edit_data.get('section')
-            updated_content = edit_data.get('updated_content')
-            action = edit_data.get('action', 'Updated resume')
-            explanation = edit_data.get('explanation', '')
-            
-            if section and updated_content is not None:
-                # Store the section that was changed
-                self.changed_sections.add(section)
-                
-                # Update only this section
-                self.resume_state[section] = updated_content
-                self.version_history.append(self.resume_state.copy())
-            
-            # Generate PDF-style HTML with highlighting
-            pdf_html = self.get_resume_pdf_html(highlight_changes=True)
-            
-            # Create response message
-            response_message = f"✅ **{action}**\n\n{explanation}"
-            
-            self.chat_history.append({"role": "assistant", "content": response_message})
-            
-            return response_message, pdf_html
+            return self.ai_helper.parse_json(result, '{')
+        
+        except json.JSONDecodeError as je:
+            print(f"JSON parse error at line {je.lineno} column {je.colno}: {je.msg}")
+            print(f"Problematic JSON: {result[:500]}...")
+            raise ValueError(f"Failed to parse AI response as JSON. Error at column {je.colno}: {je.msg}")
+    
+    def _apply_edit(self, edit_data: Dict) -> Tuple[str, str]:
+        """Apply a parsed edit to its section and return (message, pdf_html)"""
+        # Apply the edit to ONLY the specified section
+        section = edit_data.get('section')
+        updated_content = edit_data.get('updated_content')
+        action = edit_data.get('action', 'Updated resume')
+        explanation = edit_data.get('explanation', '')
+        
+        if section and updated_content is not None:
+            # Store the section that was changed
+            self.changed_sections.add(section)
             
-        except ValueError as ve:
-            error_msg = f"❌ Error processing command: {str(ve)}\n\nPlease try rephrasing your request."
-            self.chat_history.append({"role": "assistant", "content": error_msg})
-            return error_msg, self.get_resume_pdf_html(highlight_changes=False)
-        except Exception as e:
-            error_msg = f"❌ Error processing command: {str(e)}\n\nPlease try again or rephrase your request."
-            self.chat_history.append({"role": "assistant", "content": error_msg})
-            return error_msg, self.get_resume_pdf_html(highlight_changes=False)
+            # Update only this section, keeping its old value for undo
+            self.history.record(self.resume_state, section)
+            self.resume_state[section] = updated_content
+        
+        # Generate PDF-style HTML with highlighting
+        pdf_html = self.get_resume_pdf_html(highlight_changes=True)
+        
+        # Create response message
+        response_message = f"✅ **{action}**\n\n{explanation}"
+        
+        self.chat_history.append({"role": "assistant", "content": response_message})
+        
+        return response_message, pdf_html
+    
+    def _command_error(self, error: Exception) -> Tuple[str, str]:
+        if isinstance(error, ValueError):
+            error_msg = f"❌ Error processing command: {str(error)}\n\nPlease try rephrasing your request."
+        else:
+            error_msg = f"❌ Error processing command: {str(error)}\n\nPlease try again or rephrase your request."
+        self.chat_history.append({"role": "assistant", "content": error_msg})
+        return error_msg, self.get_resume_pdf_html(highlight_changes=False)
     
     def auto_adjust_formatting(self) -> Tuple[str, str]:
         """
@@ -398,17 +525,42 @@ Return ONLY the JSON object.
     
     def undo_last_change(self) -> Tuple[str, str]:
         """Undo the last change"""
-        if len(self.version_history) > 1:
-            self.version_history.pop()
-            self.resume_state = self.version_history[-1].copy()
+        if self.history.undo(self.resume_state) is not None:
             self.changed_sections = set()  # Clear highlights on undo
             message = "↩️ Undone last change"
             return message, self.get_resume_pdf_html(highlight_changes=False)
         else:
             return "⚠️ No changes to undo", self.get_resume_pdf_html(highlight_changes=False)
     
+    def redo_last_change(self) -> Tuple[str, str]:
+        """Redo the last undone change"""
+        section = self.history.redo(self.resume_state)
+        if section is not None:
+            self.changed_sections = {section}
+            message = "↪️ Redone last change"
+            return message, self.get_resume_pdf_html(highlight_changes=True)
+        else:
+            return "⚠️ No changes to redo", self.get_resume_pdf_html(highlight_changes=False)
+    
     def get_suggestions(self, job_description: str = "") -> List[str]:
         """Get AI suggestions for improvements"""
+        return run_steps(self.ai_helper, self._suggestions_flow(job_description))
+    
+    async def aget_suggestions(self, job_description: str = "") -> List[str]:
+        """get_suggestions for an AsyncAIHelper"""
+        return await arun_steps(self.ai_helper, self._suggestions_flow(job_description))
+    
+    def _suggestions_flow(self, job_description: str = "") -> Flow:
+        prompt = self._suggestions_prompt(job_description)
+        
+        try:
+            return (yield call('complete', prompt, task="suggest", parse=self._parse_suggestions,
+                               expected_tokens=SUGGEST_EXPECTED_TOKENS))
+        except Exception as e:
+            print(f"Error getting suggestions: {e}")
+            return self._default_suggestions()
+    
+    def _suggestions_prompt(self, job_description: str = "") -> str:
         current_text = json.dumps(self.resume_state, indent=2)
         
         jd_context = f"\n\nJob Description: {job_description}" if job_description else ""
@@ -429,35 +581,18 @@ Example: ["Add quantifiable metrics to your achievements (e.g., 'Increased sales
 
 Return ONLY a JSON array of 4-6 suggestions.
 """
-        
-        try:
-            response = self.ai_helper.client.chat.completions.create(
-                model=self.ai_helper.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.5,
-                max_tokens=600
-            )
-            
-            result = response.choices[0].message.content.strip()
-            
-            # Extract JSON array
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-            
-            json_match = re.search(r'\[.*\]', result, re.DOTALL)
-            if json_match:
-                result = json_match.group(0)
-            
-            suggestions = json.loads(result.strip())
-            return suggestions if isinstance(suggestions, list) else []
-            
-        except Exception as e:
-            print(f"Error getting suggestions: {e}")
-            return [
-                "Add quantifiable achievements with numbers and percentages",
-                "Optimize keywords for ATS based on job description",
-                "Make professional summary more concise and impactful",
-                "Use action verbs to start each bullet point"
-            ]
+        return prompt
+    
+    def _parse_suggestions(self, result: str) -> List[str]:
+        # Take the first JSON array, even if it is wrapped in an object
+        suggestions = self.ai_helper.parse_json(result, '[')
+        return suggestions if isinstance(suggestions, list) else []
+    
+    @staticmethod
+    def _default_suggestions() -> List[str]:
+        return [
+            "Add quantifiable achievements with numbers and percentages",
+            "Optimize keywords for ATS based on job description",
+            "Make professional summary more concise and impactful",
+            "Use action verbs to start each bullet point"
+        ]
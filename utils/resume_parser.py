@@ -5,117 +5,445 @@ Extracts text from PDF and DOCX files
 
 import PyPDF2
 from docx import Document
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Optional, Union, BinaryIO, List, Tuple, Iterator, NamedTuple
 import os
+import re
+import threading
+import zipfile
 import logging
 
+try:
+    import pdfplumber
+except ImportError:  # pdfplumber is only needed for the fallback path
+    pdfplumber = None
+
+from .parse_cache import ParseCache
+from .docx_reader import read_docx_blocks
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# A resume can be given as a path, raw bytes, a memoryview (e.g. Streamlit's
+# UploadedFile.getbuffer()) or any binary file-like object
+ResumeSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+# PDF pages are joined with a form feed on its own line, so consumers can tell
+# page boundaries apart (see text_compactor) while line-based code sees a blank line
+PAGE_BREAK = "\n\f\n"
+
+
+class TextChunk(NamedTuple):
+    """
+    One PDF page or DOCX block yielded by the streaming parser API
+    
+    start/end are character offsets into the text obtained by joining the
+    yielded chunks the way the whole-file parsers do: PDF pages with
+    PAGE_BREAK, DOCX blocks with "\n". That is the text parse_pdf/parse_docx
+    return before stripping leading whitespace, so hits can be mapped back.
+    """
+    index: int
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+# Shared pool for parallel PDF page extraction, created on first use
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+
+def _open_pdf_reader(data: bytes) -> "PyPDF2.PdfReader":
+    """Open a PdfReader over in-memory bytes, decrypting empty-password files"""
+    pdf_reader = PyPDF2.PdfReader(BytesIO(data))
+    if pdf_reader.is_encrypted:
+        logger.warning("PDF is encrypted, attempting to read...")
+        pdf_reader.decrypt('')
+    return pdf_reader
+
+
+def _pdf_page_count(pdf_reader) -> int:
+    """Page count from the page tree root's /Count, without loading every page"""
+    try:
+        count = pdf_reader.trailer['/Root']['/Pages']['/Count']
+        if isinstance(count, int) and count >= 0:
+            return int(count)
+    except Exception as e:
+        logger.warning(f"PDF page tree root has no usable /Count: {e}")
+    # Malformed root: count by walking the page tree
+    return len(pdf_reader.pages)
+
+
+def _extract_page_texts(pdf_reader, start: int, end: int) -> List[str]:
+    """Extract text for pages [start, end), using "" for failed pages"""
+    texts = []
+    for page_num in range(start, end):
+        try:
+            texts.append(pdf_reader.pages[page_num].extract_text() or "")
+        except Exception as e:
+            logger.warning(f"Error extracting text from page {page_num}: {e}")
+            texts.append("")
+    return texts
+
+
+def _extract_page_range(data: bytes, start: int, end: int) -> List[str]:
+    """Process pool worker: each worker opens its own reader over the bytes"""
+    return _extract_page_texts(_open_pdf_reader(data), start, end)
+
+
+def _get_page_pool(max_workers: int) -> ProcessPoolExecutor:
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(max_workers=max_workers)
+        return _page_pool
+
 class ResumeParser:
     """Parse resume files (PDF, DOCX) and extract text content"""
     
+    # Bump whenever extraction output changes so stale cache entries are ignored
+    PARSER_VERSION = "4"
+    
+    # Page cap and process pool sizing for PDF extraction (0 = no cap)
+    MAX_PDF_PAGES = int(os.getenv('MAX_PDF_PAGES', '0'))
+    PARALLEL_PAGE_THRESHOLD = 8
+    MAX_PDF_WORKERS = min(4, os.cpu_count() or 1)
+    
+    # Pages scoring below this are re-extracted with pdfplumber
+    MIN_PAGE_QUALITY = 0.6
+    
+    # Pre-flight limits: inputs beyond these are rejected before extraction
+    MAX_UPLOAD_BYTES = int(os.getenv('MAX_UPLOAD_BYTES', str(10 * 1024 * 1024)))
+    MAX_PDF_PAGE_COUNT = int(os.getenv('MAX_PDF_PAGE_COUNT', '50'))
+    MAX_DOCX_XML_BYTES = int(os.getenv('MAX_DOCX_XML_BYTES', str(20 * 1024 * 1024)))
+    MAX_DOCX_ENTRIES = 1000
+    MAX_DOCX_COMPRESSION_RATIO = 100
+    
+    # Shared content-hash cache; set PARSE_CACHE_DIR to enable the disk tier
+    cache = ParseCache(
+        max_entries=int(os.getenv('PARSE_CACHE_MAX_ENTRIES', '128')),
+        disk_dir=os.getenv('PARSE_CACHE_DIR') or None,
+        max_disk_bytes=int(os.getenv('PARSE_CACHE_MAX_BYTES', str(50 * 1024 * 1024)))
+    )
+    
     @staticmethod
-    def parse_pdf(file_path: str) -> Optional[str]:
+    def _load_bytes(source: ResumeSource) -> Optional[bytes]:
         """
-        Extract text from PDF file with enhanced error handling
+        Read a resume source fully into memory
         
         Args:
-            file_path: Path to PDF file
+            source: Path, bytes-like object or binary file-like object
+        
+        Returns:
+            File contents, or None if the source is missing or empty
+        """
+        if isinstance(source, (bytes, bytearray)):
+            data = bytes(source)
+        elif isinstance(source, memoryview):
+            data = source.tobytes()
+        elif isinstance(source, (str, os.PathLike)):
+            if not os.path.exists(source):
+                logger.error(f"File not found: {source}")
+                return None
+            with open(source, 'rb') as file:
+                data = file.read()
+        elif hasattr(source, 'read'):
+            if hasattr(source, 'seek'):
+                source.seek(0)
+            data = source.read()
+            if isinstance(data, memoryview):
+                data = data.tobytes()
+        else:
+            logger.error(f"Unsupported resume source type: {type(source).__name__}")
+            return None
+        
+        if not data:
+            logger.error("Resume file is empty")
+            return None
+        return data
+    
+    @staticmethod
+    def _detect_extension(data: bytes, filename: Optional[str] = None) -> str:
+        """Work out the file type from the filename, falling back to magic bytes"""
+        if filename:
+            extension = os.path.splitext(filename)[1].lower()
+            if extension:
+                return extension
+        if data.startswith(b'%PDF'):
+            return '.pdf'
+        if data.startswith(b'PK\x03\x04'):
+            return '.docx'
+        return ''
+    
+    @staticmethod
+    def preflight(source: ResumeSource, filename: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Cheaply check an upload against the size/page/XML limits
+        
+        Only the PDF trailer and page tree root, or the DOCX zip directory,
+        are read, so oversized files and zip bombs are rejected in
+        milliseconds before any text extraction starts.
+        
+        Args:
+            source: Path to resume file, or its contents as bytes / memoryview /
+                file-like object
+            filename: Original filename, used to pick the format
+        
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        if isinstance(source, (str, os.PathLike)):
+            if filename is None:
+                filename = os.fspath(source)
+            if os.path.exists(source) and os.path.getsize(source) > ResumeParser.MAX_UPLOAD_BYTES:
+                return False, ResumeParser._too_large_message(os.path.getsize(source))
+        
+        data = ResumeParser._load_bytes(source)
+        if data is None:
+            return False, "File is missing or empty"
+        is_valid, error_message, _ = ResumeParser._preflight_bytes(data, ResumeParser._detect_extension(data, filename))
+        return is_valid, error_message
+    
+    @staticmethod
+    def _too_large_message(size: int) -> str:
+        return (f"File is {size / (1024 * 1024):.1f} MB; the limit is "
+                f"{ResumeParser.MAX_UPLOAD_BYTES / (1024 * 1024):.1f} MB")
+    
+    @staticmethod
+    def _preflight_bytes(data: bytes, file_extension: str) -> Tuple[bool, str, Optional["PyPDF2.PdfReader"]]:
+        """
+        preflight() over loaded bytes
+        
+        Returns:
+            Tuple of (is_valid, error_message, pdf_reader). The reader opened
+            to check a PDF is handed back so the parser does not open it again.
+        """
+        if len(data) > ResumeParser.MAX_UPLOAD_BYTES:
+            return False, ResumeParser._too_large_message(len(data)), None
+        
+        if file_extension == '.pdf':
+            if not data.lstrip()[:5].startswith(b'%PDF'):
+                return False, "File is not a valid PDF", None
+            try:
+                # PdfReader only loads the xref/trailer here; /Count comes from the page tree root
+                pdf_reader = _open_pdf_reader(data)
+                page_count = _pdf_page_count(pdf_reader)
+            except Exception as e:
+                return False, f"PDF could not be opened: {e}", None
+            if page_count > ResumeParser.MAX_PDF_PAGE_COUNT:
+                return False, f"PDF has {page_count} pages; the limit is {ResumeParser.MAX_PDF_PAGE_COUNT}", None
+            return True, "", pdf_reader
+        
+        if file_extension in ['.docx', '.doc']:
+            try:
+                with zipfile.ZipFile(BytesIO(data)) as package:
+                    entries = package.infolist()
+            except zipfile.BadZipFile:
+                return False, "File is not a valid DOCX (legacy .doc files are not supported)", None
+            if len(entries) > ResumeParser.MAX_DOCX_ENTRIES:
+                return False, f"DOCX contains {len(entries)} parts; the limit is {ResumeParser.MAX_DOCX_ENTRIES}", None
+            if not any(entry.filename == 'word/document.xml' for entry in entries):
+                return False, "DOCX is missing word/document.xml", None
             
+            # Sizes come from the zip central directory; nothing is decompressed
+            xml_bytes = 0
+            for entry in entries:
+                if entry.compress_size and entry.file_size / entry.compress_size > ResumeParser.MAX_DOCX_COMPRESSION_RATIO:
+                    return False, f"DOCX part {entry.filename} has a suspicious compression ratio", None
+                if entry.filename.endswith('.xml') or entry.filename.endswith('.rels'):
+                    xml_bytes += entry.file_size
+            if xml_bytes > ResumeParser.MAX_DOCX_XML_BYTES:
+                return False, (f"DOCX XML is {xml_bytes / (1024 * 1024):.1f} MB uncompressed; the limit is "
+                               f"{ResumeParser.MAX_DOCX_XML_BYTES / (1024 * 1024):.1f} MB"), None
+            return True, "", None
+        
+        return False, f"Unsupported file format: {file_extension or 'unknown'}", None
+    
+    @staticmethod
+    def parse_pdf(source: ResumeSource, max_pages: Optional[int] = None,
+                  parallel: Optional[bool] = None, pdf_reader: Optional["PyPDF2.PdfReader"] = None) -> Optional[str]:
+        """
+        Extract text from PDF file with enhanced error handling
+        
+        Args:
+            source: Path to PDF file, or its contents as bytes / file-like object
+            max_pages: Only read the first N pages (defaults to MAX_PDF_PAGES)
+            parallel: Extract pages in the shared process pool. None decides
+                automatically based on PARALLEL_PAGE_THRESHOLD.
+            pdf_reader: Reader already opened over source (by the pre-flight
+                check), so the file is not parsed twice
+        
         Returns:
             Extracted text or None if error
         """
         try:
-            if not os.path.exists(file_path):
-                logger.error(f"PDF file not found: {file_path}")
-                return None
-            
-            if os.path.getsize(file_path) == 0:
-                logger.error(f"PDF file is empty: {file_path}")
+            data = ResumeParser._load_bytes(source)
+            if data is None:
                 return None
             
-            text = ""
-            with open(file_path, 'rb') as file:
-                try:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    
-                    # Check if PDF is encrypted
-                    if pdf_reader.is_encrypted:
-                        logger.warning("PDF is encrypted, attempting to read...")
-                        pdf_reader.decrypt('')
-                    
-                    # Extract text from all pages
-                    if len(pdf_reader.pages) == 0:
-                        logger.warning("PDF has no pages")
-                        return None
-                    
-                    for page_num, page in enumerate(pdf_reader.pages):
-                        try:
-                            page_text = page.extract_text()
-                            if page_text:
-                                text += page_text + "\n"
-                        except Exception as e:
-                            logger.warning(f"Error extracting text from page {page_num}: {e}")
-                            continue
-                    
-                    if not text.strip():
-                        logger.warning("No text extracted from PDF")
-                        return None
-                    
-                    logger.info(f"Successfully extracted {len(text)} characters from PDF")
-                    return text.strip()
+            try:
+                if pdf_reader is None:
+                    pdf_reader = _open_pdf_reader(data)
+                
+                # Extract text from all pages
+                page_count = len(pdf_reader.pages)
+                if page_count == 0:
+                    logger.warning("PDF has no pages")
+                    return None
+                
+                if max_pages is None:
+                    max_pages = ResumeParser.MAX_PDF_PAGES
+                if max_pages and page_count > max_pages:
+                    logger.info(f"Reading first {max_pages} of {page_count} pages")
+                    page_count = max_pages
+                
+                if parallel is None:
+                    parallel = page_count >= ResumeParser.PARALLEL_PAGE_THRESHOLD
                 
-                except Exception as e:
-                    logger.error(f"PyPDF2 error: {e}")
-                    # Fallback: try alternative parsing
-                    return ResumeParser._fallback_pdf_parse(file_path)
+                page_texts = None
+                if parallel and ResumeParser.MAX_PDF_WORKERS > 1:
+                    page_texts = ResumeParser._extract_pages_parallel(data, page_count)
+                if page_texts is None:
+                    page_texts = _extract_page_texts(pdf_reader, 0, page_count)
+                
+                page_texts = ResumeParser._repair_weak_pages(data, page_texts)
+                
+                # Single join in page order instead of repeated concatenation
+                text = PAGE_BREAK.join(page_text for page_text in page_texts if page_text).strip()
+                
+                if not text:
+                    logger.warning("No text extracted from PDF")
+                    return None
+                
+                logger.info(f"Successfully extracted {len(text)} characters from PDF")
+                return text
+            
+            except Exception as e:
+                logger.error(f"PyPDF2 error: {e}")
+                # Fallback: try alternative parsing
+                return ResumeParser._fallback_pdf_parse(data, max_pages)
         
         except Exception as e:
             logger.error(f"Error parsing PDF: {type(e).__name__}: {e}")
             return None
     
     @staticmethod
-    def _fallback_pdf_parse(file_path: str) -> Optional[str]:
-        """Fallback PDF parsing method"""
+    def _extract_pages_parallel(data: bytes, page_count: int) -> Optional[List[str]]:
+        """
+        Extract pages concurrently, one contiguous page range per worker
+        
+        Returns:
+            Page texts in page order, or None if the pool is unavailable
+        """
+        workers = min(ResumeParser.MAX_PDF_WORKERS, page_count)
+        chunk = -(-page_count // workers)
+        ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+        
+        try:
+            pool = _get_page_pool(ResumeParser.MAX_PDF_WORKERS)
+            futures = [pool.submit(_extract_page_range, data, start, end) for start, end in ranges]
+            page_texts = []
+            for future in futures:
+                page_texts.extend(future.result())
+            return page_texts
+        except Exception as e:
+            logger.warning(f"Parallel page extraction unavailable, reading sequentially: {e}")
+            return None
+    
+    @staticmethod
+    def _text_quality(text: str) -> float:
+        """
+        Score extracted page text from 0 (empty/garbage) to 1 (clean prose)
+        
+        Penalises unmapped glyphs ((cid:N), U+FFFD), non-printable characters,
+        a low share of letters/digits, and words run together without spaces.
+        """
+        stripped = text.strip() if text else ""
+        if not stripped:
+            return 0.0
+        
+        length = len(stripped)
+        printable = sum(1 for c in stripped if c.isprintable() or c in '\n\t')
+        alnum = sum(1 for c in stripped if c.isalnum())
+        garbage = stripped.count('\ufffd') + 5 * len(re.findall(r'\(cid:\d+\)', stripped))
+        
+        score = (printable / length) * min(1.0, (alnum / length) / 0.5)
+        
+        words = stripped.split()
+        if sum(len(word) for word in words) / len(words) > 15:
+            score *= 0.5
+        
+        score -= garbage / length
+        return max(0.0, min(1.0, score))
+    
+    @staticmethod
+    def _repair_weak_pages(data: bytes, page_texts: List[str]) -> List[str]:
+        """
+        Re-extract only the low-quality pages with pdfplumber
+        
+        Each weak page keeps whichever of the PyPDF2 / pdfplumber outputs scores
+        higher, so clean pages are never parsed twice.
+        """
+        qualities = [ResumeParser._text_quality(text) for text in page_texts]
+        weak_pages = [i for i, quality in enumerate(qualities) if quality < ResumeParser.MIN_PAGE_QUALITY]
+        if not weak_pages or pdfplumber is None:
+            return page_texts
+        
+        logger.info(f"Re-extracting {len(weak_pages)} low-quality page(s) with pdfplumber")
+        repaired = list(page_texts)
+        try:
+            with pdfplumber.open(BytesIO(data)) as pdf:
+                for page_num in weak_pages:
+                    try:
+                        candidate = pdf.pages[page_num].extract_text() or ""
+                    except Exception as e:
+                        logger.warning(f"pdfplumber failed on page {page_num}: {e}")
+                        continue
+                    if ResumeParser._text_quality(candidate) > qualities[page_num]:
+                        repaired[page_num] = candidate
+        except Exception as e:
+            logger.warning(f"pdfplumber page repair failed: {e}")
+            return page_texts
+        return repaired
+    
+    @staticmethod
+    def _fallback_pdf_parse(data: bytes, max_pages: Optional[int] = None) -> Optional[str]:
+        """Fallback PDF parsing method, used when PyPDF2 cannot open the file"""
+        if pdfplumber is None:
+            logger.warning("pdfplumber not installed, no fallback PDF parser available")
+            return None
         try:
             logger.info("Attempting fallback PDF parsing...")
-            import pdfplumber
-            
-            with pdfplumber.open(file_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                return text.strip() if text.strip() else None
-        except:
+            with pdfplumber.open(BytesIO(data)) as pdf:
+                pages = pdf.pages[:max_pages] if max_pages else pdf.pages
+                page_texts = [page.extract_text() for page in pages]
+                text = PAGE_BREAK.join(page_text for page_text in page_texts if page_text).strip()
+                return text if text else None
+        except Exception:
             logger.warning("Fallback PDF parsing failed")
             return None
     
     @staticmethod
-    def parse_docx(file_path: str) -> Optional[str]:
+    def parse_docx(source: ResumeSource) -> Optional[str]:
         """
         Extract text from DOCX file with enhanced error handling
         
         Args:
-            file_path: Path to DOCX file
-            
+            source: Path to DOCX file, or its contents as bytes / file-like object
+        
         Returns:
             Extracted text or None if error
         """
         try:
-            if not os.path.exists(file_path):
-                logger.error(f"DOCX file not found: {file_path}")
+            data = ResumeParser._load_bytes(source)
+            if data is None:
                 return None
             
-            if os.path.getsize(file_path) == 0:
-                logger.error(f"DOCX file is empty: {file_path}")
-                return None
-            
-            doc = Document(file_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+            blocks = ResumeParser._docx_blocks(data)
+            text = "\n".join(block_text for _, block_text in blocks)
             
             if not text.strip():
                 logger.warning("No text extracted from DOCX")
@@ -128,28 +456,199 @@ class ResumeParser:
             return None
     
     @staticmethod
-    def parse_resume(file_path: str) -> Optional[str]:
+    def _docx_blocks(data: bytes) -> List[Tuple[str, str]]:
         """
-        Parse resume file based on extension
+        Read (kind, text) blocks including tables, text boxes and headers/footers,
+        falling back to python-docx body paragraphs if the XML walk fails
+        """
+        try:
+            return read_docx_blocks(data)
+        except Exception as e:
+            logger.warning(f"DOCX XML walk failed, using python-docx paragraphs: {e}")
+            doc = Document(BytesIO(data))
+            return [('paragraph', paragraph.text) for paragraph in doc.paragraphs if paragraph.text]
+    
+    @staticmethod
+    def iter_pdf_pages(source: ResumeSource, max_pages: Optional[int] = None,
+                       pdf_reader: Optional["PyPDF2.PdfReader"] = None) -> Iterator[TextChunk]:
+        """
+        Yield PDF text one page at a time as it is extracted
+        
+        Weak pages get the same pdfplumber repair as parse_pdf, but pdfplumber
+        is only opened once the first weak page is seen; a file PyPDF2 cannot
+        open is read with pdfplumber throughout. Empty pages are skipped.
         
         Args:
-            file_path: Path to resume file
+            source: Path to PDF file, or its contents as bytes / file-like object
+            max_pages: Only read the first N pages (defaults to MAX_PDF_PAGES)
+            pdf_reader: Reader already opened over source, as for parse_pdf
+        """
+        data = ResumeParser._load_bytes(source)
+        if data is None:
+            return
+        
+        try:
+            if pdf_reader is None:
+                pdf_reader = _open_pdf_reader(data)
+            page_count = len(pdf_reader.pages)
+        except Exception as e:
+            if pdfplumber is None:
+                raise
+            # Same fallback as parse_pdf: read every page with pdfplumber
+            logger.error(f"PyPDF2 error: {e}")
+            pdf_reader = None
+        
+        plumber_pdf = None
+        offset = 0
+        index = 0
+        try:
+            if pdf_reader is None:
+                plumber_pdf = pdfplumber.open(BytesIO(data))
+                page_count = len(plumber_pdf.pages)
+            if max_pages is None:
+                max_pages = ResumeParser.MAX_PDF_PAGES
+            if max_pages:
+                page_count = min(page_count, max_pages)
             
+            for page_num in range(page_count):
+                if pdf_reader is None:
+                    text = plumber_pdf.pages[page_num].extract_text() or ""
+                else:
+                    text = _extract_page_texts(pdf_reader, page_num, page_num + 1)[0]
+                    quality = ResumeParser._text_quality(text)
+                    if quality < ResumeParser.MIN_PAGE_QUALITY and pdfplumber is not None:
+                        try:
+                            if plumber_pdf is None:
+                                plumber_pdf = pdfplumber.open(BytesIO(data))
+                            candidate = plumber_pdf.pages[page_num].extract_text() or ""
+                            if ResumeParser._text_quality(candidate) > quality:
+                                text = candidate
+                        except Exception as e:
+                            logger.warning(f"pdfplumber failed on page {page_num}: {e}")
+                
+                if not text:
+                    continue
+                yield TextChunk(index, 'page', text, offset, offset + len(text))
+                offset += len(text) + len(PAGE_BREAK)
+                index += 1
+        finally:
+            if plumber_pdf is not None:
+                plumber_pdf.close()
+    
+    @staticmethod
+    def iter_docx_blocks(source: ResumeSource) -> Iterator[TextChunk]:
+        """
+        Yield DOCX text one block at a time in reading order
+        
+        Blocks are header, paragraph, table_row, textbox and footer text, as
+        produced by the single-pass XML reader.
+        
+        Args:
+            source: Path to DOCX file, or its contents as bytes / file-like object
+        """
+        data = ResumeParser._load_bytes(source)
+        if data is None:
+            return
+        
+        offset = 0
+        for index, (kind, text) in enumerate(ResumeParser._docx_blocks(data)):
+            yield TextChunk(index, kind, text, offset, offset + len(text))
+            offset += len(text) + 1
+    
+    @staticmethod
+    def iter_resume(source: ResumeSource, filename: Optional[str] = None,
+                    max_pages: Optional[int] = None) -> Iterator[TextChunk]:
+        """
+        Stream a resume as TextChunks so downstream stages can start early
+        
+        Unlike parse_resume this bypasses the parse cache and never holds the
+        full joined text. Errors (including pre-flight rejections, as
+        ValueError) are raised rather than logged, since a partially consumed
+        generator cannot return None.
+        
+        Args:
+            source: Path to resume file, or its contents as bytes / memoryview /
+                file-like object
+            filename: Original filename, used to pick the parser when source
+                is not a path
+            max_pages: Only read the first N pages of a PDF
+        """
+        if filename is None and isinstance(source, (str, os.PathLike)):
+            filename = os.fspath(source)
+        
+        data = ResumeParser._load_bytes(source)
+        if data is None:
+            return
+        
+        file_extension = ResumeParser._detect_extension(data, filename)
+        is_valid, error_message, pdf_reader = ResumeParser._preflight_bytes(data, file_extension)
+        if not is_valid:
+            raise ValueError(error_message)
+        
+        if file_extension == '.pdf':
+            yield from ResumeParser.iter_pdf_pages(data, max_pages=max_pages, pdf_reader=pdf_reader)
+        else:
+            yield from ResumeParser.iter_docx_blocks(data)
+    
+    @staticmethod
+    def parse_resume(source: ResumeSource, filename: Optional[str] = None,
+                     max_pages: Optional[int] = None, raise_rejected: bool = False) -> Optional[str]:
+        """
+        Parse resume file based on extension
+        
+        The pre-flight check (see preflight) always runs first, so callers
+        do not need to call preflight themselves.
+        
+        Args:
+            source: Path to resume file, or its contents as bytes / memoryview /
+                file-like object (no temporary file is written)
+            filename: Original filename, used to pick the parser when source
+                is not a path. If omitted the type is sniffed from the content.
+            max_pages: Only read the first N pages of a PDF
+            raise_rejected: Raise when the pre-flight check rejects the file
+                instead of returning None, so the reason can be shown
+        
         Returns:
             Extracted text or None if error
+        
+        Raises:
+            ValueError: With the rejection reason, if raise_rejected is set
         """
-        if not os.path.exists(file_path):
-            logger.error(f"File not found: {file_path}")
+        if filename is None and isinstance(source, (str, os.PathLike)):
+            filename = os.fspath(source)
+        
+        try:
+            data = ResumeParser._load_bytes(source)
+        except OSError as e:
+            logger.error(f"Error reading file: {e}")
+            return None
+        if data is None:
             return None
         
-        file_extension = os.path.splitext(file_path)[1].lower()
+        file_extension = ResumeParser._detect_extension(data, filename)
         logger.info(f"Parsing file with extension: {file_extension}")
         
+        is_valid, error_message, pdf_reader = ResumeParser._preflight_bytes(data, file_extension)
+        if not is_valid:
+            logger.error(f"Rejected resume: {error_message}")
+            if raise_rejected:
+                raise ValueError(error_message)
+            return None
+        
+        # Look up the content hash before doing any extraction work
+        if max_pages is None:
+            max_pages = ResumeParser.MAX_PDF_PAGES
+        cache_key = ParseCache.make_key(data, f"{ResumeParser.PARSER_VERSION}:{max_pages}")
+        cached_text = ResumeParser.cache.get(cache_key)
+        if cached_text is not None:
+            logger.info("Parse cache hit")
+            return cached_text
+        
         if file_extension == '.pdf':
-            return ResumeParser.parse_pdf(file_path)
-        elif file_extension in ['.docx', '.doc']:
-            return ResumeParser.parse_docx(file_path)
+            text = ResumeParser.parse_pdf(data, max_pages=max_pages, pdf_reader=pdf_reader)
         else:
-            logger.error(f"Unsupported file format: {file_extension}")
-            return None
-
+            text = ResumeParser.parse_docx(data)
+        
+        if text:
+            ResumeParser.cache.put(cache_key, text)
+        return text
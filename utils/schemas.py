@@ -0,0 +1,335 @@
+"""
+Schemas Module
+Typed shapes of the JSON returned by the LLM, with coercion and validation
+"""
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import json
+import re
+
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+_LIST_SEPARATOR = re.compile(r'\s*(?:\n|;|,)\s*')
+_BULLET = re.compile(r'^\s*(?:[-*•]|\d+[.)])\s*')
+
+
+class Field(NamedTuple):
+    """One field of a Schema"""
+    kind: Any  # str, float, list, dict, or object for anything
+    required: bool = False
+    of: Any = None  # element type or Schema of a list; Schema of a dict
+    choices: Optional[Tuple[str, ...]] = None
+    bounds: Optional[Tuple[float, float]] = None  # numbers are clamped into this range
+    description: str = ""  # shown to the model when the field has to be fixed
+
+
+def _default(field: Field) -> Any:
+    if field.choices:
+        return field.choices[0]
+    return {str: "", float: 0, list: [], dict: {}}.get(field.kind)
+
+
+def _split_list(text: str) -> List[str]:
+    """'a, b, c' or one item per line -> items; other text is a single item"""
+    if '\n' in text:
+        parts = text.split('\n')
+    else:
+        parts = _LIST_SEPARATOR.split(text)
+        # Commas inside a sentence do not separate items
+        if any(len(part.split()) > 4 for part in parts):
+            parts = [text]
+    return [_BULLET.sub('', part).strip() for part in parts if part.strip()]
+
+
+class Schema:
+    """
+    Expected shape of one kind of LLM answer
+    
+    validate() coerces what it safely can (numbers sent as strings, a
+    comma-separated string where a list is expected, a bare object where a
+    list of objects is expected, scores out of range) and reports the rest,
+    so that only the fields that are actually broken need to be asked for again.
+    Keys the schema does not know are passed through unchanged.
+    """
+    
+    def __init__(self, name: str, fields: Dict[str, Field]):
+        self.name = name
+        self.fields = fields
+    
+    def subset(self, keys: Iterable[str]) -> 'Schema':
+        """Schema restricted to some of the fields (e.g. the ones that were requested)"""
+        return Schema(self.name, {key: self.fields[key] for key in keys if key in self.fields})
+    
+    def validate(self, data: Any) -> Tuple[Dict, Dict[str, str]]:
+        """
+        Check an answer against the schema
+        
+        Args:
+            data: Parsed JSON
+        
+        Returns:
+            (cleaned copy, {path: problem}). Invalid fields are replaced by an
+            empty value of their type in the cleaned copy.
+        
+        Raises:
+            ValueError: If data is not a JSON object at all
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"{self.name}: expected a JSON object, got {type(data).__name__}")
+        errors: Dict[str, str] = {}
+        return self._validate(data, "", errors), errors
+    
+    def _validate(self, data: Dict, prefix: str, errors: Dict[str, str]) -> Dict:
+        cleaned = dict(data)
+        for key, field in self.fields.items():
+            if data.get(key) is None and not field.required:
+                continue
+            cleaned[key] = _coerce(data.get(key), field, prefix + key, errors)
+        return cleaned
+    
+    @staticmethod
+    def failing_fields(errors: Dict[str, str]) -> List[str]:
+        """Top-level fields with at least one problem, in order"""
+        fields = []
+        for path in errors:
+            field = re.split(r'[.\[]', path, maxsplit=1)[0]
+            if field not in fields:
+                fields.append(field)
+        return fields
+    
+    def describe(self, keys: Optional[Iterable[str]] = None) -> Dict:
+        """JSON sketch of the expected shape, for prompts"""
+        keys = self.fields if keys is None else keys
+        return {key: _describe(self.fields[key]) for key in keys if key in self.fields}
+    
+    def fix_prompt(self, prompt: str, data: Dict, errors: Dict[str, str]) -> str:
+        """
+        Follow-up prompt asking only for the fields that failed validation
+        
+        The original prompt is repeated so the model has the source material,
+        but it only has to write the broken fields.
+        """
+        fields = self.failing_fields(errors)
+        problems = "\n".join(f"- {path}: {problem}" for path, problem in errors.items())
+        previous = {field: data.get(field) for field in fields}
+        return f"""{prompt}
+
+Your previous answer to the request above had these problems:
+{problems}
+
+The invalid fields were:
+{json.dumps(previous, indent=2)}
+
+Return ONLY a JSON object with corrected values for these fields and no others, in this shape:
+{json.dumps(self.describe(fields), indent=2)}
+"""
+
+
+def _coerce(value: Any, field: Field, path: str, errors: Dict[str, str]) -> Any:
+    """Value converted to the field's type; problems are added to errors"""
+    if value is None:
+        errors[path] = "missing"
+        return _default(field)
+    kind = field.kind
+    
+    if kind is str:
+        if isinstance(value, bool) or not isinstance(value, (str, int, float, list)):
+            errors[path] = "expected a string"
+            return _default(field)
+        if isinstance(value, list):
+            if not all(isinstance(item, str) for item in value):
+                errors[path] = "expected a string"
+                return _default(field)
+            value = " ".join(value)
+        value = str(value)
+        if field.choices:
+            if value.strip().lower() not in field.choices:
+                # A label outside the list is not worth a follow-up unless required
+                if field.required:
+                    errors[path] = f"expected one of {', '.join(field.choices)}"
+                return _default(field)
+            value = value.strip().lower()
+        return value
+    
+    if kind is float:
+        if isinstance(value, str):
+            match = _NUMBER.search(value)
+            value = float(match.group(0)) if match else None
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            errors[path] = "expected a number"
+            return _default(field)
+        if field.bounds:
+            value = min(max(value, field.bounds[0]), field.bounds[1])
+        return int(value) if float(value).is_integer() else value
+    
+    if kind is list:
+        if isinstance(value, str) and field.of is str:
+            value = _split_list(value)
+        elif isinstance(value, dict) and isinstance(field.of, Schema):
+            value = [value]
+        if not isinstance(value, list):
+            errors[path] = "expected a list"
+            return _default(field)
+        items = []
+        for index, item in enumerate(value):
+            item_errors: Dict[str, str] = {}
+            item = _coerce_item(item, field.of, f"{path}[{index}]", item_errors)
+            if item_errors:
+                errors.update(item_errors)
+            if item is not None:
+                items.append(item)
+        return items
+    
+    if kind is dict:
+        if not isinstance(value, dict):
+            errors[path] = "expected an object"
+            return _default(field)
+        if isinstance(field.of, Schema):
+            return field.of._validate(value, path + ".", errors)
+        return value
+    
+    return value
+
+
+def _coerce_item(item: Any, of: Any, path: str, errors: Dict[str, str]) -> Any:
+    """One list element; None when it has to be dropped"""
+    if of is None:
+        return item
+    if isinstance(of, Schema):
+        if not isinstance(item, dict):
+            errors[path] = "expected an object"
+            return None
+        return of._validate(item, path + ".", errors)
+    if item is None or (of is str and isinstance(item, str) and not item.strip()):
+        return None
+    before = len(errors)
+    item = _coerce(item, Field(of), path, errors)
+    return item if len(errors) == before else None
+
+
+def _describe(field: Field) -> Any:
+    if field.description:
+        return field.description
+    if field.choices:
+        return "|".join(field.choices)
+    if field.kind is str:
+        return "string"
+    if field.kind is float:
+        return f"number {field.bounds[0]:g}-{field.bounds[1]:g}" if field.bounds else "number"
+    if field.kind is list:
+        if isinstance(field.of, Schema):
+            return [field.of.describe()]
+        return [_describe(Field(field.of))] if field.of is not None else []
+    if field.kind is dict:
+        return field.of.describe() if isinstance(field.of, Schema) else {}
+    return "any JSON value"
+
+
+_STRINGS = Field(list, of=str)
+
+EDUCATION_SCHEMA = Schema("education", {
+    "degree": Field(str),
+    "institution": Field(str),
+    "year": Field(str),
+    "gpa": Field(str),
+    "relevant_coursework": _STRINGS,
+})
+
+EXPERIENCE_SCHEMA = Schema("experience", {
+    "title": Field(str, required=True),
+    "company": Field(str),
+    "duration": Field(str),
+    "responsibilities": _STRINGS,
+    "achievements": _STRINGS,
+})
+
+PROJECT_SCHEMA = Schema("project", {
+    "name": Field(str, required=True),
+    "description": Field(str),
+    "technologies": _STRINGS,
+    "achievements": _STRINGS,
+})
+
+# Resume data as extracted from an upload and kept in session state
+RESUME_SCHEMA = Schema("resume", {
+    "name": Field(str),
+    "email": Field(str),
+    "phone": Field(str),
+    "target_role": Field(str),
+    "professional_summary": Field(str),
+    "skills": Field(list, of=str),
+    "experience": Field(list, of=EXPERIENCE_SCHEMA),
+    "education": Field(list, of=EDUCATION_SCHEMA),
+    "projects": Field(list, of=PROJECT_SCHEMA),
+    "certifications": _STRINGS,
+    "languages": _STRINGS,
+})
+
+# Output of generate_resume_content
+GENERATED_RESUME_SCHEMA = Schema("generated resume", {
+    "professional_summary": Field(str, required=True),
+    "skills": Field(dict, required=True, of=Schema("skills", {
+        "technical": Field(list, required=True, of=str),
+        "soft": _STRINGS,
+    })),
+    "experience": Field(list, of=EXPERIENCE_SCHEMA),
+    "education": Field(list, of=EDUCATION_SCHEMA),
+    "projects": Field(list, of=PROJECT_SCHEMA),
+    "certifications": _STRINGS,
+    "keywords": _STRINGS,
+})
+
+SCORE_CATEGORIES = ("content", "format", "optimization", "best_practices", "application_ready")
+
+_ISSUE_SCHEMA = Schema("issue", {
+    "severity": Field(str, choices=("warning", "error", "info")),
+    "message": Field(str, required=True),
+    "detail": Field(str),
+    "section": Field(str),
+})
+
+_BREAKDOWN_ITEM = Schema("breakdown item", {
+    "score": Field(float, required=True),
+    "max": Field(float),
+})
+
+# Output of calculate_ats_score (overall_score is computed locally)
+SCORE_SCHEMA = Schema("ATS score", {
+    "category_scores": Field(dict, required=True, of=Schema("category scores", {
+        category: Field(float, required=True, bounds=(0, 100)) for category in SCORE_CATEGORIES
+    })),
+    "breakdown": Field(dict, of=Schema("breakdown", {
+        item: Field(dict, of=_BREAKDOWN_ITEM) for item in (
+            "keyword_match", "skills_alignment", "experience_relevance", "formatting", "completeness"
+        )
+    })),
+    "strengths": Field(list, required=True, of=str),
+    "improvements": Field(dict, required=True, of=Schema("improvements", {
+        category: Field(list, of=_ISSUE_SCHEMA) for category in SCORE_CATEGORIES
+    })),
+    "missing_keywords": _STRINGS,
+    "summary": Field(str, required=True),
+})
+
+# Output of ResumeAgent.process_command
+EDIT_SCHEMA = Schema("edit", {
+    "section": Field(str, required=True),
+    "action": Field(str),
+    "updated_content": Field(object, required=True, description="the new content of the section"),
+    "explanation": Field(str),
+    "change_type": Field(str, choices=("modify", "add", "remove", "optimize")),
+})
+
+_PATCH_OPERATION = Schema("patch operation", {
+    "op": Field(str, required=True, choices=("add", "remove", "replace", "move", "copy", "test")),
+    "path": Field(str, required=True),
+    "from": Field(str),
+    "value": Field(object),
+})
+
+# Output of ResumeAgent's single-section edits: a JSON Patch against the section
+PATCH_EDIT_SCHEMA = Schema("patch edit", {
+    "action": Field(str),
+    "patch": Field(list, required=True, of=_PATCH_OPERATION),
+    "explanation": Field(str),
+    "change_type": Field(str, choices=("modify", "add", "remove", "optimize")),
+})
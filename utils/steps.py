@@ -0,0 +1,58 @@
+"""
+Steps Module
+One implementation of a multi-call LLM flow, run either blocking or awaited
+"""
+
+from typing import Any, Generator, NamedTuple
+import inspect
+
+
+class Step(NamedTuple):
+    """A method call a flow needs made: getattr(target, method)(*args, **kwargs)"""
+    method: str
+    args: tuple
+    kwargs: dict
+
+
+def call(method: str, *args, **kwargs) -> Step:
+    return Step(method, args, kwargs)
+
+
+# A flow is a generator that yields Steps, receives each call's result (or
+# has its exception thrown in at the yield) and returns the flow's result.
+# Prompt building, parsing, validation and error handling live in the flow.
+# AIHelper runs its flows blocking against itself; AsyncAIHelper awaits the
+# same flows against its own async implementations of the yielded calls.
+Flow = Generator[Step, Any, Any]
+
+
+def run_steps(target: Any, flow: Flow) -> Any:
+    """Run a flow, making each call on target and blocking until it returns"""
+    result, error = None, None
+    while True:
+        try:
+            step = flow.send(result) if error is None else flow.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        result, error = None, None
+        try:
+            result = getattr(target, step.method)(*step.args, **step.kwargs)
+        except Exception as e:
+            error = e
+
+
+async def arun_steps(target: Any, flow: Flow) -> Any:
+    """Run a flow, awaiting each call on target whose method is a coroutine function"""
+    result, error = None, None
+    while True:
+        try:
+            step = flow.send(result) if error is None else flow.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        result, error = None, None
+        try:
+            result = getattr(target, step.method)(*step.args, **step.kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+        except Exception as e:
+            error = e
@@ -0,0 +1,197 @@
+"""
+Streaming JSON Module
+Incremental parser that surfaces fields of a JSON object while it streams in
+"""
+
+from typing import Any, List, Tuple
+import json
+
+# (path, value): path is (key,) for a finished top-level field and
+# (key, index) for a finished element of a top-level array
+FieldEvent = Tuple[tuple, Any]
+# Path of the event AIHelper reports (with value None) when a stream is
+# retried: every field reported before it came from the abandoned attempt
+RESTART_PATH = ()
+
+_WHITESPACE = ' \t\r\n'
+
+# Returned by _loads for text that is not valid JSON
+_INVALID = object()
+
+
+class IncrementalJSONParser:
+    """
+    Feed completion text chunk by chunk and get back every field that closed
+    
+    Only the outermost object is tracked: a top-level field is reported once
+    its value is complete, and elements of top-level arrays (e.g. each
+    experience entry) are reported as soon as they close, before the array
+    itself. Text before the first "{" (such as a ```json fence) is skipped.
+    Values that do not parse on their own are not reported; the caller still
+    parses the full text once the stream ends.
+    """
+    
+    def __init__(self):
+        self.buffer = ""
+        self.fields = {}
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect = 'start'  # start, key, colon, value, scalar, comma
+        self._key = None
+        self._key_start = 0
+        self._value_start = 0
+        self._array = False
+        self._item_start = None
+        self._item_scalar = False
+        self._item_index = 0
+    
+    def feed(self, chunk: str) -> List[FieldEvent]:
+        """
+        Add a chunk of text
+        
+        Args:
+            chunk: Next piece of the completion
+        
+        Returns:
+            Fields completed by this chunk, in order
+        """
+        self.buffer += chunk
+        events: List[FieldEvent] = []
+        buffer = self.buffer
+        
+        for i in range(self._pos, len(buffer)):
+            if self.done:
+                break
+            c = buffer[i]
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._string_closed(i, events)
+                continue
+            
+            if self._expect == 'start':
+                if c == '{':
+                    self._depth = 1
+                    self._expect = 'key'
+                continue
+            
+            if self._depth == 1:
+                self._top_level(c, i, events)
+            elif self._array and self._depth == 2:
+                self._array_level(c, i, events)
+            elif c == '"':
+                self._in_string = True
+            elif c in '{[':
+                self._depth += 1
+            elif c in '}]':
+                self._depth -= 1
+                self._container_closed(i, events)
+        
+        self._pos = len(buffer)
+        return events
+    
+    def _top_level(self, c: str, i: int, events: List[FieldEvent]):
+        expect = self._expect
+        if expect == 'key':
+            if c == '"':
+                self._key_start = i
+                self._in_string = True
+            elif c == '}':
+                self.done = True
+        elif expect == 'colon':
+            if c == ':':
+                self._expect = 'value'
+        elif expect == 'value':
+            if c in _WHITESPACE:
+                return
+            self._value_start = i
+            if c == '"':
+                self._in_string = True
+            elif c in '{[':
+                self._depth = 2
+                self._array = c == '['
+                self._item_start = None
+                self._item_index = 0
+            else:
+                self._expect = 'scalar'
+        elif expect == 'scalar':
+            if c in ',}':
+                self._emit((self._key,), self.buffer[self._value_start:i], events)
+                self._expect = 'key'
+                self.done = c == '}'
+        elif expect == 'comma':
+            if c == ',':
+                self._expect = 'key'
+            elif c == '}':
+                self.done = True
+    
+    def _array_level(self, c: str, i: int, events: List[FieldEvent]):
+        """Characters directly inside a top-level array"""
+        if self._item_start is not None and self._item_scalar:
+            if c in ',]':
+                self._finish_item(i, events)
+            else:
+                return
+        if c in _WHITESPACE or c == ',':
+            return
+        if c == ']':
+            self._depth = 1
+            self._array = False
+            self._emit((self._key,), self.buffer[self._value_start:i + 1], events)
+            self._expect = 'comma'
+            return
+        self._item_start = i
+        self._item_scalar = False
+        if c == '"':
+            self._in_string = True
+        elif c in '{[':
+            self._depth = 3
+        else:
+            self._item_scalar = True
+    
+    def _string_closed(self, i: int, events: List[FieldEvent]):
+        if self._depth == 1:
+            if self._expect == 'key':
+                self._key = self._loads(self.buffer[self._key_start:i + 1])
+                self._expect = 'colon'
+            else:
+                self._emit((self._key,), self.buffer[self._value_start:i + 1], events)
+                self._expect = 'comma'
+        elif self._array and self._depth == 2:
+            self._finish_item(i + 1, events)
+    
+    def _container_closed(self, i: int, events: List[FieldEvent]):
+        if self._depth == 1:
+            self._emit((self._key,), self.buffer[self._value_start:i + 1], events)
+            self._expect = 'comma'
+        elif self._array and self._depth == 2:
+            self._finish_item(i + 1, events)
+    
+    def _finish_item(self, end: int, events: List[FieldEvent]):
+        self._emit((self._key, self._item_index), self.buffer[self._item_start:end], events, store=False)
+        self._item_index += 1
+        self._item_start = None
+        self._item_scalar = False
+    
+    def _emit(self, path: tuple, text: str, events: List[FieldEvent], store: bool = True):
+        value = self._loads(text)
+        if value is _INVALID:
+            return
+        if store:
+            self.fields[path[0]] = value
+        events.append((path, value))
+    
+    def _loads(self, text: str) -> Any:
+        """json.loads that returns _INVALID instead of raising"""
+        try:
+            return json.loads(text.strip())
+        except ValueError:
+            return _INVALID
@@ -1,8 +1,13 @@
 """
 Resume Templates Module
-Provides different resume templates/styles
+Provides different resume templates/styles, and the compiled markup and
+per-template stylesheets used to render the resume preview
 """
 
+from typing import Dict, List, Tuple
+import html as html_module
+import re
+
 TEMPLATES = {
     "professional": {
         "name": "Professional",
@@ -82,19 +87,109 @@ def get_all_templates():
     """Get all available templates"""
     return TEMPLATES
 
-def apply_template_to_html(html: str, template_name: str = "professional"):
-    """Apply template styling to resume HTML"""
-    template = get_template(template_name)
+
+_PLACEHOLDER = re.compile(r'\{\{\s*(\w+)\s*(\|\s*raw\s*)?\}\}')
+
+
+class CompiledTemplate:
+    """
+    Markup with {{field}} placeholders, split into segments once
+    
+    {{field}} is HTML-escaped on render; {{field|raw}} inserts already
+    rendered markup. Rendering is a single join over the segments.
+    """
     
-    # Replace color placeholders
-    html = html.replace("#2c3e50", template["colors"]["primary"])
-    html = html.replace("#3498db", template["colors"]["secondary"])
-    html = html.replace("#000", template["colors"]["text"])
-    html = html.replace("white", template["colors"]["background"])
+    def __init__(self, source: str):
+        self.source = source
+        self._segments: List[Tuple[str, str, bool]] = []  # (literal before, field, raw)
+        position = 0
+        for match in _PLACEHOLDER.finditer(source):
+            self._segments.append((source[position:match.start()], match.group(1), bool(match.group(2))))
+            position = match.end()
+        self._tail = source[position:]
     
-    # Replace font placeholders
-    html = html.replace("'Arial', 'Helvetica', sans-serif", template["fonts"]["header"])
-    html = html.replace("11pt", template["fonts"]["size_body"])
-    html = html.replace("24pt", template["fonts"]["size_header"])
+    @property
+    def fields(self) -> List[str]:
+        return [field for _, field, _ in self._segments]
     
-    return html
+    def render(self, **values) -> str:
+        """Fill the placeholders; missing or None values render as empty"""
+        parts = []
+        for literal, field, raw in self._segments:
+            parts.append(literal)
+            value = values.get(field)
+            if value is not None:
+                parts.append(str(value) if raw else html_module.escape(str(value)))
+        parts.append(self._tail)
+        return ''.join(parts)
+
+
+# Class-based resume markup shared by every template; the look comes from the stylesheet
+FRAGMENTS = {name: CompiledTemplate(source) for name, source in {
+    "page": '<style>{{stylesheet|raw}}</style><div class="resume-page">{{body|raw}}</div>',
+    "header": '<div class="resume-header{{highlight}}"><h1 class="resume-name">{{name}}</h1>'
+              '<p class="resume-contact">{{contact}}</p>{{target_role|raw}}</div>',
+    "target_role": '<p class="resume-contact resume-target">Target Role: {{role}}</p>',
+    "section": '<div class="resume-section{{highlight}}"><h2 class="resume-section-title">{{title}}</h2>{{body|raw}}</div>',
+    "summary": '<p class="resume-summary">{{text}}</p>',
+    "skills": '<p class="resume-skills">{{skills}}</p>',
+    "skill_group": '<p class="resume-skills"><strong>{{label}}:</strong> {{skills}}</p>',
+    "entry_text": '<div class="resume-entry"><p>{{text}}</p></div>',
+    "job": '<div class="resume-entry"><p class="resume-entry-title">{{title}} | {{company}}</p>'
+           '<p class="resume-entry-meta resume-duration">{{duration}}</p>{{bullets|raw}}</div>',
+    "project": '<div class="resume-entry"><p class="resume-entry-title">{{name}}</p>{{details|raw}}{{bullets|raw}}</div>',
+    "technologies": '<p class="resume-entry-meta"><em>Technologies: {{technologies}}</em></p>',
+    "description": '<p class="resume-entry-text">{{text}}</p>',
+    "degree": '<div class="resume-entry resume-degree"><p class="resume-entry-title">{{degree}} | {{institution}}</p>'
+              '<p class="resume-entry-meta">{{details}}</p></div>',
+    "bullets": '<ul class="resume-bullets">{{items|raw}}</ul>',
+    "bullet": '<li>{{text}}</li>',
+}.items()}
+
+_STYLESHEET = """
+.resume-page {{ background: {background}; width: 100%; max-width: 794px; min-height: 1123px; margin: 0 auto;
+    padding: 50px 60px; box-shadow: 0 0 15px rgba(0,0,0,0.1); font-family: {body_font}; font-size: {size_body};
+    line-height: 1.6; color: {text}; box-sizing: border-box; }}
+.resume-page p {{ margin: 0; }}
+.resume-header {{ text-align: center; margin-bottom: 20px; padding: 10px; }}
+.resume-name {{ margin: 0; font-family: {header_font}; font-size: {size_header}; font-weight: bold; color: {primary}; }}
+.resume-page .resume-contact {{ margin: 5px 0 0 0; font-size: 10pt; color: #555; }}
+.resume-page .resume-target {{ font-style: italic; }}
+.resume-section {{ margin-bottom: 20px; }}
+.resume-section-title {{ font-family: {header_font}; font-size: 14pt; font-weight: bold; color: {primary}; margin: 0 0 8px 0;
+    border-bottom: 2px solid {secondary}; padding-bottom: 4px; }}
+.resume-page .resume-summary {{ text-align: justify; }}
+.resume-page .resume-skills {{ margin: 4px 0; }}
+.resume-entry {{ margin-bottom: 12px; }}
+.resume-entry-title {{ font-weight: bold; }}
+.resume-page .resume-entry-meta {{ margin: 2px 0; font-size: 9pt; color: #666; }}
+.resume-page .resume-duration {{ margin-bottom: 6px; font-style: italic; }}
+.resume-page .resume-entry-text {{ margin: 4px 0; }}
+.resume-degree {{ margin-bottom: 8px; }}
+.resume-bullets {{ margin: 0; padding-left: 20px; }}
+.resume-bullets li {{ margin-bottom: 4px; }}
+.highlighted {{ background-color: #fff3cd; border-left: 4px solid #ffc107; padding-left: 10px; }}
+"""
+
+
+def _compile_stylesheet(template: Dict) -> str:
+    colors, fonts = template["colors"], template["fonts"]
+    return _STYLESHEET.format(
+        background=colors["background"], text=colors["text"], primary=colors["primary"], secondary=colors["secondary"],
+        header_font=fonts["header"], body_font=fonts["body"], size_header=fonts["size_header"], size_body=fonts["size_body"]
+    )
+
+
+# Compiled once at import, so switching templates only swaps the stylesheet
+STYLESHEETS = {name: _compile_stylesheet(template) for name, template in TEMPLATES.items()}
+
+
+def render_fragment(fragment: str, **values) -> str:
+    """Render one piece of resume markup (see FRAGMENTS)"""
+    return FRAGMENTS[fragment].render(**values)
+
+
+def render_page(body: str, template_name: str = "professional") -> str:
+    """Wrap rendered resume sections in an A4 page styled by the template"""
+    stylesheet = STYLESHEETS.get(template_name, STYLESHEETS["professional"])
+    return FRAGMENTS["page"].render(stylesheet=stylesheet, body=body)
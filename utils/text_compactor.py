@@ -0,0 +1,157 @@
+"""
+Text Compactor Module
+Shrinks parsed resume text before it is pasted into an LLM prompt
+"""
+
+from collections import Counter
+from typing import Dict, List, Set, Tuple
+import re
+
+# Page furniture that carries no resume content
+BOILERPLATE_PATTERNS = [
+    re.compile(r'^page\s*\d+(\s*(of|/)\s*\d+)?$', re.IGNORECASE),
+    re.compile(r'^(curriculum vitae|resume|résumé|cv)$', re.IGNORECASE),
+    re.compile(r'^references?( are)? available (up)?on request\.?$', re.IGNORECASE),
+    re.compile(r'^confidential$', re.IGNORECASE),
+]
+# Bare page numbers ("3", "- 3 -", "3 / 4"); only page furniture at a page edge,
+# inside a page the same line can be a figure or a score
+PAGE_NUMBER_PATTERNS = [
+    re.compile(r'^[-–—\s]*\d{1,3}[-–—\s]*$'),
+    re.compile(r'^\d+\s*/\s*\d+$'),
+]
+
+_INVISIBLE = dict.fromkeys(map(ord, '\u200b\u200c\u200d\ufeff\u00ad'), None)
+_SPACES = re.compile(r'[ \t\u00a0\u2000-\u200a\u202f\u3000]+')
+_HYPHEN_BREAK = re.compile(r'\b([A-Za-z]+)-\n\s*([a-z]+)')
+_HYPHENATED = re.compile(r'\b[A-Za-z]+-[A-Za-z]+\b')
+_WORD = re.compile(r'\b[A-Za-z]+\b')
+# First halves of compounds that keep their hyphen when broken at a line end
+# ("self-\nmotivated", "full-\nstack")
+COMPOUND_HEADS = {
+    'self', 'full', 'part', 'well', 'high', 'low', 'long', 'short', 'cross', 'multi', 'non',
+    'end', 'real', 'front', 'back', 'detail', 'results', 'data', 'client', 'customer', 'user',
+    'team', 'fast', 'open', 'hands', 'problem', 'goal', 'cost', 'time', 'world', 'best',
+    'state', 'cutting', 'hard', 'quick', 'forward', 'cloud', 'mission', 'award',
+}
+
+# ResumeParser separates PDF pages with a form feed (PAGE_BREAK)
+_PAGE_BREAK = '\f'
+# Lines this close to the top or bottom of a page can be running headers/footers
+EDGE_LINES = 2
+# ...when the same line sits at the edge of at least this many pages
+REPEAT_PAGES = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)"""
+    return (len(text) + 3) // 4
+
+
+def compact_resume_text(text: str) -> Tuple[str, Dict]:
+    """
+    Normalize resume text for prompting
+    
+    Rejoins words hyphenated across line breaks, drops page numbers at page
+    edges and other boilerplate, removes running headers/footers, and
+    collapses whitespace and blank lines. A line only counts as a running
+    header or footer when it repeats among the first or last EDGE_LINES
+    lines of several pages; repeats inside a page (job titles, bullets) are kept.
+    
+    Args:
+        text: Raw text from ResumeParser (PDF pages separated by PAGE_BREAK)
+    
+    Returns:
+        Tuple of (compacted text, stats dict with character and estimated
+        token counts before/after and the tokens saved)
+    """
+    original = text or ""
+    text = original.translate(_INVISIBLE).replace('\r\n', '\n').replace('\r', '\n')
+    text = _rejoin_hyphenated(text)
+    
+    pages = [[_SPACES.sub(' ', line).strip() for line in page.split('\n')] for page in text.split(_PAGE_BREAK)]
+    page_numbers = [_page_number_lines(page) for page in pages]
+    edges = [_edge_lines(page, numbers) for page, numbers in zip(pages, page_numbers)]
+    # Number of pages each line appears at the edge of
+    page_counts = Counter()
+    for page, page_edges in zip(pages, edges):
+        page_counts.update({page[index].lower() for index in page_edges})
+    running = {key for key, count in page_counts.items() if count >= REPEAT_PAGES}
+    
+    kept = []
+    seen = set()
+    removed_boilerplate = 0
+    removed_duplicates = 0
+    for page, page_edges, numbers in zip(pages, edges, page_numbers):
+        for index, line in enumerate(page):
+            if not line:
+                if kept and kept[-1]:
+                    kept.append('')
+                continue
+            if index in numbers or _is_boilerplate(line):
+                removed_boilerplate += 1
+                continue
+            key = line.lower()
+            if index in page_edges and key in running:
+                # Keep the first copy: on page one it is usually real content (the name line)
+                if key in seen:
+                    removed_duplicates += 1
+                    continue
+                seen.add(key)
+            kept.append(line)
+    
+    compacted = '\n'.join(kept).strip()
+    
+    original_tokens = estimate_tokens(original)
+    compacted_tokens = estimate_tokens(compacted)
+    stats = {
+        "original_chars": len(original),
+        "compacted_chars": len(compacted),
+        "original_tokens": original_tokens,
+        "compacted_tokens": compacted_tokens,
+        "saved_tokens": original_tokens - compacted_tokens,
+        "saved_percent": round(100 * (original_tokens - compacted_tokens) / original_tokens, 1) if original_tokens else 0.0,
+        "removed_boilerplate_lines": removed_boilerplate,
+        "removed_duplicate_lines": removed_duplicates
+    }
+    return compacted, stats
+
+
+def _rejoin_hyphenated(text: str) -> str:
+    """
+    Rejoin words split across a line break, keeping real compounds
+    
+    "pipe-\nline" becomes "pipeline", but "self-\nmotivated" stays
+    "self-motivated": the hyphen is kept when the first half is a known
+    compound head, or when the document spells the word hyphenated
+    elsewhere and never as one word.
+    """
+    words = {word.lower() for word in _WORD.findall(text)}
+    hyphenated = {word.lower() for word in _HYPHENATED.findall(text)}
+    
+    def rejoin(match: re.Match) -> str:
+        head, tail = match.group(1), match.group(2)
+        joined = (head + tail).lower()
+        if joined not in words and (f"{head}-{tail}".lower() in hyphenated or head.lower() in COMPOUND_HEADS):
+            return f"{head}-{tail}"
+        return head + tail
+    
+    return _HYPHEN_BREAK.sub(rejoin, text)
+
+
+def _is_boilerplate(line: str) -> bool:
+    return any(pattern.match(line) for pattern in BOILERPLATE_PATTERNS)
+
+
+def _page_number_lines(page: List[str]) -> Set[int]:
+    """Indices of bare page numbers among the first and last EDGE_LINES lines of a page"""
+    content = [index for index, line in enumerate(page) if line and not _is_boilerplate(line)]
+    return {index for index in content[:EDGE_LINES] + content[-EDGE_LINES:]
+            if any(pattern.match(page[index]) for pattern in PAGE_NUMBER_PATTERNS)}
+
+
+def _edge_lines(page: List[str], page_numbers: Set[int]) -> Set[int]:
+    """Indices of the first and last EDGE_LINES content lines of a page"""
+    content = [index for index, line in enumerate(page)
+               if line and index not in page_numbers and not _is_boilerplate(line)]
+    return set(content[:EDGE_LINES] + content[-EDGE_LINES:])
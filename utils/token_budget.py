@@ -0,0 +1,89 @@
+"""
+Token Budget Module
+Picks max_tokens per call from the expected output size and past completions
+"""
+
+from collections import deque
+from typing import Any, Dict, Optional
+import json
+import threading
+
+from .text_compactor import estimate_tokens
+
+# Output sizes the estimators below assume (tokens)
+SCORE_EXPECTED_TOKENS = 900
+SUGGEST_EXPECTED_TOKENS = 250
+EDIT_OVERHEAD_TOKENS = 120
+
+
+def expected_extraction_tokens(resume_text: str, requested_fields: int, total_fields: int) -> int:
+    """Extraction output is roughly the resume itself, restricted to the requested fields"""
+    share = max(0.3, requested_fields / total_fields) if total_fields else 1.0
+    return int(estimate_tokens(resume_text) * share) + 150
+
+
+def expected_generation_tokens(user_data: Dict) -> int:
+    """Summary, skills and projects plus a block per experience/education entry"""
+    experience = len(user_data.get('experience') or [])
+    education = len(user_data.get('education') or [])
+    return 700 + 250 * experience + 80 * education
+
+
+def expected_edit_tokens(section_content: Any) -> int:
+    """The edited section is returned whole, plus action/explanation text"""
+    if section_content is None:
+        return 600
+    return int(estimate_tokens(json.dumps(section_content)) * 1.3) + EDIT_OVERHEAD_TOKENS
+
+
+class TokenBudgeter:
+    """
+    Learns how far real completions land from the estimates above
+    
+    For each task it keeps the ratio observed/expected of recent calls and
+    budgets expected * (90th percentile ratio) * headroom, clamped to
+    [min_tokens, the route's max_tokens]. A completion cut off by the limit
+    is retried with twice the budget (see AIHelper._fetch_flow).
+    """
+    
+    def __init__(self, headroom: float = 1.25, min_tokens: int = 256, history: int = 50):
+        self.headroom = headroom
+        self.min_tokens = min_tokens
+        self._ratios: Dict[str, deque] = {}
+        self._history = history
+        self._lock = threading.Lock()
+        self.stats = {"budgeted_calls": 0, "budgeted_tokens": 0, "truncations": 0}
+    
+    def _ratio(self, task: Optional[str]) -> float:
+        ratios = sorted(self._ratios.get(task or "default", ()))
+        if len(ratios) < 5:
+            return 1.0
+        return ratios[min(len(ratios) - 1, int(len(ratios) * 0.9))]
+    
+    def budget(self, task: Optional[str], expected_tokens: int, ceiling: int) -> int:
+        """max_tokens for a call expected to produce about expected_tokens"""
+        with self._lock:
+            budget = int(expected_tokens * self._ratio(task) * self.headroom)
+            budget = max(min(self.min_tokens, ceiling), min(budget, ceiling))
+            self.stats["budgeted_calls"] += 1
+            self.stats["budgeted_tokens"] += budget
+            return budget
+    
+    def observe(self, task: Optional[str], expected_tokens: int, used_tokens: Optional[int]):
+        """Record the completion size of a call that finished normally"""
+        if not used_tokens or expected_tokens <= 0:
+            return
+        with self._lock:
+            ratios = self._ratios.setdefault(task or "default", deque(maxlen=self._history))
+            ratios.append(used_tokens / expected_tokens)
+    
+    def record_truncation(self):
+        with self._lock:
+            self.stats["truncations"] += 1
+    
+    @staticmethod
+    def next_budget(budget: int, ceiling: int) -> Optional[int]:
+        """Budget for a retry after truncation, or None once at the ceiling"""
+        if budget >= ceiling:
+            return None
+        return min(ceiling, budget * 2)